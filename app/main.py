@@ -1,3 +1,5 @@
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from uvicorn import run
 from app.src.router.api import router
@@ -6,7 +8,43 @@ from app.src.core import config
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException
 from starlette.middleware.cors import CORSMiddleware
-from app.src.exception.handler import http_error, validation_error
+from app.src.exception.handler import http_error, validation_error, overload_error
+from app.src.exception.overload import ServiceOverloadedError
+from app.src.database import async_engine
+from app.src.database.partition import ensure_transaction_partitions
+from app.src.router.ai.jobs import ai_job_queue
+from app.src.router.category.cache import category_cache
+from app.src.router.user.last_login import last_login_buffer
+from app.src.router.user.password import password_hasher
+from app.src.router.user.revocation import token_revocation
+from app.src.utils.httpx_client import httpx_pool
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """
+    startup and shutdown hooks of every worker
+    """
+    try:
+        await ensure_transaction_partitions()
+    except Exception:
+        logging.exception("could not ensure transactions partitions")
+    try:
+        await category_cache.refresh()
+    except Exception:
+        # requests load it lazily on their first read
+        logging.exception("could not load the category cache")
+    await token_revocation.start()
+    await last_login_buffer.start()
+    await httpx_pool.start()
+    await ai_job_queue.start()
+    yield
+    await ai_job_queue.stop()
+    await httpx_pool.stop()
+    await last_login_buffer.stop()
+    await token_revocation.stop()
+    password_hasher.shutdown()
+    await async_engine.dispose()
 
 
 def get_application():
@@ -24,7 +62,8 @@ def get_application():
     application = FastAPI(
         title=config.PROJECT_NAME,
         docs_url=f"{config.API_PREFIX}/docs",
-        openapi_url=f"{config.API_PREFIX}/openapi.json"
+        openapi_url=f"{config.API_PREFIX}/openapi.json",
+        lifespan=lifespan
     )
     application.include_router(router, prefix=config.API_PREFIX)
     application.include_router(root_router, tags=["root"], prefix="")
@@ -38,6 +77,7 @@ def get_application():
 
     application.add_exception_handler(HTTPException, http_error.http_error_handler)
     application.add_exception_handler(RequestValidationError, validation_error.http422_error_handler)
+    application.add_exception_handler(ServiceOverloadedError, overload_error.service_overloaded_handler)
 
     return application
 
@@ -0,0 +1,205 @@
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from pydantic import BaseModel
+from sqlalchemy import delete, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.src.database import Base
+from app.src.core.config import PAGINATION_LIMIT
+from app.src.database.session import async_session_manager
+
+ModelType = TypeVar("ModelType", bound=Base)
+CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
+UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+
+
+def column_values(obj: Any) -> Dict[str, Any]:
+    """
+    python values of a schema, mapping or model instance; unlike
+    jsonable_encoder datetimes stay datetimes, which asyncpg requires
+    for timestamp columns
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, dict):
+        return dict(obj)
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def column_keys(db_obj: Any) -> List[str]:
+    return [attr.key for attr in inspect(db_obj).mapper.column_attrs]
+
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, model: Type[ModelType]):
+        """
+        Asyncio counterpart of CRUDBase, every query is awaited on an AsyncSession.
+
+        **Parameters**
+
+        * `model`: A SQLAlchemy model class
+        """
+        self.model = model
+
+    def _filter_deleted(self, query):
+        if hasattr(self.model, "deleted_date"):
+            query = query.where(self.model.deleted_date == None)
+        if hasattr(self.model, "deleted_at"):
+            query = query.where(self.model.deleted_at == None)
+        return query
+
+    async def create(self, db: AsyncSession, obj_in: CreateSchemaType) -> ModelType:
+        obj_in_data = column_values(obj_in)
+        db_obj = self.model(**obj_in_data)  # type: ignore
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        obj_data = column_keys(db_obj)
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        if hasattr(self.model, "updated_at"):
+            update_data["updated_at"] = datetime.now()
+        if hasattr(self.model, "updated_date"):
+            update_data["updated_date"] = datetime.now()
+
+        for field in obj_data:
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def get(self, db: AsyncSession, pk: Any) -> Optional[ModelType]:
+        query = self._filter_deleted(
+            select(self.model).where(self.model.id == pk))
+        data = (await db.execute(query)).scalars().first()
+        if data:
+            return data
+        else:
+            raise FileNotFoundError("Data not found!")
+
+    async def get_multi(
+        self, *args, db: AsyncSession, offset: int = 0, limit: int = PAGINATION_LIMIT
+    ) -> List[ModelType]:
+        query = self._filter_deleted(select(self.model).where(*args))
+        query = query.order_by(self.model.id.desc()).offset(
+            offset).limit(limit)
+        return (await db.execute(query)).scalars().all()
+
+    async def count(
+        self, *args, db: AsyncSession
+    ) -> int:
+        query = self._filter_deleted(select(self.model).where(*args))
+        query = select(func.count()).select_from(query.subquery())
+        return await db.scalar(query)
+
+    async def remove(self, db: AsyncSession, *, pk: int) -> ModelType:
+        obj = await self.get(db=db, pk=pk)
+        if obj:
+            obj.deleted_at = datetime.now()
+            await db.commit()
+            await db.refresh(obj)
+            return obj
+        else:
+            raise FileNotFoundError("Data not found!")
+
+    async def create_data(self, obj_in: CreateSchemaType) -> ModelType:
+        async with async_session_manager() as db:
+            return await self.create(db, obj_in)
+
+    async def update_data(
+        self,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        async with async_session_manager() as db:
+            obj_data = column_keys(db_obj)
+            if isinstance(obj_in, dict):
+                update_data = obj_in
+            else:
+                update_data = obj_in.model_dump(exclude_unset=True)
+
+            db_obj = await db.merge(db_obj)
+            for field in obj_data:
+                if field in update_data:
+                    setattr(db_obj, field, update_data[field])
+            await db.commit()
+            await db.refresh(db_obj)
+            return db_obj
+
+    async def get_detail(self, *args, pk: Any = None) -> Optional[ModelType]:
+        async with async_session_manager() as db:
+            query = self._filter_deleted(select(self.model).where(*args))
+            if pk:
+                query = query.where(self.model.id == pk)
+            if hasattr(self.model, "id"):
+                query = query.order_by(self.model.id.desc())
+            return (await db.execute(query)).scalars().first()
+
+    async def get_all(
+        self, *args, offset: int = 0, limit: int = PAGINATION_LIMIT, order_by: str = None
+    ) -> List[ModelType]:
+        """
+        order_by format: '+column_name' or '-column_name'
+        """
+        async with async_session_manager() as db:
+            query = self._filter_deleted(select(self.model).where(*args))
+
+            # Determine ordering
+            if order_by:
+                direction = order_by[0]
+                column_name = order_by[1:]
+
+                # Check if the column exists in the model
+                if hasattr(self.model, column_name):
+                    column = getattr(self.model, column_name)
+                    if direction == '+':
+                        query = query.order_by(column.asc())
+                    elif direction == '-':
+                        query = query.order_by(column.desc())
+            else:
+                if hasattr(self.model, "id"):
+                    query = query.order_by(self.model.id.asc())
+            query = query.offset(offset).limit(limit)
+            return (await db.execute(query)).scalars().all()
+
+    async def bulk_create(self, payload: list):
+        async with async_session_manager() as db:
+            await db.run_sync(
+                lambda session: session.bulk_save_objects(objects=payload))
+            await db.commit()
+            return len(payload)
+
+    async def bulk_hard_delete(self, filters: list):
+        async with async_session_manager() as db:
+            result = await db.execute(delete(self.model).where(*filters))
+            await db.commit()
+            return result.rowcount
+
+    async def bulk_update(self, obj_in):
+        async with async_session_manager() as db:
+            db_dict_list = []
+            for obj in obj_in:
+                db_dict_list.append(column_values(obj))
+            await db.run_sync(
+                lambda session: session.bulk_update_mappings(self.model, db_dict_list))
+            await db.commit()
+            return obj_in
+
+    async def get_count(
+        self, *args
+    ) -> int:
+        async with async_session_manager() as db:
+            return await self.count(*args, db=db)
@@ -0,0 +1,125 @@
+"""
+Check that non-AI endpoints stay responsive while AI generations run.
+
+A fake model server answering generateContent after --delay seconds is
+served in-process by uvicorn on --model-port, and the application itself
+(without its lifespan, so no database is needed) on --app-port with
+GEMINI_BASE_URL pointing at the fake. While --analyses requests to
+/ai/ask-gemini are in flight, /healthz is probed every --interval seconds
+and its latency compared with an idle baseline.
+
+Usage:
+    python -m app.src.commands.bench_ai_concurrency --analyses 20 --delay 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import httpx
+import uvicorn
+
+from app.src.utils.metrics import LatencyWindow
+
+
+def fake_model(delay: float):
+    body = json.dumps({
+        "candidates": [{
+            "content": {"role": "model", "parts": [{"text": "{\"summary\": \"stub\"}"}]},
+            "finishReason": "STOP"
+        }]
+    }).encode()
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        await asyncio.sleep(delay)
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+async def serve(app, port: int):
+    server = uvicorn.Server(uvicorn.Config(
+        app, host="127.0.0.1", port=port, lifespan="off", log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server, serving
+
+
+async def probe(client: httpx.AsyncClient, url: str, interval: float, until: asyncio.Event) -> LatencyWindow:
+    latency = LatencyWindow()
+    while not until.is_set():
+        started = time.perf_counter()
+        (await client.get(url)).raise_for_status()
+        latency.observe(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return latency
+
+
+def report(name: str, latency: LatencyWindow) -> None:
+    print(
+        f"{name:<22} probes={len(latency):4d} "
+        f"p50={latency.percentile(50) * 1000:7.2f}ms "
+        f"p99={latency.percentile(99) * 1000:7.2f}ms "
+        f"max={max(latency.samples) * 1000:7.2f}ms"
+    )
+
+
+async def run(args) -> None:
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{args.model_port}"
+    os.environ.setdefault("GEMINI_API_KEY", "stub")
+    os.environ.setdefault("OPS_TOKEN", "bench")
+    # imported late so the configuration above is the one the app reads
+    from app.main import app
+    from app.src.core import config
+
+    model_server, model_serving = await serve(fake_model(args.delay), args.model_port)
+    app_server, app_serving = await serve(app, args.app_port)
+    base = f"http://127.0.0.1:{args.app_port}"
+    try:
+        async with httpx.AsyncClient(timeout=None) as client:
+            idle = asyncio.Event()
+            baseline = asyncio.create_task(probe(client, base + "/healthz", args.interval, idle))
+            await asyncio.sleep(args.delay)
+            idle.set()
+            report("idle", await baseline)
+
+            done = asyncio.Event()
+            loaded = asyncio.create_task(probe(client, base + "/healthz", args.interval, done))
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(
+                client.post(base + config.API_PREFIX + "/ai/ask-gemini", json={"prompt": f"analysis {n}"})
+                for n in range(args.analyses)
+            ))
+            elapsed = time.perf_counter() - started
+            done.set()
+            report(f"{args.analyses} analyses in flight", await loaded)
+
+            statuses = {}
+            for response in responses:
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            print(f"analyses finished in {elapsed:.2f}s, status codes {statuses}")
+            print("limiter", json.dumps((await client.get(
+                base + "/healthz/gemini", headers={"X-Ops-Token": os.environ["OPS_TOKEN"]})).json()))
+    finally:
+        app_server.should_exit = True
+        model_server.should_exit = True
+        await asyncio.gather(app_serving, model_serving)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--analyses", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=3.0)
+    parser.add_argument("--interval", type=float, default=0.05)
+    parser.add_argument("--model-port", type=int, default=8766)
+    parser.add_argument("--app-port", type=int, default=8767)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Concurrent query throughput of one worker, blocking sessions against async ones.
+
+--requests coroutines run on one event loop, --concurrency at a time, each
+issuing one query that takes --query-seconds on the server (pg_sleep, so
+the database itself is never the bottleneck). "sync" runs them the way
+handlers did before the async data-access layer, through session_manager()
+on the event loop; "async" runs them through async_session_manager(). A
+ticker measures how late the event loop wakes up meanwhile, which is what
+every other request of the worker waits on.
+
+Needs a database reachable with the configured DB_* settings, nothing is
+written.
+
+Usage:
+    python -m app.src.commands.bench_db_throughput --requests 200 --concurrency 20 --query-seconds 0.05
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.src.database import async_engine
+from app.src.database.session import async_session_manager, session_manager
+from app.src.utils.metrics import LatencyWindow
+
+SLOW_QUERY = text("SELECT pg_sleep(:seconds)")
+
+
+async def run_sync(seconds: float) -> None:
+    # the pre-async handler pattern: a blocking query inside a coroutine
+    with session_manager() as db:
+        db.execute(SLOW_QUERY, {"seconds": seconds})
+
+
+async def run_async(seconds: float) -> None:
+    async with async_session_manager() as db:
+        await db.execute(SLOW_QUERY, {"seconds": seconds})
+
+
+async def ticker(interval: float, until: asyncio.Event) -> LatencyWindow:
+    """how much later than `interval` the loop comes back, per tick"""
+    lag = LatencyWindow()
+    while not until.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag.observe(time.perf_counter() - started - interval)
+    return lag
+
+
+async def measure(name: str, query, args) -> None:
+    gate = asyncio.Semaphore(args.concurrency)
+
+    async def one() -> None:
+        async with gate:
+            await query(args.query_seconds)
+
+    done = asyncio.Event()
+    lag = asyncio.create_task(ticker(0.01, done))
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    lag = await lag
+    print(
+        f"{name:<6} {args.requests} queries in {elapsed:6.2f}s "
+        f"= {args.requests / elapsed:8.1f} req/s, "
+        f"loop lag p50={lag.percentile(50) * 1000:7.2f}ms p99={lag.percentile(99) * 1000:7.2f}ms"
+    )
+
+
+async def run(args) -> None:
+    try:
+        await measure("sync", run_sync, args)
+        await measure("async", run_async, args)
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--query-seconds", type=float, default=0.05)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark outbound calls against a local stub organization service: a new
+client per call (what httpx_context used to do) versus the shared pooled
+client of the worker.
+
+The stub is served in-process by uvicorn on --port and answers /user/me
+like the organization service after --delay seconds.
+
+Usage:
+    python -m app.src.commands.bench_org_client --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import uvicorn
+
+from app.src.services.organization_service.http import OrganizationServices
+from app.src.utils.httpx_client import BaseHttpxClient, httpx_pool
+from app.src.utils.metrics import LatencyWindow
+
+BODY = json.dumps({
+    "status": True,
+    "data": {"id": 1, "username": "stub", "permission": [{"permission_page": "customer"}]}
+}).encode()
+
+
+def stub_app(delay: float):
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        await asyncio.sleep(delay)
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": BODY})
+    return app
+
+
+async def per_call_client(url: str) -> None:
+    client = await BaseHttpxClient().async_client()
+    try:
+        (await client.get(url, headers={"Authorization": "Bearer stub"})).json()
+    finally:
+        await client.aclose()
+
+
+async def shared_client(url: str) -> None:
+    response = await OrganizationServices.send_request(
+        "authorization_url", "GET", url, token="stub")
+    response.json()
+
+
+async def measure(name: str, call, url: str, requests: int, concurrency: int) -> None:
+    latency = LatencyWindow(size=requests)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with slots:
+            started = time.perf_counter()
+            await call(url)
+            latency.observe(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<16} {requests / elapsed:8.0f} req/s "
+        f"p50={latency.percentile(50) * 1000:6.2f}ms "
+        f"p99={latency.percentile(99) * 1000:6.2f}ms"
+    )
+
+
+async def run(args) -> None:
+    server = uvicorn.Server(uvicorn.Config(
+        stub_app(args.delay), host="127.0.0.1", port=args.port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    url = f"http://127.0.0.1:{args.port}/user/me"
+    try:
+        await measure("client per call", per_call_client, url, args.requests, args.concurrency)
+        await httpx_pool.start()
+        await measure("shared pool", shared_client, url, args.requests, args.concurrency)
+    finally:
+        await httpx_pool.stop()
+        server.should_exit = True
+        await serving
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.005)
+    parser.add_argument("--port", type=int, default=8765)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Seed a throwaway dataset and check with EXPLAIN that every report query
+reads `transactions` through an index instead of a sequential scan.
+
+Everything runs inside one transaction that is rolled back at the end, so
+it is safe to point at a development database that has the migrations applied.
+
+Usage:
+    python -m app.src.commands.check_report_indexes --users 500 --rows-per-user 400
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date
+from types import SimpleNamespace
+
+from sqlalchemy import event, text
+
+from app.src.database import async_engine
+from app.src.database.session import async_session_manager
+from app.src.router.report.object import ReportObject
+from app.src.router.transaction.object import TransactionObject
+
+SEED_CATEGORIES = text("""
+    INSERT INTO categories (name, code, type, icon, color, is_active)
+    SELECT 'Check ' || n, 'CHECK_' || n,
+           (CASE WHEN n % 2 = 0 THEN 'INCOME' ELSE 'EXPENSE' END)::category_type_enum,
+           'icon', '#000000', TRUE
+    FROM generate_series(1, 20) AS n
+""")
+SEED_USERS = text("""
+    INSERT INTO users (email, password_hash, name, is_active)
+    SELECT 'index-check-' || n || '@example.com', 'x', 'Index Check ' || n, TRUE
+    FROM generate_series(1, :users) AS n
+    RETURNING id
+""")
+SEED_TRANSACTIONS = text("""
+    INSERT INTO transactions (user_id, amount, description, type, category_code, date, created_at, updated_at)
+    SELECT u.id,
+           (random() * 1000000)::int,
+           'seed',
+           (CASE WHEN n % 5 = 0 THEN 'INCOME' ELSE 'EXPENSE' END)::category_type_enum,
+           'CHECK_' || (1 + n % 20),
+           now() - (n % 730) * interval '1 day',
+           now(),
+           now()
+    FROM unnest(CAST(:user_ids AS integer[])) AS u(id)
+    CROSS JOIN generate_series(1, :rows_per_user) AS n
+""")
+
+
+def plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def check_plan(plan: dict) -> tuple:
+    """return (passed, indexes used, relations scanned sequentially)"""
+    indexes, seq_scans = set(), set()
+    for node in plan_nodes(plan["Plan"]):
+        relation = node.get("Relation Name", "")
+        if node.get("Index Name"):
+            indexes.add(node["Index Name"])
+        if node["Node Type"] == "Seq Scan" and relation.startswith("transactions"):
+            seq_scans.add(relation)
+    return (not seq_scans and bool(indexes)), indexes, seq_scans
+
+
+async def run_report_queries(db, user_id: int) -> None:
+    user = SimpleNamespace(id=user_id)
+    report = ReportObject(user, db)
+    transaction = TransactionObject(user, db)
+    start, end = date.today().replace(day=1), date.today()
+
+    await report.get_category_report(user_id=user_id, start_date=start, end_date=end)
+    await report.get_monthly_chart_data(user_id=user_id, year=date.today().year)
+    await report.get_dashboard_summary(user_id=user_id)
+    await report.get_most_expense_by_category(user_id=user_id)
+    await report.get_income_categories(user_id=user_id)
+    await report.get_expense_categories(user_id=user_id)
+    await report.get_cashflow_data(user_id=user_id)
+    await transaction.get_user_transactions(user_id=user_id)
+    await transaction.get_transaction_summary(user_id=user_id, start_date=start, end_date=end)
+
+
+async def check(users: int, rows_per_user: int) -> bool:
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "transactions" in statement and not statement.lstrip().upper().startswith("EXPLAIN"):
+            captured.append((statement, parameters))
+
+    async with async_session_manager() as db:
+        await db.execute(SEED_CATEGORIES)
+        user_ids = (await db.execute(SEED_USERS, {"users": users})).scalars().all()
+        await db.execute(SEED_TRANSACTIONS, {
+            "user_ids": user_ids, "rows_per_user": rows_per_user})
+        await db.execute(text("ANALYZE transactions"))
+        await db.execute(text("ANALYZE categories"))
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            await run_report_queries(db, user_ids[len(user_ids) // 2])
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+        connection = await db.connection()
+        passed = True
+        for statement, parameters in captured:
+            result = await connection.exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + statement, parameters)
+            plan = result.scalar()
+            plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]
+            ok, indexes, seq_scans = check_plan(plan)
+            passed = passed and ok
+            print("PASS" if ok else "FAIL", " ".join(statement.split())[:120])
+            print("     indexes:", ", ".join(sorted(indexes)) or "-",
+                  "| seq scans:", ", ".join(sorted(seq_scans)) or "-")
+
+        await db.rollback()
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--rows-per-user", type=int, default=400)
+    args = parser.parse_args()
+
+    passed = asyncio.run(check(args.users, args.rows_per_user))
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
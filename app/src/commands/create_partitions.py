@@ -0,0 +1,40 @@
+"""
+Create the upcoming monthly partitions of `transactions`.
+
+Workers already do this on startup; run it from cron when the app may stay
+up for longer than TRANSACTION_PARTITION_MONTHS_AHEAD months.
+
+Usage:
+    python -m app.src.commands.create_partitions --months-ahead 12
+"""
+import argparse
+import asyncio
+import sys
+
+from app.src.core import config
+from app.src.database import async_engine
+from app.src.database.partition import ensure_transaction_partitions
+
+
+async def run(months_ahead: int) -> bool:
+    try:
+        created = await ensure_transaction_partitions(months_ahead)
+        print(f"{created} monthly partitions created")
+        return True
+    except Exception as error:
+        print(error, file=sys.stderr)
+        return False
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--months-ahead", type=int, default=config.TRANSACTION_PARTITION_MONTHS_AHEAD)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(run(args.months_ahead)) else 1)
+
+
+if __name__ == "__main__":
+    main()
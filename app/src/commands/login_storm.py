@@ -0,0 +1,94 @@
+"""
+Load test: latency of `GET /transaction/` while the server absorbs a login storm.
+
+Runs against a live server in two phases of --duration seconds each. The
+first phase only probes the listing. The second fires --logins-per-second
+logins at the same time. It prints the listing p50/p95/p99 of both phases
+and the status codes the logins got; 503s are logins shed by the password
+hasher queue.
+
+Usage:
+    python -m app.src.commands.login_storm --base-url http://127.0.0.1:8000 \\
+        --email user@example.com --password secret --logins-per-second 50
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+
+from app.src.core import config
+from app.src.utils.metrics import LatencyWindow
+
+
+async def fire(rate: float, duration: float, request) -> None:
+    """start `request` `rate` times a second for `duration` seconds without waiting on it"""
+    tasks = []
+    started = time.monotonic()
+    sent = 0
+    while time.monotonic() - started < duration:
+        tasks.append(asyncio.create_task(request()))
+        sent += 1
+        await asyncio.sleep(max(0.0, started + sent / rate - time.monotonic()))
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def run_phase(client: httpx.AsyncClient, args, token: str, storm: bool) -> None:
+    latency = LatencyWindow(size=1_000_000)
+    logins = Counter()
+
+    async def probe():
+        started = time.perf_counter()
+        await client.get(
+            f"{config.API_PREFIX}/transaction/", headers={"Authorization": f"Bearer {token}"})
+        latency.observe(time.perf_counter() - started)
+
+    async def login():
+        try:
+            response = await client.post(
+                f"{config.API_PREFIX}/user/login",
+                data={"username": args.email, "password": args.password})
+            logins[response.status_code] += 1
+        except httpx.HTTPError as error:
+            logins[type(error).__name__] += 1
+
+    phases = [fire(args.probes_per_second, args.duration, probe)]
+    if storm:
+        phases.append(fire(args.logins_per_second, args.duration, login))
+    await asyncio.gather(*phases)
+
+    print(
+        f"{'login storm' if storm else 'baseline':<12} transactions n={len(latency)} "
+        f"p50={latency.percentile(50) * 1000:.1f}ms "
+        f"p95={latency.percentile(95) * 1000:.1f}ms "
+        f"p99={latency.percentile(99) * 1000:.1f}ms"
+        + (f" logins={dict(logins)}" if storm else "")
+    )
+
+
+async def run(args) -> None:
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        response = await client.post(
+            f"{config.API_PREFIX}/user/login",
+            data={"username": args.email, "password": args.password})
+        token = response.json()["data"]["access_token"]
+        await run_phase(client, args, token, storm=False)
+        await run_phase(client, args, token, storm=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins-per-second", type=float, default=50)
+    parser.add_argument("--probes-per-second", type=float, default=20)
+    parser.add_argument("--duration", type=float, default=30)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Rebuild or check `transaction_monthly_rollup` against `transactions`.
+
+`rebuild` recomputes the rollup from scratch (for one user with --user-id),
+holding off writes to `transactions` until it commits. `check` compares the
+rollup with a fresh aggregate, prints every mismatch and exits non-zero when
+there is one.
+
+Usage:
+    python -m app.src.commands.rollup rebuild [--user-id 42]
+    python -m app.src.commands.rollup check [--user-id 42]
+"""
+import argparse
+import asyncio
+import sys
+
+from app.src.database import async_engine
+from app.src.database.rollup import check_rollup, rebuild_rollup
+from app.src.database.session import async_session_manager
+
+
+async def rebuild(user_id: int = None) -> bool:
+    async with async_session_manager() as db:
+        rows = await rebuild_rollup(db, user_id)
+        await db.commit()
+    print(f"{rows} rollup rows rebuilt")
+    return True
+
+
+async def check(user_id: int = None) -> bool:
+    async with async_session_manager() as db:
+        mismatches = await check_rollup(db, user_id)
+    for item in mismatches:
+        print(
+            f"MISMATCH user={item.user_id} month={item.month} type={item.type} "
+            f"category={item.category_code or '-'} "
+            f"total={item.actual_total} expected={item.expected_total} "
+            f"count={item.actual_count} expected={item.expected_count}"
+        )
+    print(f"{len(mismatches)} mismatching rollup rows")
+    return not mismatches
+
+
+async def run(command: str, user_id: int = None) -> bool:
+    try:
+        return await {"rebuild": rebuild, "check": check}[command](user_id)
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("command", choices=["rebuild", "check"])
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+
+    passed = asyncio.run(run(args.command, args.user_id))
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,9 @@ DEBUG = config("DEBUG", cast=bool, default=True)
 VERSION = config("VERSION", default="")
 PAGINATION_LIMIT = config("PAGINATION_LIMIT", default=20, cast=int)
 GCP_PROJECT_ID = config("PROJECT_ID", default="")
+# shared secret for the /healthz/* diagnostics (X-Ops-Token header);
+# left empty those endpoints answer 404
+OPS_TOKEN = config("OPS_TOKEN", default="")
 
 """ Database Configuration """
 DB_DRIVER = config("DB_DRIVER", default="postgres")
@@ -29,9 +32,51 @@ DB_DSN = PostgresDsn.build(
     host=f"{DB_SERVER}:{DB_PORT}",
     path=f"{DB_NAME}",
 )
+DB_ASYNC_DSN = PostgresDsn.build(
+    scheme="postgresql+asyncpg",
+    username=DB_USERNAME,
+    password=DB_PASSWORD,
+    host=f"{DB_SERVER}:{DB_PORT}",
+    path=f"{DB_NAME}",
+)
 DB_POOL_SIZE = config("DB_POOL_SIZE", default=10, cast=int)
 DB_MAX_OVERFLOW = config("DB_MAX_OVERFLOW", default=20, cast=int)
 DB_POOL_RECYCLE = config("DB_POOL_RECYCLE", default=900, cast=int)
+# admission control per worker, one controller in front of each engine's pool;
+# the async and the blocking engine each pool DB_POOL_SIZE + DB_MAX_OVERFLOW
+# connections, so a worker may hold twice that against max_connections
+DB_ADMISSION_CAPACITY = config(
+    "DB_ADMISSION_CAPACITY", default=DB_POOL_SIZE + DB_MAX_OVERFLOW, cast=int)
+DB_SYNC_ADMISSION_CAPACITY = config(
+    "DB_SYNC_ADMISSION_CAPACITY", default=DB_POOL_SIZE + DB_MAX_OVERFLOW, cast=int)
+DB_ADMISSION_QUEUE_SIZE = config(
+    "DB_ADMISSION_QUEUE_SIZE", default=DB_POOL_SIZE + DB_MAX_OVERFLOW, cast=int)
+DB_ADMISSION_TIMEOUT = config("DB_ADMISSION_TIMEOUT", default=2.0, cast=float)
+DB_ADMISSION_RETRY_AFTER = config("DB_ADMISSION_RETRY_AFTER", default=1, cast=int)
+DB_SLOW_QUERY_MS = config("DB_SLOW_QUERY_MS", default=500, cast=int)
+DB_QUERY_STATS_MAX_FINGERPRINTS = config(
+    "DB_QUERY_STATS_MAX_FINGERPRINTS", default=500, cast=int)
+TRANSACTION_PARTITION_MONTHS_AHEAD = config(
+    "TRANSACTION_PARTITION_MONTHS_AHEAD", default=12, cast=int)
+# seconds before the in-process category cache checks the table for changes,
+# which bounds how long a category edited in the database stays unseen
+CATEGORY_CACHE_TTL = config("CATEGORY_CACHE_TTL", default=300, cast=int)
+# authenticated user records cached per worker, keyed by token subject
+PRINCIPAL_CACHE_TTL = config("PRINCIPAL_CACHE_TTL", default=60, cast=int)
+PRINCIPAL_CACHE_SIZE = config("PRINCIPAL_CACHE_SIZE", default=10000, cast=int)
+# verified JWT claims memoized per token hash, never past the token exp
+JWT_CLAIMS_CACHE_TTL = config("JWT_CLAIMS_CACHE_TTL", default=300, cast=int)
+JWT_CLAIMS_CACHE_SIZE = config("JWT_CLAIMS_CACHE_SIZE", default=10000, cast=int)
+# bcrypt runs in a process pool, PASSWORD_HASH_ROUNDS applies to new hashes
+# and to existing ones on their next successful login
+PASSWORD_HASH_ROUNDS = config("PASSWORD_HASH_ROUNDS", default=12, cast=int)
+PASSWORD_HASH_WORKERS = config("PASSWORD_HASH_WORKERS", default=2, cast=int)
+PASSWORD_HASH_QUEUE_SIZE = config("PASSWORD_HASH_QUEUE_SIZE", default=64, cast=int)
+PASSWORD_HASH_TIMEOUT = config("PASSWORD_HASH_TIMEOUT", default=5.0, cast=float)
+PASSWORD_HASH_RETRY_AFTER = config("PASSWORD_HASH_RETRY_AFTER", default=2, cast=int)
+# last_login is written behind, batched per worker
+LAST_LOGIN_FLUSH_SECONDS = config("LAST_LOGIN_FLUSH_SECONDS", default=5.0, cast=float)
+LAST_LOGIN_MAX_PENDING = config("LAST_LOGIN_MAX_PENDING", default=1000, cast=int)
 
 """ REDIS config """
 REDIS_DB = config("REDIS_DB", default="0")
@@ -41,6 +86,20 @@ REDIS_PASSWORD = config("REDIS_PASSWORD", default="")
 REDIS_EXPIRATION_TIME = config("REDIS_EXPIRATION_TIME", default=3600, cast=int)
 REDIS_URI = f"redis://:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
 
+""" Token revocation config """
+# "memory" keeps revocations per worker, "redis" shares them between workers;
+# redis is the default as soon as REDIS_HOST is set
+TOKEN_REVOCATION_BACKEND = config(
+    "TOKEN_REVOCATION_BACKEND", default="redis" if config("REDIS_HOST", default="") else "memory")
+# uvicorn worker processes, uvicorn reads the same variable when --workers is not given
+WEB_CONCURRENCY = config("WEB_CONCURRENCY", default=1, cast=int)
+TOKEN_REVOCATION_BLOOM_CAPACITY = config(
+    "TOKEN_REVOCATION_BLOOM_CAPACITY", default=100000, cast=int)
+TOKEN_REVOCATION_BLOOM_ERROR_RATE = config(
+    "TOKEN_REVOCATION_BLOOM_ERROR_RATE", default=0.001, cast=float)
+TOKEN_REVOCATION_REBUILD_SECONDS = config(
+    "TOKEN_REVOCATION_REBUILD_SECONDS", default=60, cast=int)
+
 """ Google Cloud Storage"""
 GOOGLE_APPLICATION_CREDENTIALS = config(
     "GOOGLE_APPLICATION_CREDENTIALS", default="")
@@ -56,11 +115,68 @@ APP_CODE = config("APP_CODE", default="COLL")
 WSO_API_KEY = config("WSO_API_KEY", default="")
 MICROESB_URL = config("MICROESB_URL", default="")
 MICROESB_API_KEY = config("MICROESB_API_KEY", default="")
+# one pooled outbound client per worker
+HTTPX_MAX_CONNECTIONS = config("HTTPX_MAX_CONNECTIONS", default=100, cast=int)
+HTTPX_MAX_KEEPALIVE_CONNECTIONS = config(
+    "HTTPX_MAX_KEEPALIVE_CONNECTIONS", default=20, cast=int)
+HTTPX_KEEPALIVE_EXPIRY = config("HTTPX_KEEPALIVE_EXPIRY", default=30.0, cast=float)
+HTTPX_HTTP2 = config("HTTPX_HTTP2", default=False, cast=bool)
+HTTPX_CONNECT_TIMEOUT = config("HTTPX_CONNECT_TIMEOUT", default=2.0, cast=float)
+HTTPX_TIMEOUT = config("HTTPX_TIMEOUT", default=5.0, cast=float)
+ORGANIZATION_SERVICE_LOGIN_TIMEOUT = config(
+    "ORGANIZATION_SERVICE_LOGIN_TIMEOUT", default=10.0, cast=float)
+# successful /user/me answers cached per token
+ORGANIZATION_AUTH_CACHE_TTL = config("ORGANIZATION_AUTH_CACHE_TTL", default=30, cast=int)
+ORGANIZATION_AUTH_CACHE_SIZE = config("ORGANIZATION_AUTH_CACHE_SIZE", default=10000, cast=int)
+# external party access tokens per app_code, refreshed ahead of expiry;
+# the TTL applies when the answer carries neither expires_in nor a JWT exp
+ACCESS_TOKEN_CACHE_TTL = config("ACCESS_TOKEN_CACHE_TTL", default=300, cast=int)
+ACCESS_TOKEN_REFRESH_BEFORE = config("ACCESS_TOKEN_REFRESH_BEFORE", default=60, cast=int)
+# per endpoint circuit breakers of outbound calls
+CIRCUIT_BREAKER_WINDOW = config("CIRCUIT_BREAKER_WINDOW", default=20, cast=int)
+CIRCUIT_BREAKER_MIN_CALLS = config("CIRCUIT_BREAKER_MIN_CALLS", default=10, cast=int)
+CIRCUIT_BREAKER_FAILURE_RATE = config("CIRCUIT_BREAKER_FAILURE_RATE", default=0.5, cast=float)
+CIRCUIT_BREAKER_RESET_TIMEOUT = config("CIRCUIT_BREAKER_RESET_TIMEOUT", default=10.0, cast=float)
+# timeouts adapt to p99 x multiplier, between the minimum and the endpoint timeout
+ADAPTIVE_TIMEOUT_MIN = config("ADAPTIVE_TIMEOUT_MIN", default=0.25, cast=float)
+ADAPTIVE_TIMEOUT_MULTIPLIER = config("ADAPTIVE_TIMEOUT_MULTIPLIER", default=2.0, cast=float)
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = config("ADAPTIVE_TIMEOUT_MIN_SAMPLES", default=20, cast=int)
+# idempotent organization service reads: a hedge after the rolling p95 and
+# jittered retries, together capped at READ_EXTRA_BUDGET_PERCENT extra calls
+HEDGE_READS = config("HEDGE_READS", default=False, cast=bool)
+READ_RETRY_ATTEMPTS = config("READ_RETRY_ATTEMPTS", default=2, cast=int)
+READ_RETRY_BASE_DELAY = config("READ_RETRY_BASE_DELAY", default=0.05, cast=float)
+READ_RETRY_MAX_DELAY = config("READ_RETRY_MAX_DELAY", default=0.5, cast=float)
+READ_EXTRA_BUDGET_PERCENT = config("READ_EXTRA_BUDGET_PERCENT", default=10.0, cast=float)
 
 
 CMS_BASE_URL = config("CMS_BASE_URL", default="https://cisdev.dipostar.org")
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+# empty means Google's endpoint, set to point the client at a stub server
+GEMINI_BASE_URL = config("GEMINI_BASE_URL", default="")
+GEMINI_MODEL = config("GEMINI_MODEL", default="gemini-2.0-flash")
+# per worker generations in flight and waiting; waiters are served round
+# robin per user so one user can not starve the others
+GEMINI_CONCURRENCY = config("GEMINI_CONCURRENCY", default=4, cast=int)
+GEMINI_QUEUE_SIZE = config("GEMINI_QUEUE_SIZE", default=64, cast=int)
+GEMINI_QUEUE_TIMEOUT = config("GEMINI_QUEUE_TIMEOUT", default=30.0, cast=float)
+GEMINI_RETRY_AFTER = config("GEMINI_RETRY_AFTER", default=5, cast=int)
+# an analysis of the very same input newer than this is served from ai_analysis
+AI_ANALYSIS_FRESHNESS = config("AI_ANALYSIS_FRESHNESS", default=86400, cast=int)
+# analysis prompts: largest transactions kept per month and type, and the
+# estimated token budget of the whole prompt including the static template
+AI_PROMPT_TOP_TRANSACTIONS = config("AI_PROMPT_TOP_TRANSACTIONS", default=5, cast=int)
+AI_PROMPT_TOKEN_BUDGET = config("AI_PROMPT_TOKEN_BUDGET", default=8000, cast=int)
+AI_PROMPT_CHARS_PER_TOKEN = config("AI_PROMPT_CHARS_PER_TOKEN", default=4.0, cast=float)
+# background analysis jobs per worker: concurrent jobs, queued jobs, how
+# often status streams re-read a job run by another worker, when a job
+# left running by a dead worker is picked up again and how often to look
+AI_JOB_WORKERS = config("AI_JOB_WORKERS", default=2, cast=int)
+AI_JOB_QUEUE_SIZE = config("AI_JOB_QUEUE_SIZE", default=100, cast=int)
+AI_JOB_POLL_INTERVAL = config("AI_JOB_POLL_INTERVAL", default=2.0, cast=float)
+AI_JOB_STALE_AFTER = config("AI_JOB_STALE_AFTER", default=600, cast=int)
+AI_JOB_SWEEP_INTERVAL = config("AI_JOB_SWEEP_INTERVAL", default=60.0, cast=float)
 
 
 TEMPLATE_PROMPT_ANALYSIS = """
@@ -172,13 +288,13 @@ JSON_FORMAT = {
 }
 
 TEMPLATE_PROMPT_ANALYSIS_JSON= """
-Berikut adalah data finansial bulanan saya:
-
-{json_data}
-
-Tolong analisis data finansial tersebut dan kembalikan hasilnya dalam format JSON. Pastikan struktur JSON hasil analisis sesuai dengan *template* yang telah ditentukan di bawah ini, sehingga semua informasi bisa langsung dimuat ke *layout UI* seperti *dashboard* keuangan keluarga.
+Tolong analisis data finansial bulanan saya di bagian akhir dan kembalikan hasilnya dalam format JSON. Pastikan struktur JSON hasil analisis sesuai dengan *template* yang telah ditentukan di bawah ini, sehingga semua informasi bisa langsung dimuat ke *layout UI* seperti *dashboard* keuangan keluarga.
 
 **Struktur JSON yang Diharapkan:**
 
 {json_format}
+
+Berikut adalah data finansial bulanan saya:
+
+{json_data}
 """
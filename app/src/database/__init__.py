@@ -1,2 +1,3 @@
-from .engine import Base, engine, Session, BaseModel
-from .session import session_manager
+from .engine import Base, engine, Session, BaseModel, pool_metrics
+from .async_engine import async_engine, AsyncSessionLocal, async_pool_metrics
+from .session import session_manager, async_session_manager
@@ -0,0 +1,124 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque
+
+from app.src.core import config
+from app.src.exception.database import PoolSaturatedError
+from app.src.utils.metrics import Histogram
+
+
+class AdmissionController:
+    """
+    Per-worker admission control in front of the connection pool.
+
+    At most `capacity` sessions are open at once, at most `queue_size` requests
+    wait for a free slot and none of them waits longer than `timeout` seconds.
+    Everything beyond that is shed right away with PoolSaturatedError so the
+    admitted requests keep a flat latency instead of piling up on pool checkout.
+
+    Example:
+        >>> await admission.acquire()
+        >>> try:
+        >>>     ...
+        >>> finally:
+        >>>     admission.release()
+    """
+
+    def __init__(self, capacity: int, queue_size: int, timeout: float, retry_after: int):
+        self.capacity = capacity
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.in_use = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait_time = Histogram()
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _saturated(self, message: str) -> PoolSaturatedError:
+        return PoolSaturatedError(message, retry_after=self.retry_after)
+
+    def try_acquire(self) -> None:
+        """Take a slot without waiting, used by the blocking session_manager."""
+        if self.in_use >= self.capacity or self._waiters:
+            self.rejected += 1
+            raise self._saturated("Database is busy, please retry")
+        self.in_use += 1
+        self.admitted += 1
+        self.wait_time.observe(0.0)
+
+    async def acquire(self) -> None:
+        if self.in_use < self.capacity and not self._waiters:
+            self.in_use += 1
+            self.admitted += 1
+            self.wait_time.observe(0.0)
+            return
+
+        if len(self._waiters) >= self.queue_size:
+            self.rejected += 1
+            raise self._saturated("Database is busy, please retry")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            # release() hands its slot over by resolving the waiter
+            await asyncio.wait_for(waiter, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            # the slot may have been handed over just as the timeout fired
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            self.timed_out += 1
+            raise self._saturated("Timed out waiting for a database connection")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            self.wait_time.observe(time.monotonic() - started)
+        self.admitted += 1
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_use -= 1
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "in_use": self.in_use,
+            "queue_depth": self.queue_depth,
+            "queue_size": self.queue_size,
+            "timeout": self.timeout,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait_time": self.wait_time.snapshot()
+        }
+
+
+# in front of the async engine's pool (async_session_manager)
+admission = AdmissionController(
+    capacity=config.DB_ADMISSION_CAPACITY,
+    queue_size=config.DB_ADMISSION_QUEUE_SIZE,
+    timeout=config.DB_ADMISSION_TIMEOUT,
+    retry_after=config.DB_ADMISSION_RETRY_AFTER
+)
+# in front of the blocking engine's own pool (session_manager), never queued
+sync_admission = AdmissionController(
+    capacity=config.DB_SYNC_ADMISSION_CAPACITY,
+    queue_size=0,
+    timeout=0.0,
+    retry_after=config.DB_ADMISSION_RETRY_AFTER
+)
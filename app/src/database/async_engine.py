@@ -0,0 +1,22 @@
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.src.core import config
+from app.src.database.pool_metrics import PoolMetrics
+from app.src.database.query_metrics import query_metrics
+
+async_engine = create_async_engine(
+    config.DB_ASYNC_DSN.unicode_string(),
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW,
+    pool_recycle=config.DB_POOL_RECYCLE
+)
+async_pool_metrics = PoolMetrics(async_engine.sync_engine)
+query_metrics.attach(async_engine.sync_engine)
+# objects are handed back to the routers after the session is closed,
+# so keep their loaded state instead of expiring it on commit
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
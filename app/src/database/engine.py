@@ -4,6 +4,8 @@ from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy_mixins import AllFeaturesMixin
 
 from app.src.core import config
+from app.src.database.pool_metrics import PoolMetrics
+from app.src.database.query_metrics import query_metrics
 
 engine = create_engine(
     config.DB_DSN.unicode_string(),
@@ -11,6 +13,8 @@ engine = create_engine(
     max_overflow=config.DB_MAX_OVERFLOW,
     pool_recycle=config.DB_POOL_RECYCLE
 )
+pool_metrics = PoolMetrics(engine)
+query_metrics.attach(engine)
 Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 import enum
@@ -16,12 +16,19 @@ class AnalysisType(enum.Enum):
 
 class AIAnalysis(BaseModel):
     __tablename__ = 'ai_analysis'
+    __table_args__ = (
+        Index('ix_ai_analysis_user_id_type_hash', 'user_id', 'analysis_type', 'input_hash', 'created_at'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     analysis_type = Column(Enum(AnalysisType), nullable=False)
     input_data = Column(Text, nullable=False)
     result = Column(JSONB, nullable=False)
+    # sha256 of everything the prompt was built from, see AIObject.prepare_analysis
+    input_hash = Column(String(64))
+    # {"YYYY-MM": sha256} of every month in the input
+    month_digests = Column(JSONB)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
@@ -0,0 +1,46 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, Enum, Index, text
+from sqlalchemy.orm import relationship
+import enum
+
+from app.src.database import BaseModel
+from app.src.database.models.ai_analysis import AnalysisType
+
+
+class AIJobStatus(enum.Enum):
+    queued = 'queued'
+    running = 'running'
+    done = 'done'
+    failed = 'failed'
+
+
+class AIAnalysisJob(BaseModel):
+    """
+    One background analysis request. At most one job per user, analysis type
+    and period is queued or running at a time, enforced by a partial unique
+    index so duplicate requests collapse onto the job in flight.
+    """
+    __tablename__ = 'ai_analysis_job'
+    __table_args__ = (
+        Index(
+            'ux_ai_analysis_job_in_flight',
+            'user_id', 'analysis_type', 'start_date', 'end_date',
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')")
+        ),
+    )
+
+    id = Column(String(36), primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    analysis_type = Column(Enum(AnalysisType, name='analysistype', create_type=False), nullable=False)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    status = Column(Enum(AIJobStatus, name='ai_job_status_enum'), nullable=False, default=AIJobStatus.queued)
+    analysis_id = Column(Integer, ForeignKey('ai_analysis.id'))
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.now)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    # Relationships
+    analysis = relationship('AIAnalysis')
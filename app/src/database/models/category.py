@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Enum, Index
 import enum
 
 from app.src.database import BaseModel
@@ -8,6 +8,9 @@ from app.src.database.models.transaction import TransactionType
 
 class Category(BaseModel):
     __tablename__ = 'categories'
+    __table_args__ = (
+        Index('ix_categories_code', 'code'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(100), nullable=False)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, Float, String, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, DateTime, Enum, ForeignKey, Index
 import enum
 from sqlalchemy.orm import relationship
 
@@ -13,6 +13,13 @@ class TransactionType(str, enum.Enum):
 
 class Transaction(BaseModel):
     __tablename__ = 'transactions'
+    __table_args__ = (
+        Index('ix_transactions_user_id_date', 'user_id', 'date'),
+        Index('ix_transactions_user_id_type_date', 'user_id', 'type', 'date',
+              postgresql_include=['amount', 'category_code']),
+        # monthly partitions are created by app.src.database.partition
+        {'postgresql_partition_by': 'RANGE (date)'},
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
@@ -21,7 +28,8 @@ class Transaction(BaseModel):
     type = Column(Enum(
         TransactionType, name='category_type_enum', create_type=False), nullable=False)
     category_code = Column(String(50))
-    date = Column(DateTime, default=datetime.now)
+    # partition key, so it is part of the primary key
+    date = Column(DateTime, primary_key=True, default=datetime.now)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, Float, String, Date, Enum, ForeignKey
+
+from app.src.database import BaseModel
+from app.src.database.models.transaction import TransactionType
+
+
+class TransactionMonthlyRollup(BaseModel):
+    """
+    Per user, month, type and category totals of `transactions`.
+
+    Kept in sync by the `transactions_monthly_rollup` trigger, so every write
+    to `transactions` updates it in the same database transaction. Rows without
+    a category are stored under category_code ''.
+    """
+    __tablename__ = 'transaction_monthly_rollup'
+
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    month = Column(Date, primary_key=True)
+    type = Column(Enum(
+        TransactionType, name='category_type_enum', create_type=False), primary_key=True)
+    category_code = Column(String(50), primary_key=True, default='')
+    total = Column(Float, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,117 @@
+import logging
+from datetime import date
+from typing import List
+
+from sqlalchemy import text
+
+from app.src.core import config
+from app.src.database.async_engine import async_engine
+
+logger = logging.getLogger(__name__)
+
+# any constant works, it only has to be the same for every worker
+PARTITION_LOCK_ID = 72410301
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"transactions_p{month:%Y_%m}"
+
+
+def partition_statements(first_month: date, last_month: date) -> List[str]:
+    """
+    CREATE statements for the monthly `transactions` partitions between
+    first_month and last_month inclusive
+
+    Example:
+        >>> partition_statements(date(2026, 1, 1), date(2026, 2, 1))[0]
+        "CREATE TABLE IF NOT EXISTS transactions_p2026_01 PARTITION OF transactions FOR VALUES FROM ('2026-01-01') TO ('2026-02-01')"
+    """
+    statements = []
+    month = month_start(first_month)
+    while month <= last_month:
+        next_month = add_months(month, 1)
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+            f"PARTITION OF transactions "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+    return statements
+
+
+async def create_month_partition(connection, month: date) -> bool:
+    """
+    create the partition of `month` in the caller's transaction, False when
+    it already exists. Rows of that month that landed in the default
+    partition (backdated or future dated writes) are moved into it, as
+    Postgres refuses the partition while the default one holds rows of its
+    range; they are deleted and inserted through the parent, so the rollup
+    trigger nets out.
+    """
+    name = partition_name(month)
+    exists = (await connection.execute(
+        text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})).scalar()
+    if exists:
+        return False
+
+    bounds = {"start": month, "end": add_months(month, 1)}
+    in_default = (await connection.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM transactions_default WHERE date >= :start AND date < :end)"
+    ), bounds)).scalar()
+    if in_default:
+        await connection.execute(text(
+            "CREATE TEMP TABLE transactions_moving ON COMMIT DROP AS "
+            "SELECT * FROM transactions_default WHERE date >= :start AND date < :end"
+        ), bounds)
+        await connection.execute(text(
+            "DELETE FROM transactions_default WHERE date >= :start AND date < :end"), bounds)
+
+    statement, = partition_statements(month, month)
+    await connection.execute(text(statement))
+
+    if in_default:
+        await connection.execute(text("INSERT INTO transactions SELECT * FROM transactions_moving"))
+    return True
+
+
+async def ensure_transaction_partitions(
+    months_ahead: int = config.TRANSACTION_PARTITION_MONTHS_AHEAD
+) -> int:
+    """
+    make sure the partitions from the current month up to `months_ahead`
+    months exist, so new rows never land in the default partition.
+
+    Every month is created in a transaction of its own, so one failing
+    month does not keep the others from being created; a RuntimeError
+    naming the failed months is raised once all were tried.
+    """
+    this_month = month_start(date.today())
+    last_month = add_months(this_month, months_ahead)
+    created, failed = 0, []
+    month = this_month
+    while month <= last_month:
+        try:
+            async with async_engine.begin() as connection:
+                # workers start together, serialize them so the existence check does not race
+                await connection.execute(
+                    text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": PARTITION_LOCK_ID})
+                created += await create_month_partition(connection, month)
+        except Exception:
+            logger.exception("could not create the transactions partition of %s", month)
+            failed.append(month)
+        month = add_months(month, 1)
+
+    if failed:
+        raise RuntimeError(
+            "could not create transactions partitions for " + ", ".join(f"{m:%Y-%m}" for m in failed))
+    logger.info("transactions partitions ensured up to %s, %s created", last_month, created)
+    return created
@@ -0,0 +1,77 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.src.utils.metrics import Histogram
+
+
+class PoolMetrics:
+    """
+    Collects connection pool statistics from SQLAlchemy pool events, so pool
+    waits can be told apart from slow queries when sizing DB_POOL_SIZE and
+    DB_MAX_OVERFLOW.
+
+    Example:
+        >>> metrics = PoolMetrics(engine)
+        >>> metrics.stats()["in_use"]
+        0
+    """
+    AGE_BUCKETS = (60.0, 300.0, 600.0, 900.0, 1800.0, 3600.0, 7200.0)
+
+    def __init__(self, engine: Engine):
+        self.pool = engine.pool
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.peak_in_use = 0
+        self.checkout_wait = Histogram()
+        self.hold_time = Histogram()
+        self.connection_age = Histogram(buckets=self.AGE_BUCKETS)
+
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        connection_record.info["connected_at"] = time.monotonic()
+        self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        now = time.monotonic()
+        connection_record.info["checked_out_at"] = now
+        self.connection_age.observe(
+            now - connection_record.info.get("connected_at", now))
+        self.checkouts += 1
+        self.peak_in_use = max(self.peak_in_use, self.pool.checkedout())
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            self.hold_time.observe(time.monotonic() - checked_out_at)
+        self.checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self.invalidations += 1
+
+    def observe_checkout_wait(self, seconds: float) -> None:
+        """time spent by a caller waiting for pool checkout, including connect"""
+        self.checkout_wait.observe(seconds)
+
+    def stats(self) -> dict:
+        return {
+            "pool_size": self.pool.size(),
+            "in_use": self.pool.checkedout(),
+            "idle": self.pool.checkedin(),
+            "overflow": max(self.pool.overflow(), 0),
+            "peak_in_use": self.peak_in_use,
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "invalidations": self.invalidations,
+            "checkout_wait": self.checkout_wait.snapshot(),
+            "hold_time": self.hold_time.snapshot(),
+            "connection_age": self.connection_age.snapshot()
+        }
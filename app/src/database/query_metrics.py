@@ -0,0 +1,146 @@
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.src.core import config
+from app.src.utils.metrics import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_BIND = re.compile(r"%\([^)]+\)s|%s|\$\d+|(?<![:\w]):\w+|\?")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bin\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    normalize a statement so every execution of the same query shape
+    aggregates under one key
+
+    Example:
+        >>> fingerprint("SELECT * FROM users WHERE id = 10 AND email IN ('a', 'b')")
+        'SELECT * FROM users WHERE id = ? AND email IN (...)'
+    """
+    normalized = _COMMENT.sub(" ", statement)
+    normalized = _STRING.sub("?", normalized)
+    normalized = _BIND.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    normalized = _VALUES_LIST.sub("(...)", normalized)
+    return normalized.rstrip(";").strip()
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """describe bound parameters by type only, values never reach the log"""
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = parameter_shape(parameters[0]) if parameters else None
+        return f"{len(parameters)} x {first}"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.latency = LatencyWindow()
+
+    def observe(self, duration: float, rows: int) -> None:
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.rows += rows
+        self.latency.observe(duration)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "p50_ms": round(self.latency.percentile(50) * 1000, 3),
+            "p95_ms": round(self.latency.percentile(95) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "rows": self.rows
+        }
+
+
+class QueryMetrics:
+    """
+    Times every statement through cursor execute events, aggregates the
+    timings per statement fingerprint and logs statements slower than
+    DB_SLOW_QUERY_MS together with the shape of their bound parameters.
+
+    Example:
+        >>> query_metrics.attach(engine)
+        >>> query_metrics.stats(limit=10)
+    """
+
+    def __init__(self, slow_query_ms: int, max_fingerprints: int):
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.max_fingerprints = max_fingerprints
+        self.slow_queries = 0
+        self.dropped = 0
+        self.fingerprints: Dict[str, QueryStats] = {}
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started_at"].pop()
+        duration = time.perf_counter() - started
+        key = fingerprint(statement)
+
+        stats = self.fingerprints.get(key)
+        if stats is None:
+            if len(self.fingerprints) >= self.max_fingerprints:
+                self.dropped += 1
+            else:
+                stats = self.fingerprints[key] = QueryStats()
+        if stats is not None:
+            stats.observe(duration, max(cursor.rowcount or 0, 0))
+
+        if duration >= self.slow_query_seconds:
+            self.slow_queries += 1
+            logger.warning(
+                "slow query %.1fms: %s params=%s",
+                duration * 1000, key, parameter_shape(parameters, executemany)
+            )
+
+    def stats(self, limit: int = 50) -> dict:
+        ordered = sorted(
+            self.fingerprints.items(), key=lambda item: item[1].total, reverse=True)
+        return {
+            "slow_query_ms": round(self.slow_query_seconds * 1000),
+            "slow_queries": self.slow_queries,
+            "fingerprints": len(self.fingerprints),
+            "dropped": self.dropped,
+            "queries": [
+                {"fingerprint": key, **stats.to_dict()}
+                for key, stats in ordered[:limit]
+            ]
+        }
+
+
+query_metrics = QueryMetrics(
+    slow_query_ms=config.DB_SLOW_QUERY_MS,
+    max_fingerprints=config.DB_QUERY_STATS_MAX_FINGERPRINTS
+)
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# float totals accumulate rounding noise through +/- deltas
+TOTAL_TOLERANCE = 0.005
+
+REBUILD_DELETE = text("""
+    DELETE FROM transaction_monthly_rollup
+    WHERE CAST(:user_id AS integer) IS NULL OR user_id = :user_id
+""")
+REBUILD_INSERT = text("""
+    INSERT INTO transaction_monthly_rollup (user_id, month, type, category_code, total, count)
+    SELECT user_id,
+           CAST(date_trunc('month', date) AS date),
+           type,
+           COALESCE(category_code, ''),
+           sum(amount),
+           count(*)
+    FROM transactions
+    WHERE CAST(:user_id AS integer) IS NULL OR user_id = :user_id
+    GROUP BY 1, 2, 3, 4
+""")
+CHECK = text("""
+    WITH expected AS (
+        SELECT user_id,
+               CAST(date_trunc('month', date) AS date) AS month,
+               type,
+               COALESCE(category_code, '') AS category_code,
+               sum(amount) AS total,
+               count(*) AS count
+        FROM transactions
+        WHERE CAST(:user_id AS integer) IS NULL OR user_id = :user_id
+        GROUP BY 1, 2, 3, 4
+    ), actual AS (
+        SELECT user_id, month, type, category_code, total, count
+        FROM transaction_monthly_rollup
+        WHERE (CAST(:user_id AS integer) IS NULL OR user_id = :user_id)
+          AND count <> 0
+    )
+    SELECT COALESCE(e.user_id, a.user_id),
+           COALESCE(e.month, a.month),
+           COALESCE(e.type, a.type),
+           COALESCE(e.category_code, a.category_code),
+           COALESCE(e.total, 0), COALESCE(a.total, 0),
+           COALESCE(e.count, 0), COALESCE(a.count, 0)
+    FROM expected e
+    FULL OUTER JOIN actual a USING (user_id, month, type, category_code)
+    WHERE COALESCE(e.count, 0) <> COALESCE(a.count, 0)
+       OR abs(COALESCE(e.total, 0) - COALESCE(a.total, 0)) > :tolerance
+    ORDER BY 1, 2, 3, 4
+""")
+
+
+@dataclass
+class RollupMismatch:
+    user_id: int
+    month: object
+    type: str
+    category_code: str
+    expected_total: float
+    actual_total: float
+    expected_count: int
+    actual_count: int
+
+
+async def rebuild_rollup(db: AsyncSession, user_id: Optional[int] = None) -> int:
+    """
+    recompute the rollup from `transactions`, for one user or everyone;
+    writes to `transactions` wait until the caller commits
+    """
+    await db.execute(text("LOCK TABLE transactions IN SHARE MODE"))
+    await db.execute(REBUILD_DELETE, {"user_id": user_id})
+    result = await db.execute(REBUILD_INSERT, {"user_id": user_id})
+    return result.rowcount
+
+
+async def check_rollup(db: AsyncSession, user_id: Optional[int] = None) -> List[RollupMismatch]:
+    """rollup rows that disagree with a fresh aggregate of `transactions`"""
+    result = await db.execute(CHECK, {"user_id": user_id, "tolerance": TOTAL_TOLERANCE})
+    return [RollupMismatch(*row) for row in result]
@@ -1,8 +1,16 @@
-from app.src.database import Session
-from contextlib import contextmanager
+import logging
+import time
+from typing import AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.src.database import Session, AsyncSessionLocal, async_engine, async_pool_metrics
+from app.src.database.admission import admission, sync_admission
+from contextlib import contextmanager, asynccontextmanager
 import sqlalchemy
 import sqlalchemy.orm
 
+logger = logging.getLogger(__name__)
+
+
 @contextmanager
 def session_manager():
     """
@@ -17,19 +25,84 @@ def session_manager():
         >>>     result = db.query(Book).all()
     """
 
+    # blocking callers run on the event loop, so they are never queued
+    sync_admission.try_acquire()
     session = Session()
     try:
         yield session
     
     except sqlalchemy.exc.IntegrityError as error:
-        print("rollback transaction")
+        logger.debug("rollback transaction")
         session.rollback()
         raise error
 
     except Exception as error:
-        print("rollback transaction")
+        logger.debug("rollback transaction")
         session.rollback()
         raise error
     finally:
-        print("closing session connection")
-        session.close()
\ No newline at end of file
+        logger.debug("closing session connection")
+        try:
+            session.close()
+        finally:
+            sync_admission.release()
+
+
+@asynccontextmanager
+async def async_session_manager():
+    """
+    asyncio sqlalchemy session with context applied to make sure session closed,
+    queries are awaited so the event loop keeps serving other requests.
+    Raises PoolSaturatedError when the worker can not admit another session.
+
+    :param:
+    :return:
+
+    Example:
+        >>> from sqlalchemy import select
+        >>> from app.src.database.models.user import User
+        >>> async with async_session_manager() as db:
+        >>>     result = (await db.execute(select(User))).scalars().all()
+    """
+
+    await admission.acquire()
+    try:
+        # bind the session to one checked out connection, so commits in the
+        # middle of the unit of work do not hand it back to the pool
+        checkout_started = time.monotonic()
+        connection = await async_engine.connect()
+        async_pool_metrics.observe_checkout_wait(
+            time.monotonic() - checkout_started)
+    except BaseException:
+        admission.release()
+        raise
+    session = AsyncSessionLocal(bind=connection)
+    try:
+        yield session
+
+    except Exception as error:
+        logger.debug("rollback transaction")
+        await session.rollback()
+        raise error
+    finally:
+        logger.debug("closing session connection")
+        try:
+            await session.close()
+            await connection.close()
+        finally:
+            admission.release()
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """
+    request scoped unit of work: FastAPI caches this dependency per request,
+    so authentication and the handler share one session and one pooled
+    connection, which is returned when the request is finished
+
+    Example:
+        >>> @router.get("/")
+        >>> async def index(db: AsyncSession = Depends(get_db)):
+        >>>     ...
+    """
+    async with async_session_manager() as db:
+        yield db
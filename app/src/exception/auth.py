@@ -1,4 +1,13 @@
+from app.src.exception.overload import ServiceOverloadedError
+
+
 class UnauthorizedError(BaseException):
     """Raised when authentication failed"""
 
     pass
+
+
+class PasswordHasherBusyError(ServiceOverloadedError):
+    """Raised when too many password hashes are already waiting for the hasher pool"""
+
+    pass
@@ -0,0 +1,7 @@
+from app.src.exception.overload import ServiceOverloadedError
+
+
+class PoolSaturatedError(ServiceOverloadedError):
+    """Raised when a request can not be admitted to the database connection pool"""
+
+    pass
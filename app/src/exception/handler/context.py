@@ -8,6 +8,7 @@ from fastapi.exceptions import HTTPException
 from sqlalchemy.exc import IntegrityError
 
 from app.src.exception.auth import UnauthorizedError
+from app.src.exception.overload import ServiceOverloadedError
 from app.src.utils.response_builder import ResponseBuilder, ResponseListBuilder
 
 
@@ -62,6 +63,13 @@ def api_exception_handler(res, response_type=None):
     #     response.status = False
     #     response.message = str(errormessage)
 
+    except ServiceOverloadedError as error:
+        res.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        res.headers["Retry-After"] = str(error.retry_after)
+        response.status = False
+        response.code = res.status_code
+        response.message = str(error)
+
     except HTTPException as error:
         logging.warning(traceback.format_exc())
         res.status_code = error.status_code
@@ -0,0 +1,17 @@
+from starlette import status
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from app.src.exception.overload import ServiceOverloadedError
+from app.src.utils.response_builder import ResponseBuilder
+
+
+async def service_overloaded_handler(_: Request, exc: ServiceOverloadedError) -> JSONResponse:
+    response = ResponseBuilder()
+    response.message = str(exc)
+    response.status = False
+    response.code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(
+        response.to_dict(),
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(exc.retry_after)}
+    )
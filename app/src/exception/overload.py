@@ -0,0 +1,6 @@
+class ServiceOverloadedError(Exception):
+    """Raised when a request is shed because a bounded resource is full; answered with 503 + Retry-After"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,13 @@
+from app.src.exception.overload import ServiceOverloadedError
+
+
+class CircuitOpenError(ServiceOverloadedError):
+    """Raised when an outbound call is failed fast because its circuit is open"""
+
+    pass
+
+
+class ModelBusyError(ServiceOverloadedError):
+    """Raised when too many generations are already waiting for the model"""
+
+    pass
@@ -1,26 +1,52 @@
-from google import genai
-import json  # Import json for data formatting
+import logging
 
-from fastapi import HTTPException, Response, status as http_status, Security, Depends  # Add Depends
+from fastapi import HTTPException, Request, Response, status as http_status, Security, Depends  # Add Depends
 from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from fastapi_utils.cbv import cbv
 from fastapi_utils.inferring_router import InferringRouter
 from datetime import date  # Import date
-from typing import Optional, Dict, Any  # Import types
+from typing import Optional, Dict, Any, AsyncIterator  # Import types
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import TEMPLATE_PROMPT_ANALYSIS
-from app.src.core.config import GEMINI_API_KEY, JSON_FORMAT, TEMPLATE_PROMPT_ANALYSIS, TEMPLATE_PROMPT_ANALYSIS_JSON
+from app.src.core.config import TEMPLATE_PROMPT_ANALYSIS
+from app.src.exception.overload import ServiceOverloadedError
 from app.src.exception.handler.context import api_exception_handler
 # Keep if still needed for /ask-gemini
-from app.src.router.ai.schema import PromptRequest, FinancialAnalysisResponse, LatestFinancialAnalysisResponse
-from app.src.router.report.object import ReportObject  # Import ReportObject
-from app.src.database.models.user import User
-from app.src.router.user.security import get_authorized_user  # Import User for Depends
-from app.src.router.ai.object import AIObject  # Import AIObject
+from app.src.router.ai.schema import PromptRequest, FinancialAnalysisResponse, LatestFinancialAnalysisResponse, AIJobResponse
+from app.src.router.ai.jobs import ai_job_queue, analysis_period
+from app.src.router.user.principal import Principal
+from app.src.database.session import get_db
+from app.src.router.user.security import get_authorized_user, get_sessionless_authorized_user  # Import User for Depends
+from app.src.router.ai.object import AIObject, analyze_cashflow  # Import AIObject
 from app.src.database.models.ai_analysis import AnalysisType  # Import AnalysisType
+from app.src.services.gemini.client import gemini
+from app.src.utils.sse import SSE_HEADERS, sse_event
 
 router = InferringRouter()
-client = genai.Client(api_key=GEMINI_API_KEY)
+
+
+async def relay_chunks(request: Request, first: Optional[str], chunks: AsyncIterator[str]):
+    """
+    Server-Sent Events of a model stream. StreamingResponse asks for the
+    next event only after the previous one was sent, so a slow client
+    slows the upstream read down instead of buffering; a disconnect closes
+    `chunks`, which cancels the generation upstream.
+    """
+    try:
+        if first is not None:
+            yield sse_event({"text": first}, event="chunk")
+        async for text in chunks:
+            if await request.is_disconnected():
+                return
+            yield sse_event({"text": text}, event="chunk")
+        yield sse_event({}, event="done")
+    except Exception as error:
+        logging.exception("model stream failed")
+        yield sse_event({"message": str(error)}, event="error")
+    finally:
+        await chunks.aclose()
 
 
 @cbv(router)
@@ -32,13 +58,37 @@ class AIView:
     @router.post("/ask-gemini")
     async def analyze_report(
         self,
-        data: PromptRequest
+        data: PromptRequest,
+        request: Request,
+        stream: bool = False
     ) -> dict:
+        """
+        Ask the model a free form question.
+
+        - **stream**: relay the answer as Server-Sent Events while it is
+          generated, a `chunk` event per piece of text and a final `done`
+        """
         with api_exception_handler(self.res) as response_builder:
-            try:
-                response = client.models.generate_content(
-                    model="gemini-2.0-flash", contents=data.prompt
+            if stream:
+                chunks = gemini.generate_stream(
+                    request.client.host if request.client else None, data.prompt)
+                # the first chunk is awaited here, so a busy model or a failed
+                # call still answers with a plain error status
+                try:
+                    first = await chunks.__anext__()
+                except StopAsyncIteration:
+                    first = None
+                return StreamingResponse(
+                    relay_chunks(request, first, chunks),
+                    media_type="text/event-stream",
+                    headers=SSE_HEADERS
                 )
+            try:
+                # unauthenticated, so fairness is per client address
+                response = await gemini.generate(
+                    request.client.host if request.client else None, data.prompt)
+            except ServiceOverloadedError:
+                raise
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
             response_builder.status = True
@@ -52,7 +102,7 @@ class AIView:
         self,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-        authorized_user: User = Depends(get_authorized_user)
+        authorized_user: Principal = Depends(get_sessionless_authorized_user)
     ) -> dict:
         """
         Analyze financial cashflow data using AI.
@@ -64,49 +114,13 @@ class AIView:
         """
         with api_exception_handler(self.res) as response_builder:
             try:
-                # Get cashflow data
-                report_object = ReportObject(authorized_user)
-                cashflow_data = await report_object.get_cashflow_data(
-                    user_id=authorized_user.id,
-                    start_date=start_date,
-                    end_date=end_date
-                )
-
-                # Format data as JSON
-                json_data = json.dumps(
-                    jsonable_encoder(cashflow_data), indent=2)
-
-                # Build the prompt
-                prompt = TEMPLATE_PROMPT_ANALYSIS_JSON.format(
-                    json_data=json_data,
-                    json_format=json.dumps(JSON_FORMAT, indent=2)
-                )
-
-                # Call the AI model
-                # Use a suitable model, e.g., "gemini-pro" or "gemini-1.5-flash-latest"
-                # Check available models and their capabilities/costs
-                ai_response = client.models.generate_content(
-                    model="gemini-2.0-flash",
-                    contents=prompt
-                )
-
-                raw_response = ai_response.text
-
-                ai_object = AIObject(authorized_user)
-                try:
-                    result = ai_object.parse_ai_json_response(raw_response)
-                except json.JSONDecodeError as e:
-                    print("JSON Error:", e)
-                except Exception as e:
-                    print("General Error:", e)
-
-                # Save analysis result
-                await ai_object.save_analysis_result(
-                    analysis_type=AnalysisType.general,
-                    input_data="",  # Empty as requested
-                    result=result
-                )
+                # no request scoped session: it would stay checked out
+                # while the request waits for the model
+                analysis = await analyze_cashflow(authorized_user, start_date, end_date)
+                result = analysis.result
 
+            except ServiceOverloadedError:
+                raise
             except Exception as e:
                 # Log the error for debugging
                 print(f"Error generating financial analysis: {e}")
@@ -122,7 +136,8 @@ class AIView:
     @router.get("/latest-analysis", response_model=LatestFinancialAnalysisResponse)
     async def get_latest_analysis(
         self,
-        authorized_user: User = Depends(get_authorized_user)
+        authorized_user: Principal = Depends(get_authorized_user),
+        db: AsyncSession = Depends(get_db)
     ) -> dict:
         """
         Get the latest AI financial analysis for the current user.
@@ -130,7 +145,7 @@ class AIView:
         Returns the latest AI analysis result.
         """
         with api_exception_handler(self.res) as response_builder:
-            ai_object = AIObject(authorized_user)
+            ai_object = AIObject(authorized_user, db)
             latest_analysis = await ai_object.get_latest_analysis()
 
             response_builder.status = True
@@ -138,3 +153,71 @@ class AIView:
             response_builder.message = "Latest financial analysis retrieved successfully"
             response_builder.data = jsonable_encoder(latest_analysis)
         return response_builder.to_dict()
+
+    @router.post("/analyze-financial", response_model=AIJobResponse)
+    async def enqueue_financial_analysis(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        authorized_user: Principal = Depends(get_authorized_user),
+        db: AsyncSession = Depends(get_db)
+    ) -> dict:
+        """
+        Queue an AI financial analysis and return its job right away.
+
+        - **start_date**: Start date for cashflow data filter (optional)
+        - **end_date**: End date for cashflow data filter (optional)
+
+        A request while the same analysis is queued or running returns that
+        job. Follow it with GET /ai/jobs/{job_id} or /ai/jobs/{job_id}/events.
+        """
+        with api_exception_handler(self.res) as response_builder:
+            start_date, end_date = analysis_period(start_date, end_date)
+            job = await ai_job_queue.enqueue(
+                db, authorized_user.id, start_date, end_date, AnalysisType.general)
+
+            response_builder.status = True
+            response_builder.code = http_status.HTTP_202_ACCEPTED
+            response_builder.message = "Financial analysis queued"
+            response_builder.data = await ai_job_queue.status(db, job.id, authorized_user.id)
+            self.res.status_code = http_status.HTTP_202_ACCEPTED
+        return response_builder.to_dict()
+
+    @router.get("/jobs/{job_id}", response_model=AIJobResponse)
+    async def get_analysis_job(
+        self,
+        job_id: str,
+        authorized_user: Principal = Depends(get_authorized_user),
+        db: AsyncSession = Depends(get_db)
+    ) -> dict:
+        """
+        State of an analysis job, with the analysis result once it is done.
+        """
+        with api_exception_handler(self.res) as response_builder:
+            response_builder.status = True
+            response_builder.code = http_status.HTTP_200_OK
+            response_builder.message = "success"
+            response_builder.data = await ai_job_queue.status(db, job_id, authorized_user.id)
+        return response_builder.to_dict()
+
+    @router.get("/jobs/{job_id}/events")
+    async def stream_analysis_job(
+        self,
+        job_id: str,
+        authorized_user: Principal = Depends(get_authorized_user),
+        db: AsyncSession = Depends(get_db)
+    ):
+        """
+        Server-Sent Events of an analysis job: one event per state change
+        (queued, running, done, failed) until it finishes.
+        """
+        with api_exception_handler(self.res) as response_builder:
+            # the request session is closed before the body streams, the
+            # stream opens short sessions of its own per poll
+            await ai_job_queue.get(db, job_id, authorized_user.id)
+            return StreamingResponse(
+                ai_job_queue.events(job_id, authorized_user.id),
+                media_type="text/event-stream",
+                headers=SSE_HEADERS
+            )
+        return response_builder.to_dict()
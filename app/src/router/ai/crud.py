@@ -1,10 +1,9 @@
-from sqlalchemy.orm import Session
-from app.src.base.crud import CRUDBase
+from app.src.base.async_crud import AsyncCRUDBase
 from app.src.database.models.ai_analysis import AIAnalysis
 from app.src.router.ai.schema import AIAnalysisCreate
 
 
-class CRUDAIAnalysis(CRUDBase[AIAnalysis, AIAnalysisCreate, None]):
+class CRUDAIAnalysis(AsyncCRUDBase[AIAnalysis, AIAnalysisCreate, None]):
     pass
 
 
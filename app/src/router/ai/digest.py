@@ -0,0 +1,40 @@
+import hashlib
+import json
+from typing import Dict, List
+
+from fastapi.encoders import jsonable_encoder
+
+
+def canonical_json(data) -> str:
+    """one byte sequence per value: sorted keys, no whitespace"""
+    return json.dumps(
+        jsonable_encoder(data), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def sha256(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def input_hash(*parts: str) -> str:
+    """
+    hash of everything that decides the model output; the parts are length
+    prefixed so moving bytes from one part to the next changes the hash
+
+    Example:
+        >>> input_hash(model, template, canonical_json(cashflow))
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        encoded = part.encode()
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def month_digests(cashflow: List[dict]) -> Dict[str, str]:
+    return {month["month"]: sha256(canonical_json(month)) for month in cashflow}
+
+
+def changed_months(current: Dict[str, str], previous: Dict[str, str]) -> List[str]:
+    return sorted(month for month, digest in current.items() if previous.get(month) != digest)
+
@@ -0,0 +1,372 @@
+import asyncio
+import logging
+import uuid
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.src.core import config
+from app.src.database.models.ai_analysis import AnalysisType
+from app.src.database.models.ai_analysis_job import AIAnalysisJob, AIJobStatus
+from app.src.database.session import async_session_manager
+from app.src.exception.service import ModelBusyError
+from app.src.router.ai.object import analyze_cashflow
+from app.src.utils.sse import SSE_KEEP_ALIVE, sse_event
+
+logger = logging.getLogger(__name__)
+
+
+def analysis_period(start_date: Optional[date], end_date: Optional[date]) -> Tuple[date, date]:
+    """the period get_cashflow_data reads, made explicit so equal requests collapse"""
+    if not start_date or not end_date:
+        today = datetime.now().date()
+        return today.replace(month=1, day=1), today.replace(month=12, day=31)
+    return start_date, end_date
+
+
+def job_to_dict(job: AIAnalysisJob, result: Optional[dict] = None) -> dict:
+    return {
+        "job_id": job.id,
+        "status": job.status.value,
+        "analysis_type": job.analysis_type.value,
+        "start_date": job.start_date.isoformat(),
+        "end_date": job.end_date.isoformat(),
+        "analysis_id": job.analysis_id,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "result": result
+    }
+
+
+class AIJobQueue:
+    """
+    Background financial analyses. Jobs are rows of ai_analysis_job, the
+    in-memory queue only carries their ids to `workers` tasks of this
+    worker; a job is claimed with a conditional UPDATE, so a job queued by
+    several workers (e.g. after a restart) still runs once. A request for a
+    user, type and period that already has a job queued or running gets
+    that job back instead of a new one.
+
+    Jobs cut short by stop() go back to queued. A job left running by a
+    worker that died is not in flight anymore once `stale_after` seconds
+    passed; every worker sweeps for those, and for queued jobs nobody
+    holds, every `sweep_interval` seconds and runs them again.
+
+    Example:
+        >>> job = await ai_job_queue.enqueue(db, user.id, start, end)
+        >>> async for event in ai_job_queue.events(job.id, user.id):
+        >>>     ...
+    """
+
+    # a lost race on the in-flight index is retried this often before giving up
+    ENQUEUE_ATTEMPTS = 3
+
+    def __init__(
+        self, workers: int, queue_size: int, poll_interval: float, stale_after: int, sweep_interval: float
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.sweep_interval = sweep_interval
+        self.enqueued = 0
+        self.collapsed = 0
+        self.done = 0
+        self.failed = 0
+        self.recovered = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._pending: Set[str] = set()
+        self._running: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._finished: Dict[str, asyncio.Event] = {}
+
+    def _stale_before(self) -> datetime:
+        return datetime.now() - timedelta(seconds=self.stale_after)
+
+    def _put(self, job_id: str) -> bool:
+        """put a job on this worker's queue once, False when it is full"""
+        if job_id in self._pending:
+            return True
+        if self._queue.full():
+            return False
+        self._pending.add(job_id)
+        self._queue.put_nowait(job_id)
+        return True
+
+    async def _in_flight(
+        self, db: AsyncSession, user_id: int, analysis_type: AnalysisType, start_date: date, end_date: date
+    ) -> Optional[AIAnalysisJob]:
+        query = select(AIAnalysisJob).where(
+            AIAnalysisJob.user_id == user_id,
+            AIAnalysisJob.analysis_type == analysis_type,
+            AIAnalysisJob.start_date == start_date,
+            AIAnalysisJob.end_date == end_date,
+            # a running job whose worker died is not waited on
+            or_(
+                AIAnalysisJob.status == AIJobStatus.queued,
+                and_(
+                    AIAnalysisJob.status == AIJobStatus.running,
+                    AIAnalysisJob.started_at >= self._stale_before()
+                )
+            )
+        )
+        return (await db.execute(query)).scalars().first()
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        start_date: date,
+        end_date: date,
+        analysis_type: AnalysisType = AnalysisType.general
+    ) -> AIAnalysisJob:
+        for _ in range(self.ENQUEUE_ATTEMPTS):
+            job = await self._in_flight(db, user_id, analysis_type, start_date, end_date)
+            if job is not None:
+                self.collapsed += 1
+                return job
+            if self._queue.full():
+                raise ModelBusyError(
+                    "Too many analyses queued, please retry", retry_after=config.GEMINI_RETRY_AFTER)
+
+            job = AIAnalysisJob(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                analysis_type=analysis_type,
+                start_date=start_date,
+                end_date=end_date,
+                status=AIJobStatus.queued,
+                created_at=datetime.now()
+            )
+            db.add(job)
+            try:
+                await db.commit()
+            except IntegrityError:
+                # another request won the in-flight index in the meantime (it
+                # may have finished already) or a stale job still holds it,
+                # look again
+                await db.rollback()
+                await self._requeue_stale(db, user_id, analysis_type, start_date, end_date)
+                continue
+            self.enqueued += 1
+            self._put(job.id)
+            return job
+        raise ModelBusyError("Could not queue the analysis, please retry", retry_after=config.GEMINI_RETRY_AFTER)
+
+    async def _requeue_stale(
+        self, db: AsyncSession, user_id: int, analysis_type: AnalysisType, start_date: date, end_date: date
+    ) -> None:
+        """requeue the stale running job holding the in-flight index of this request, if any"""
+        requeued = (await db.execute(
+            update(AIAnalysisJob)
+            .where(
+                AIAnalysisJob.user_id == user_id,
+                AIAnalysisJob.analysis_type == analysis_type,
+                AIAnalysisJob.start_date == start_date,
+                AIAnalysisJob.end_date == end_date,
+                AIAnalysisJob.status == AIJobStatus.running,
+                AIAnalysisJob.started_at < self._stale_before()
+            )
+            .values(status=AIJobStatus.queued, started_at=None)
+            .returning(AIAnalysisJob.id)
+        )).scalars().all()
+        await db.commit()
+        for job_id in requeued:
+            self._put(job_id)
+
+    async def get(self, db: AsyncSession, job_id: str, user_id: int) -> AIAnalysisJob:
+        query = select(AIAnalysisJob).where(
+            AIAnalysisJob.id == job_id, AIAnalysisJob.user_id == user_id)
+        job = (await db.execute(query)).scalars().first()
+        if job is None:
+            raise FileNotFoundError("Job not found")
+        return job
+
+    async def status(self, db: AsyncSession, job_id: str, user_id: int) -> dict:
+        """the job as a dict, with the analysis result once it is done"""
+        job = await self.get(db, job_id, user_id)
+        result = None
+        if job.status == AIJobStatus.done and job.analysis_id is not None:
+            await db.refresh(job, ["analysis"])
+            result = job.analysis.result
+        return job_to_dict(job, result)
+
+    async def _claim(self, db: AsyncSession, job_id: str) -> Optional[AIAnalysisJob]:
+        claimed = await db.execute(
+            update(AIAnalysisJob)
+            .where(AIAnalysisJob.id == job_id, AIAnalysisJob.status == AIJobStatus.queued)
+            .values(status=AIJobStatus.running, started_at=datetime.now())
+            .returning(AIAnalysisJob.id)
+        )
+        await db.commit()
+        if claimed.scalar() is None:
+            return None
+        return (await db.execute(
+            select(AIAnalysisJob).where(AIAnalysisJob.id == job_id))).scalars().first()
+
+    async def _finish(self, job_id: str, status: AIJobStatus, **values) -> None:
+        async with async_session_manager() as db:
+            await db.execute(
+                update(AIAnalysisJob)
+                .where(AIAnalysisJob.id == job_id)
+                .values(status=status, finished_at=datetime.now(), **values)
+            )
+            await db.commit()
+
+    async def run(self, job_id: str) -> bool:
+        """claim and run one job, False when another worker has it"""
+        async with async_session_manager() as db:
+            job = await self._claim(db, job_id)
+            if job is None:
+                return False
+        self._running.add(job_id)
+        analysis = await analyze_cashflow(
+            SimpleNamespace(id=job.user_id), job.start_date, job.end_date, job.analysis_type)
+        await self._finish(job_id, AIJobStatus.done, analysis_id=analysis.id)
+        return True
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            self._pending.discard(job_id)
+            try:
+                if await self.run(job_id):
+                    self.done += 1
+            except Exception as error:
+                self.failed += 1
+                logger.exception("AI analysis job %s failed", job_id)
+                try:
+                    await self._finish(job_id, AIJobStatus.failed, error=str(error))
+                except Exception:
+                    logger.exception("could not mark AI analysis job %s failed", job_id)
+            finally:
+                self._running.discard(job_id)
+                self._queue.task_done()
+                event = self._finished.pop(job_id, None)
+                if event is not None:
+                    event.set()
+
+    async def _recover(self, queued_before: datetime) -> int:
+        """
+        queue jobs a dead worker left behind: running ones gone stale go back
+        to queued, and queued ones created before `queued_before` that this
+        worker does not hold yet are taken on; the claim keeps a job that
+        another worker also holds from running twice
+        """
+        free = self.queue_size - self._queue.qsize()
+        async with async_session_manager() as db:
+            await db.execute(
+                update(AIAnalysisJob)
+                .where(
+                    AIAnalysisJob.status == AIJobStatus.running,
+                    AIAnalysisJob.started_at < self._stale_before()
+                )
+                .values(status=AIJobStatus.queued, started_at=None)
+            )
+            await db.commit()
+            if free <= 0:
+                return 0
+            query = select(AIAnalysisJob.id).where(
+                AIAnalysisJob.status == AIJobStatus.queued,
+                AIAnalysisJob.created_at < queued_before
+            )
+            if self._pending:
+                query = query.where(AIAnalysisJob.id.not_in(self._pending))
+            job_ids = (await db.execute(
+                query.order_by(AIAnalysisJob.created_at).limit(free))).scalars().all()
+        recovered = sum(self._put(job_id) for job_id in job_ids)
+        self.recovered += recovered
+        return recovered
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self._recover(queued_before=self._stale_before())
+            except Exception:
+                logger.exception("could not sweep stale AI analysis jobs")
+
+    async def start(self) -> None:
+        try:
+            await self._recover(queued_before=datetime.now())
+        except Exception:
+            logger.exception("could not recover queued AI analysis jobs")
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweep_loop()))
+
+    async def stop(self) -> None:
+        running = list(self._running)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if not running:
+            return
+        # jobs cut short go back to queued, the next worker to sweep runs them
+        try:
+            async with async_session_manager() as db:
+                await db.execute(
+                    update(AIAnalysisJob)
+                    .where(AIAnalysisJob.id.in_(running), AIAnalysisJob.status == AIJobStatus.running)
+                    .values(status=AIJobStatus.queued, started_at=None)
+                )
+                await db.commit()
+        except Exception:
+            logger.exception("could not requeue %s AI analysis jobs", len(running))
+
+    async def events(self, job_id: str, user_id: int) -> AsyncIterator[str]:
+        """
+        Server-Sent Events of one job: its state whenever it changes and a
+        keep-alive comment otherwise, until the job is done or failed. A job
+        of this worker wakes the stream right away, one of another worker is
+        seen on the next poll.
+        """
+        status = None
+        try:
+            while True:
+                async with async_session_manager() as db:
+                    data = await self.status(db, job_id, user_id)
+
+                if data["status"] != status:
+                    status = data["status"]
+                    yield sse_event(data, event=status)
+                else:
+                    yield SSE_KEEP_ALIVE
+                if status in (AIJobStatus.done.value, AIJobStatus.failed.value):
+                    return
+
+                event = self._finished.setdefault(job_id, asyncio.Event())
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._finished.pop(job_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers if self._tasks else 0,
+            "queue_depth": self._queue.qsize(),
+            "queue_size": self.queue_size,
+            "enqueued": self.enqueued,
+            "collapsed": self.collapsed,
+            "done": self.done,
+            "failed": self.failed,
+            "recovered": self.recovered,
+            "running": len(self._running)
+        }
+
+
+ai_job_queue = AIJobQueue(
+    workers=config.AI_JOB_WORKERS,
+    queue_size=config.AI_JOB_QUEUE_SIZE,
+    poll_interval=config.AI_JOB_POLL_INTERVAL,
+    stale_after=config.AI_JOB_STALE_AFTER,
+    sweep_interval=config.AI_JOB_SWEEP_INTERVAL
+)
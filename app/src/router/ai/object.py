@@ -1,61 +1,162 @@
 import json
 import re
-from app.src.database.session import session_manager
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.src.core.config import (
+    AI_ANALYSIS_FRESHNESS, GEMINI_MODEL, TEMPLATE_PROMPT_ANALYSIS_JSON)
 from app.src.database.models.user import User  # Import User
 from app.src.router.ai.crud import ai_analysis_crud
+from app.src.router.ai.digest import canonical_json, changed_months, input_hash, month_digests
+from app.src.router.ai.prompt import analysis_prompt, compaction_signature
 # Import LatestFinancialAnalysis
 from app.src.router.ai.schema import AIAnalysisCreate, LatestFinancialAnalysis
 # Import AIAnalysis and AnalysisType
 from app.src.database.models.ai_analysis import AIAnalysis, AnalysisType
-from typing import Optional  # Import Optional
-from sqlalchemy import desc  # Import desc
+from typing import Dict, Optional, Tuple  # Import Optional
+from sqlalchemy import desc, select  # Import desc
+from app.src.database.session import async_session_manager
+from app.src.router.report.object import ReportObject
+from app.src.services.gemini.client import gemini
+
+
+@dataclass(frozen=True)
+class PendingAnalysis:
+    """an analysis waiting for the model answer to its prompt"""
+    analysis_type: AnalysisType
+    prompt: str
+    input_data: str
+    input_hash: str
+    month_digests: Dict[str, str]
 
 
 class AIObject:
     """ AI Object """
 
-    def __init__(self, authorized_user: User):
+    def __init__(self, authorized_user: User, db: AsyncSession):
         self.authorized_user = authorized_user
         self.crud_ai_analysis = ai_analysis_crud
+        self.db = db
 
     async def save_analysis_result(
         self,
         analysis_type: AnalysisType,
         input_data: str,
-        result: str
-    ):
-        with session_manager() as db:
-            analysis_data = AIAnalysisCreate(
-                user_id=self.authorized_user.id,
-                analysis_type=analysis_type,
-                input_data=input_data,
-                result=result
-            )
-            await self.crud_ai_analysis.create(db, analysis_data)
-            # Optionally, you can return the created analysis object if needed
-            # return created_analysis
+        result: str,
+        input_hash: Optional[str] = None,
+        month_digests: Optional[Dict[str, str]] = None
+    ) -> AIAnalysis:
+        analysis_data = AIAnalysisCreate(
+            user_id=self.authorized_user.id,
+            analysis_type=analysis_type,
+            input_data=input_data,
+            result=result,
+            input_hash=input_hash,
+            month_digests=month_digests
+        )
+        return await self.crud_ai_analysis.create(self.db, analysis_data)
+
+    async def get_fresh_analysis(
+        self, analysis_type: AnalysisType, input_hash: str
+    ) -> Optional[AIAnalysis]:
+        """an analysis of exactly this input made within AI_ANALYSIS_FRESHNESS seconds"""
+        query = select(AIAnalysis).where(
+            AIAnalysis.user_id == self.authorized_user.id,
+            AIAnalysis.analysis_type == analysis_type,
+            AIAnalysis.input_hash == input_hash,
+            AIAnalysis.created_at >= datetime.now() - timedelta(seconds=AI_ANALYSIS_FRESHNESS)
+        ).order_by(desc(AIAnalysis.created_at)).limit(1)
+        return (await self.db.execute(query)).scalars().first()
+
+    async def get_previous_analysis(self, analysis_type: AnalysisType) -> Optional[AIAnalysis]:
+        query = select(AIAnalysis).where(
+            AIAnalysis.user_id == self.authorized_user.id,
+            AIAnalysis.analysis_type == analysis_type,
+            AIAnalysis.month_digests != None
+        ).order_by(desc(AIAnalysis.created_at)).limit(1)
+        return (await self.db.execute(query)).scalars().first()
+
+    async def prepare_analysis(
+        self, cashflow_data: list, analysis_type: AnalysisType = AnalysisType.general
+    ) -> Tuple[Optional[AIAnalysis], Optional[PendingAnalysis]]:
+        """
+        Content addressed lookup, (analysis, None) when ai_analysis already
+        answers this input within AI_ANALYSIS_FRESHNESS, otherwise
+        (None, pending) with the compacted prompt to send.
+
+        Months unchanged since the previous analysis are sent as totals
+        only, together with that previous analysis, so the model carries its
+        findings forward. The hash covers everything the prompt is built
+        from: the data, the changed months and the previous analysis used.
+        """
+        cashflow = jsonable_encoder(cashflow_data)
+        canonical = canonical_json(cashflow)
+        digests = month_digests(cashflow)
+
+        previous = await self.get_previous_analysis(analysis_type)
+        if previous is not None and previous.month_digests == digests:
+            # the very same data: answered by it while fresh, else analysed anew in full
+            if previous.created_at >= datetime.now() - timedelta(seconds=AI_ANALYSIS_FRESHNESS):
+                return previous, None
+            previous = None
+
+        changed = changed_months(digests, previous.month_digests) if previous is not None else sorted(digests)
+        if len(changed) == len(digests):
+            # nothing to carry forward
+            previous = None
+        key = input_hash(
+            GEMINI_MODEL,
+            TEMPLATE_PROMPT_ANALYSIS_JSON,
+            compaction_signature(),
+            canonical,
+            canonical_json(changed),
+            str(previous.id) if previous is not None else ""
+        )
+
+        fresh = await self.get_fresh_analysis(analysis_type, key)
+        if fresh is not None:
+            return fresh, None
+
+        prompt = analysis_prompt(
+            cashflow, changed, previous.result if previous is not None else None)
+        return None, PendingAnalysis(
+            analysis_type=analysis_type,
+            prompt=prompt,
+            input_data=canonical,
+            input_hash=key,
+            month_digests=digests
+        )
+
+    async def complete_analysis(self, pending: PendingAnalysis, raw_response: str) -> AIAnalysis:
+        return await self.save_analysis_result(
+            analysis_type=pending.analysis_type,
+            input_data=pending.input_data,
+            result=self.parse_ai_json_response(raw_response),
+            input_hash=pending.input_hash,
+            month_digests=pending.month_digests
+        )
 
     async def get_latest_analysis(self) -> Optional[LatestFinancialAnalysis]:
         """Get the latest AI analysis result for the authorized user."""
-        with session_manager() as db:
-            # Query the AIAnalysis table for the latest record for the user
-            latest_analysis = db.query(AIAnalysis)
-            latest_analysis = latest_analysis.filter(
-                AIAnalysis.user_id == self.authorized_user.id)
-            latest_analysis = latest_analysis.order_by(
-                desc(AIAnalysis.created_at))
-            latest_analysis = latest_analysis.first()
-
-            if not latest_analysis:
-                raise FileNotFoundError("Data Not Found")
-
-            # Map the SQLAlchemy model to the Pydantic schema
-            return LatestFinancialAnalysis(
-                analysis_type=latest_analysis.analysis_type,
-                input_data=latest_analysis.input_data,
-                result=latest_analysis.result,
-                created_at=latest_analysis.created_at
-            )
+        # Query the AIAnalysis table for the latest record for the user
+        latest_analysis = select(AIAnalysis)
+        latest_analysis = latest_analysis.where(
+            AIAnalysis.user_id == self.authorized_user.id)
+        latest_analysis = latest_analysis.order_by(
+            desc(AIAnalysis.created_at))
+        latest_analysis = (await self.db.execute(latest_analysis)).scalars().first()
+
+        if not latest_analysis:
+            raise FileNotFoundError("Data Not Found")
+
+        # Map the SQLAlchemy model to the Pydantic schema
+        return LatestFinancialAnalysis(
+            analysis_type=latest_analysis.analysis_type,
+            input_data=latest_analysis.input_data,
+            result=latest_analysis.result,
+            created_at=latest_analysis.created_at
+        )
 
 
     def parse_ai_json_response(self, raw_response):
@@ -69,4 +170,27 @@ class AIObject:
             print("Unicode decode warning:", e)
         
         # Final parsing
-        return json.loads(cleaned)
\ No newline at end of file
+        return json.loads(cleaned)
+
+
+async def analyze_cashflow(
+    user,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    analysis_type: AnalysisType = AnalysisType.general
+) -> AIAnalysis:
+    """
+    Analyze the user's cashflow of the period unless a fresh analysis of it
+    exists. Reading and saving run in two short sessions of their own, so no
+    connection or admission slot is held while waiting for the model.
+    """
+    async with async_session_manager() as db:
+        cashflow_data = await ReportObject(user, db).get_cashflow_data(
+            user_id=user.id, start_date=start_date, end_date=end_date)
+        analysis, pending = await AIObject(user, db).prepare_analysis(cashflow_data, analysis_type)
+    if analysis is not None:
+        return analysis
+
+    ai_response = await gemini.generate(user.id, pending.prompt)
+    async with async_session_manager() as db:
+        return await AIObject(user, db).complete_analysis(pending, ai_response.text)
@@ -0,0 +1,142 @@
+import json
+import logging
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from app.src.core import config
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str, chars_per_token: float = config.AI_PROMPT_CHARS_PER_TOKEN) -> int:
+    """rough token count of `text`, close enough to keep prompts under a budget"""
+    return math.ceil(len(text) / chars_per_token)
+
+
+def compact_json(data) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def amount(value: float):
+    """whole amounts without the trailing .0, everything else to two decimals"""
+    return int(value) if float(value).is_integer() else round(value, 2)
+
+
+def by_category(transactions: Iterable[dict]) -> Dict[str, object]:
+    totals = defaultdict(float)
+    for item in transactions:
+        totals[item["category_code"] or "-"] += item["amount"]
+    return {code: amount(total) for code, total in sorted(totals.items(), key=lambda item: -item[1])}
+
+
+def top_transactions(transactions: List[dict], top_n: int) -> List[dict]:
+    largest = sorted(transactions, key=lambda item: -item["amount"])[:top_n]
+    return [
+        {
+            "date": str(item["date"])[:10],
+            "category_code": item["category_code"],
+            "description": item["description"],
+            "amount": amount(item["amount"])
+        }
+        for item in largest
+    ]
+
+
+def compact_month(month: dict, top_n: int, categories: bool, unchanged: bool) -> dict:
+    """
+    one month of get_cashflow_data as totals, per category totals and its
+    `top_n` largest incomes and expenses; months unchanged since the
+    previous analysis keep their totals only
+    """
+    income = sum(item["amount"] for item in month["income"])
+    expense = sum(item["amount"] for item in month["expense"])
+    compacted = {
+        "month": month["month"],
+        "total_income": amount(income),
+        "total_expense": amount(expense),
+        "net_cashflow": amount(income - expense)
+    }
+    if unchanged:
+        compacted["unchanged_since_last_analysis"] = True
+        return compacted
+    if categories:
+        compacted["income_by_category"] = by_category(month["income"])
+        compacted["expense_by_category"] = by_category(month["expense"])
+    if top_n:
+        compacted["top_income"] = top_transactions(month["income"], top_n)
+        compacted["top_expense"] = top_transactions(month["expense"], top_n)
+    return compacted
+
+
+def compact_cashflow(
+    cashflow: List[dict],
+    changed: Iterable[str],
+    token_budget: int,
+    top_n: int = config.AI_PROMPT_TOP_TRANSACTIONS,
+    previous_result: Optional[dict] = None
+) -> str:
+    """
+    The cashflow as compact JSON within `token_budget` estimated tokens:
+    fewer top transactions per month first (halving down to none), then no
+    per category totals. The smallest form, monthly totals, is returned
+    even when it does not fit.
+
+    Months outside `changed` are cut down to their totals only when
+    `previous_result`, the analysis that saw their detail, goes along:
+    the data then is {"previous_analysis": ..., "months": [...]}.
+
+    Example:
+        >>> json_data = compact_cashflow(cashflow, changed={"2026-09"}, token_budget=4000)
+    """
+    changed = set(changed) if previous_result is not None else {month["month"] for month in cashflow}
+    levels = []
+    while top_n:
+        levels.append((top_n, True))
+        top_n //= 2
+    levels += [(0, True), (0, False)]
+
+    for top_n, categories in levels:
+        months = [
+            compact_month(month, top_n, categories, month["month"] not in changed)
+            for month in cashflow
+        ]
+        json_data = compact_json(
+            months if previous_result is None
+            else {"previous_analysis": previous_result, "months": months})
+        if estimate_tokens(json_data) <= token_budget:
+            return json_data
+    logger.warning(
+        "cashflow of %s months needs ~%s tokens, over the budget of %s",
+        len(cashflow), estimate_tokens(json_data), token_budget)
+    return json_data
+
+
+def compaction_signature() -> str:
+    """the compaction settings, part of the analysis input hash"""
+    return compact_json({
+        # bump when the prompt layout changes, so cached analyses are not reused
+        "layout": 2,
+        "top_transactions": config.AI_PROMPT_TOP_TRANSACTIONS,
+        "token_budget": config.AI_PROMPT_TOKEN_BUDGET
+    })
+
+
+# the static part of every analysis prompt, serialised the same way on every
+# call; the template puts it ahead of the data so it forms a stable prefix
+JSON_FORMAT_TEXT = json.dumps(config.JSON_FORMAT, indent=2)
+TEMPLATE_TOKENS = estimate_tokens(
+    config.TEMPLATE_PROMPT_ANALYSIS_JSON.format(json_data="", json_format=JSON_FORMAT_TEXT))
+
+
+def analysis_prompt(
+    cashflow: List[dict], changed: Iterable[str], previous_result: Optional[dict] = None
+) -> str:
+    json_data = compact_cashflow(
+        cashflow,
+        changed,
+        token_budget=config.AI_PROMPT_TOKEN_BUDGET - TEMPLATE_TOKENS,
+        previous_result=previous_result
+    )
+    return config.TEMPLATE_PROMPT_ANALYSIS_JSON.format(
+        json_data=json_data, json_format=JSON_FORMAT_TEXT)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, Optional
 from app.src.router.response import BaseResponse
 from app.src.database.models.ai_analysis import AnalysisType
 from datetime import datetime
@@ -14,12 +14,18 @@ class FinancialAnalysisResponse(BaseResponse):
     data: Optional[dict] = None
 
 
+class AIJobResponse(BaseResponse):
+    data: Optional[dict] = None
+
+
 # Add schema for creating AI analysis record
 class AIAnalysisCreate(BaseModel):
     user_id: int
     analysis_type: AnalysisType
     input_data: str
     result: dict
+    input_hash: Optional[str] = None
+    month_digests: Optional[Dict[str, str]] = None
 
 
 # Add schema for getting latest AI analysis
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.src.core import config
+from app.src.database.models.category import Category
+from app.src.database.models.transaction import TransactionType
+from app.src.database.session import async_session_manager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CategoryEntry:
+    id: int
+    name: str
+    code: str
+    type: TransactionType
+    icon: Optional[str]
+    color: Optional[str]
+    is_active: Optional[bool]
+
+
+class CategoryCache:
+    """
+    Versioned in-process copy of the `categories` table.
+
+    It is loaded on startup. Once `ttl` seconds have passed, the next read
+    compares a cheap (count, max(updated_at)) signature with the table and
+    reloads only when it changed; `invalidate()` forces that check on the next
+    read. Every reload bumps `version`. Readers never wait on a refresh once a
+    snapshot exists, they keep using the previous one.
+
+    The API has no category write path, categories are maintained in the
+    database directly, so a change shows up within `ttl` seconds in every
+    worker. A write path added later should call `invalidate()`, which only
+    reaches its own worker; the others still pick the change up by the TTL.
+
+    Example:
+        >>> await category_cache.refresh(db)
+        >>> category_cache.get("FOOD").name
+        'Food'
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.version = 0
+        self.loaded_at: Optional[float] = None
+        self.reloads = 0
+        self.checks = 0
+        self._categories: Tuple[CategoryEntry, ...] = ()
+        self._by_code: Dict[str, CategoryEntry] = {}
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        return time.monotonic() - self._checked_at >= self.ttl
+
+    def invalidate(self) -> None:
+        """check the table on the next read of this worker, call it after a category write"""
+        self._checked_at = 0.0
+
+    async def refresh(self, db: Optional[AsyncSession] = None) -> None:
+        """reload when the TTL passed and the table changed, uses `db` when given"""
+        if not self.is_stale:
+            return
+        if self._lock.locked() and self.version:
+            return
+        async with self._lock:
+            if not self.is_stale:
+                return
+            if db is None:
+                async with async_session_manager() as session:
+                    await self._refresh(session)
+            else:
+                await self._refresh(db)
+
+    async def _refresh(self, db: AsyncSession) -> None:
+        self.checks += 1
+        signature = tuple((await db.execute(
+            select(func.count(Category.id), func.max(Category.updated_at)))).one())
+        if signature != self._signature or not self.version:
+            rows = (await db.execute(
+                select(Category).order_by(Category.id.desc()))).scalars().all()
+            self._load(rows, signature)
+        self._checked_at = time.monotonic()
+
+    def _load(self, rows: List[Category], signature) -> None:
+        categories = tuple(
+            CategoryEntry(
+                id=row.id,
+                name=row.name,
+                code=row.code,
+                type=row.type,
+                icon=row.icon,
+                color=row.color,
+                is_active=row.is_active
+            )
+            for row in rows
+        )
+        # swap whole snapshots so readers never see a half loaded cache
+        self._by_code = {category.code: category for category in categories}
+        self._categories = categories
+        self._signature = signature
+        self.version += 1
+        self.reloads += 1
+        self.loaded_at = time.time()
+        logger.info("category cache loaded, version %s, %s categories",
+                    self.version, len(categories))
+
+    def get(self, code: Optional[str]) -> Optional[CategoryEntry]:
+        return self._by_code.get(code) if code else None
+
+    def snapshot(self) -> Dict[str, CategoryEntry]:
+        """the current categories by code, unaffected by later reloads"""
+        return self._by_code
+
+    def all(self, category_type: Optional[TransactionType] = None) -> List[CategoryEntry]:
+        if category_type is None:
+            return list(self._categories)
+        return [category for category in self._categories if category.type == category_type]
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "categories": len(self._categories),
+            "ttl": self.ttl,
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "checks": self.checks
+        }
+
+
+category_cache = CategoryCache(ttl=config.CATEGORY_CACHE_TTL)
@@ -1,19 +1,19 @@
 from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.src.database.models.category import Category
 from app.src.database.models.transaction import TransactionType
+from app.src.router.category.cache import CategoryEntry, category_cache
 from app.src.router.category.crud import CRUDCategory
-from app.src.database.session import session_manager
 
 
 class CategoryObject:
-    def __init__(self, authorized_user):
+    def __init__(self, authorized_user, db: AsyncSession):
         self.crud_category = CRUDCategory(Category)
         self.authorized_user = authorized_user
+        self.db = db
 
-    async def get_categories(self, category_type: Optional[TransactionType] = None) -> List[Category]:
-        with session_manager() as db:
-            filters = []
-            if type:
-                filters.append(Category.type == category_type)
-            data = await self.crud_category.get_multi(*filters, db=db)
-        return data
+    async def get_categories(self, category_type: Optional[TransactionType] = None) -> List[CategoryEntry]:
+        await category_cache.refresh(self.db)
+        return category_cache.all(category_type)
@@ -3,8 +3,10 @@ from fastapi_utils.cbv import cbv
 from fastapi_utils.inferring_router import InferringRouter
 from starlette import status as http_status
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.src.database.models.user import User
+from app.src.router.user.principal import Principal
+from app.src.database.session import get_db
 from app.src.router.family.object import FamilyObject
 from app.src.router.family.schema import FamilyListResponse, AddFamilyMemberRequest, FamilyMemberDetail, FamilyDetailResponse
 from app.src.router.user.security import get_authorized_user
@@ -18,9 +20,13 @@ class FamilyView:
     """ Family View Router """
     res: Response
 
-    def __init__(self, authorized_user: User = Depends(get_authorized_user)):
+    def __init__(
+        self,
+        authorized_user: Principal = Depends(get_authorized_user),
+        db: AsyncSession = Depends(get_db)
+    ):
         self.authorized_user = authorized_user
-        self.family_object = FamilyObject(authorized_user)
+        self.family_object = FamilyObject(authorized_user, db)
 
     @router.get("/", response_model=FamilyListResponse)
     async def get_family_members(self) -> dict:
@@ -1,17 +1,17 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.src.database.models.family import Family, EnumRelationship
 from app.src.database.models.user import User
-from app.src.database.session import session_manager
 from typing import List, Tuple
-from sqlalchemy import or_
+from sqlalchemy import or_, select, union
 from fastapi import HTTPException
 from starlette import status
 from enum import Enum
 
 
 class FamilyObject:
-    def __init__(self, authorized_user: User):
+    def __init__(self, authorized_user: User, db: AsyncSession):
         self.authorized_user = authorized_user
+        self.db = db
 
     async def get_family_members(self) -> Tuple[List[dict], int]:
         """
@@ -22,63 +22,62 @@ class FamilyObject:
 
         Returns a tuple of (family_members, total_count)
         """
-        with session_manager() as db:
-            # Query to get family members with their user details
-            # Case 1: Current user is the main user
-            query1 = db.query(
-                Family.user_id,
-                Family.family_user_id,
-                User.email,
-                User.name,
-                User.phone,
-                User.last_login,
-                User.is_active,
-                Family.relationship,
-                Family.is_verified
-            ).join(
-                User, User.id == Family.family_user_id
-            ).filter(
-                Family.user_id == self.authorized_user.id
-            )
-
-            # Case 2: Current user is a family member
-            query2 = db.query(
-                Family.user_id,
-                Family.family_user_id,
-                User.email,
-                User.name,
-                User.phone,
-                User.last_login,
-                User.is_active,
-                Family.relationship,
-                Family.is_verified
-            ).join(
-                User, User.id == Family.user_id
-            ).filter(
-                Family.family_user_id == self.authorized_user.id
-            )
+        # Query to get family members with their user details
+        # Case 1: Current user is the main user
+        query1 = select(
+            Family.user_id,
+            Family.family_user_id,
+            User.email,
+            User.name,
+            User.phone,
+            User.last_login,
+            User.is_active,
+            Family.relationship,
+            Family.is_verified
+        ).join(
+            User, User.id == Family.family_user_id
+        ).where(
+            Family.user_id == self.authorized_user.id
+        )
+
+        # Case 2: Current user is a family member
+        query2 = select(
+            Family.user_id,
+            Family.family_user_id,
+            User.email,
+            User.name,
+            User.phone,
+            User.last_login,
+            User.is_active,
+            Family.relationship,
+            Family.is_verified
+        ).join(
+            User, User.id == Family.user_id
+        ).where(
+            Family.family_user_id == self.authorized_user.id
+        )
+
+        # Combine both queries
+        results = (await self.db.execute(union(query1, query2))).all()
+        total_count = len(results)
+
+        # Format results
+        family_members = [
+            {
+                "user_id": result.user_id,
+                "family_user_id": result.family_user_id,
+                "email": result.email,
+                "name": result.name,
+                "phone": result.phone,
+                "last_login": result.last_login,
+                "is_active": result.is_active,
+                "relationship": result.relationship,
+                "is_verified": result.is_verified
+            }
+            for result in results
+        ]
 
-            # Combine both queries
-            results = query1.union(query2).all()
-            total_count = len(results)
-
-            # Format results
-            family_members = [
-                {
-                    "user_id": result.user_id,
-                    "family_user_id": result.family_user_id,
-                    "email": result.email,
-                    "name": result.name,
-                    "phone": result.phone,
-                    "last_login": result.last_login,
-                    "is_active": result.is_active,
-                    "relationship": result.relationship,
-                    "is_verified": result.is_verified
-                }
-                for result in results
-            ]
-
-            return family_members, total_count
+        return family_members, total_count
 
     async def add_family_member(self, email: str, relationship: EnumRelationship) -> dict:
         """
@@ -94,62 +93,61 @@ class FamilyObject:
         Raises:
             HTTPException: If user is already in a family or if target user doesn't exist
         """
-        with session_manager() as db:
-            # Check if target user exists
-            target_user = db.query(User).filter(User.email == email).first()
-            if not target_user:
-                raise FileNotFoundError("User not found")
-
-            # Check if target user is already in any family
-            existing_family = db.query(Family).filter(
-                or_(
-                    Family.user_id == target_user.id,
-                    Family.family_user_id == target_user.id
-                )
-            ).first()
-
-            if existing_family:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="User is already part of a family"
-                )
-
-            # Check if current user is already in any family
-            current_user_family = db.query(Family).filter(
-                or_(
-                    Family.user_id == self.authorized_user.id,
-                    Family.family_user_id == self.authorized_user.id
-                )
-            ).first()
-
-            if current_user_family:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="You are already part of a family"
-                )
-
-            # Create new family relationship
-            new_family = Family(
-                user_id=self.authorized_user.id,
-                family_user_id=target_user.id,
-                relationship=relationship,
-                is_verified=False
+        # Check if target user exists
+        target_user = (await self.db.execute(
+            select(User).where(User.email == email))).scalars().first()
+        if not target_user:
+            raise FileNotFoundError("User not found")
+
+        # Check if target user is already in any family
+        existing_family = (await self.db.execute(select(Family).where(
+            or_(
+                Family.user_id == target_user.id,
+                Family.family_user_id == target_user.id
+            )
+        ))).scalars().first()
+
+        if existing_family:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User is already part of a family"
             )
-            db.add(new_family)
-            db.commit()
-            db.refresh(new_family)
-
-            return {
-                "user_id": self.authorized_user.id,
-                "family_user_id": target_user.id,
-                "email": target_user.email,
-                "name": target_user.name,
-                "phone": target_user.phone,
-                "last_login": target_user.last_login,
-                "is_active": target_user.is_active,
-                "relationship": relationship,
-                "is_verified": False
-            }
+
+        # Check if current user is already in any family
+        current_user_family = (await self.db.execute(select(Family).where(
+            or_(
+                Family.user_id == self.authorized_user.id,
+                Family.family_user_id == self.authorized_user.id
+            )
+        ))).scalars().first()
+
+        if current_user_family:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="You are already part of a family"
+            )
+
+        # Create new family relationship
+        new_family = Family(
+            user_id=self.authorized_user.id,
+            family_user_id=target_user.id,
+            relationship=relationship,
+            is_verified=False
+        )
+        self.db.add(new_family)
+        await self.db.commit()
+
+        return {
+            "user_id": self.authorized_user.id,
+            "family_user_id": target_user.id,
+            "email": target_user.email,
+            "name": target_user.name,
+            "phone": target_user.phone,
+            "last_login": target_user.last_login,
+            "is_active": target_user.is_active,
+            "relationship": relationship,
+            "is_verified": False
+        }
 
     async def verify_family_member(self, family_user_id: int) -> dict:
         """
@@ -165,35 +163,34 @@ class FamilyObject:
         Raises:
             HTTPException: If family relationship not found or if user is not authorized
         """
-        with session_manager() as db:
-            # Check if the family relationship exists and if the current user is the family member
-            family = db.query(Family).filter(
-                Family.family_user_id == self.authorized_user.id,
-                Family.user_id == family_user_id
-            ).first()
-
-            if not family:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Family relationship not found"
-                )
-
-            # Update verification status
-            family.is_verified = True
-            db.commit()
-            db.refresh(family)
-
-            # Get user details for response
-            user = db.query(User).filter(User.id == family.user_id).first()
-
-            return {
-                "user_id": self.authorized_user.id,
-                "family_user_id": user.id,
-                "email": user.email,
-                "name": user.name,
-                "phone": user.phone,
-                "last_login": user.last_login,
-                "is_active": user.is_active,
-                "relationship": family.relationship,
-                "is_verified": family.is_verified
-            }
+        # Check if the family relationship exists and if the current user is the family member
+        family = (await self.db.execute(select(Family).where(
+            Family.family_user_id == self.authorized_user.id,
+            Family.user_id == family_user_id
+        ))).scalars().first()
+
+        if not family:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Family relationship not found"
+            )
+
+        # Update verification status
+        family.is_verified = True
+        await self.db.commit()
+
+        # Get user details for response
+        user = (await self.db.execute(
+            select(User).where(User.id == family.user_id))).scalars().first()
+
+        return {
+            "user_id": self.authorized_user.id,
+            "family_user_id": user.id,
+            "email": user.email,
+            "name": user.name,
+            "phone": user.phone,
+            "last_login": user.last_login,
+            "is_active": user.is_active,
+            "relationship": family.relationship,
+            "is_verified": family.is_verified
+        }
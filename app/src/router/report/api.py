@@ -6,7 +6,10 @@ from fastapi.encoders import jsonable_encoder
 from datetime import date, datetime
 from typing import Optional
 
-from app.src.database.models.user import User
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.src.router.user.principal import Principal
+from app.src.database.session import get_db
 from app.src.router.report.object import ReportObject
 from app.src.router.report.schema import (
     CategoryReportListResponse,
@@ -27,9 +30,13 @@ class ReportView:
     """ Report View Router """
     res: Response
 
-    def __init__(self, authorized_user: User = Depends(get_authorized_user)):
+    def __init__(
+        self,
+        authorized_user: Principal = Depends(get_authorized_user),
+        db: AsyncSession = Depends(get_db)
+    ):
         self.authorized_user = authorized_user
-        self.report_object = ReportObject(authorized_user)
+        self.report_object = ReportObject(authorized_user, db)
 
     @router.get("/category", response_model=CategoryReportListResponse)
     async def get_category_report(
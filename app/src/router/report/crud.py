@@ -1,6 +1,6 @@
-from app.src.base.crud import CRUDBase
+from app.src.base.async_crud import AsyncCRUDBase
 from app.src.database.models.transaction import Transaction
 
 
-class CRUDReport(CRUDBase):
+class CRUDReport(AsyncCRUDBase):
     pass
@@ -1,6 +1,22 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.src.database import pool_metrics, async_pool_metrics
+from app.src.database.admission import admission, sync_admission
+from app.src.database.query_metrics import query_metrics
+from app.src.router.ai.jobs import ai_job_queue
+from app.src.router.category.cache import category_cache
+from app.src.router.security import verify_ops_token
+from app.src.router.user.password import password_hasher
+from app.src.router.user.revocation import token_revocation
+from app.src.services.gemini.client import gemini
+from app.src.services.organization_service.cache import authorization_cache
+from app.src.utils.access_token_generator import access_token_cache
+from app.src.utils.circuit_breaker import circuit_breakers
+from app.src.utils.hedging import hedged_reader
 
 router = APIRouter()
+# per worker diagnostics, only for callers presenting OPS_TOKEN
+ops_router = APIRouter(prefix="/healthz", dependencies=[Depends(verify_ops_token)])
 
 
 @router.get("/", include_in_schema=True)
@@ -10,4 +26,106 @@ async def index():
 
 @router.get("/healthz", include_in_schema=False)
 async def healthz():
-    return "ok"
\ No newline at end of file
+    return "ok"
+
+
+@ops_router.get("/admission", include_in_schema=False)
+async def admission_stats():
+    """
+    slots in use, queue depth, admission wait and shed counts of the async and blocking session controllers
+    """
+    return {"async": admission.stats(), "sync": sync_admission.stats()}
+
+
+@ops_router.get("/pool", include_in_schema=False)
+async def pool_stats():
+    """
+    checked out connections, checkout wait, hold time and connection age of both engines' pools
+    """
+    return {
+        "async": async_pool_metrics.stats(),
+        "sync": pool_metrics.stats()
+    }
+
+
+@ops_router.get("/queries", include_in_schema=False)
+async def query_stats(limit: int = 50):
+    """
+    latency and row counts per statement fingerprint, slowest total first, at most `limit` entries
+    """
+    return query_metrics.stats(limit=limit)
+
+
+@ops_router.get("/categories", include_in_schema=False)
+async def category_cache_stats():
+    """
+    loaded version, entry count and reload counters of the category cache
+    """
+    return category_cache.stats()
+
+
+@ops_router.get("/revocation", include_in_schema=False)
+async def revocation_stats():
+    """
+    active revocation backend, bloom filter fill and how many checks reached the store
+    """
+    return token_revocation.stats()
+
+
+@ops_router.get("/password-hasher", include_in_schema=False)
+async def password_hasher_stats():
+    """
+    bcrypt process pool queue depth, queue wait and hashing time
+    """
+    return password_hasher.stats()
+
+
+@ops_router.get("/authorization", include_in_schema=False)
+async def authorization_cache_stats():
+    """
+    hit ratio, size and coalesced /user/me calls of the organization service authorization cache
+    """
+    return authorization_cache.stats()
+
+
+@ops_router.get("/breakers", include_in_schema=False)
+async def circuit_breaker_stats():
+    """
+    state, adaptive timeout and failure rate of every outbound circuit breaker
+    """
+    return circuit_breakers.stats()
+
+
+@ops_router.get("/hedging", include_in_schema=False)
+async def hedging_stats():
+    """
+    hedged and retried organization service reads and the extra call budget left
+    """
+    return hedged_reader.stats()
+
+
+@ops_router.get("/access-tokens", include_in_schema=False)
+async def access_token_stats():
+    """
+    hits, background refreshes and stale fallbacks of the external party access tokens
+    """
+    return access_token_cache.stats()
+
+
+@ops_router.get("/gemini", include_in_schema=False)
+async def gemini_stats():
+    """
+    generations in flight, waiters per client and shed counts of the Gemini client
+    """
+    return gemini.stats()
+
+
+@ops_router.get("/ai-jobs", include_in_schema=False)
+async def ai_job_stats():
+    """
+    queued and running analysis jobs, collapsed duplicates, recoveries and outcomes
+    """
+    return ai_job_queue.stats()
+
+
+router.include_router(ops_router)
@@ -1,14 +1,22 @@
-from fastapi import Depends, HTTPException, status, Security
+import hmac
+
+from fastapi import Depends, Header, HTTPException, status, Security
 from fastapi.security import HTTPBearer, SecurityScopes
+from app.src.core import config
+from app.src.services.organization_service.cache import authorization_cache
 from app.src.services.organization_service.http import OrganizationServices
 
 
 async def verify_token(token: str = Depends(HTTPBearer())):
-    is_success, authorized_user = await OrganizationServices.check_authorization(token.credentials)
+    is_success, authorization = await authorization_cache.get(
+        token.credentials, OrganizationServices.check_authorization)
     if is_success is False:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                             detail="Authentication not valid, please check your user account")
+    # the cached answer is shared, hand every request its own copy
+    authorized_user = dict(authorization.user)
     authorized_user['user_token'] = token.credentials
+    authorized_user['permission_pages'] = authorization.permission_pages
     return authorized_user
 
 
@@ -16,17 +24,18 @@ async def check_permission(
     security_scopes: SecurityScopes,
     current_user: [] = Security(verify_token, scopes=[]),
 ):
-    permission = list(
-        filter(
-            lambda x: x["permission_page"] in security_scopes.scopes,
-            current_user["permission"],
-        )
-    )
-
-    if len(permission) == 0:
+    if current_user["permission_pages"].isdisjoint(security_scopes.scopes):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"You don't have permission to access this API. Please ask Administrator for further information",
         )
 
     return current_user
+
+
+async def verify_ops_token(x_ops_token: str = Header(default="")):
+    # not configured means not exposed: answer as if the route did not exist
+    if not config.OPS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not hmac.compare_digest(x_ops_token.encode(), config.OPS_TOKEN.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid ops token")
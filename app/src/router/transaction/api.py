@@ -6,13 +6,17 @@ from datetime import date
 from typing import Optional
 
 from app.src.core.config import PAGINATION_LIMIT
-from app.src.database.models.user import User
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.src.router.user.principal import Principal
+from app.src.database.session import get_db
 from app.src.exception.handler.context import api_exception_handler
 from app.src.router.transaction.object import TransactionObject
 from app.src.router.transaction.schema import (
     TransactionBase,
     TransactionResponse,
     TransactionListResponse,
+    EnumPagination,
     TransactionSummaryResponse,
     BulkTransactionUploadResponse
 )
@@ -26,9 +30,13 @@ class TransactionView:
     """ Transaction View Router """
     res: Response
 
-    def __init__(self, authorized_user: User = Depends(get_authorized_user)):
+    def __init__(
+        self,
+        authorized_user: Principal = Depends(get_authorized_user),
+        db: AsyncSession = Depends(get_db)
+    ):
         self.authorized_user = authorized_user
-        self.transaction_object = TransactionObject(authorized_user)
+        self.transaction_object = TransactionObject(authorized_user, db)
 
     @router.post("/", response_model=TransactionResponse)
     async def create_transaction(
@@ -63,19 +71,39 @@ class TransactionView:
     async def get_transactions(
         self,
         offset: int = 0,
-        limit: int = PAGINATION_LIMIT
+        limit: int = PAGINATION_LIMIT,
+        pagination: EnumPagination = EnumPagination.offset,
+        cursor: Optional[str] = None,
+        include_count: bool = True
     ) -> dict:
         """
         Get all transactions for the current user.
 
+        - **pagination**: `offset` (default) pages with offset/limit and an exact
+          record_count; `cursor` pages with the opaque `next_cursor` of the
+          previous page, costs the same on every page and returns an
+          estimated record_count
+        - **cursor**: `next_cursor` of the previous page (cursor mode only)
+        - **include_count**: skip the record_count in cursor mode when false
+
         Returns a list of transactions.
         """
         with api_exception_handler(self.res, response_type="list") as response_builder:
-            transactions, total_data = await self.transaction_object.get_user_transactions(
-                user_id=self.authorized_user.id,
-                offset=offset,
-                limit=limit
-            )
+            response_builder.add_attribute("next_cursor")
+            if pagination == EnumPagination.cursor or cursor:
+                transactions, next_cursor, total_data = await self.transaction_object.get_user_transactions_page(
+                    user_id=self.authorized_user.id,
+                    cursor=cursor,
+                    limit=limit,
+                    include_count=include_count
+                )
+                response_builder.update_value("next_cursor", next_cursor)
+            else:
+                transactions, total_data = await self.transaction_object.get_user_transactions(
+                    user_id=self.authorized_user.id,
+                    offset=offset,
+                    limit=limit
+                )
             response_builder.status = True
             response_builder.code = http_status.HTTP_200_OK
             response_builder.message = "Transactions retrieved successfully"
@@ -1,15 +1,15 @@
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import Session
-from app.src.base.crud import CRUDBase
-from app.src.database.models.category import Category
+from sqlalchemy import func, select, tuple_
+from app.src.base.async_crud import AsyncCRUDBase
 from app.src.database.models.transaction import Transaction
-from typing import List
+from app.src.database.models.transaction_rollup import TransactionMonthlyRollup
+from typing import List, Optional, Tuple
 
 from app.src.router.transaction.schema import TransactionDetailList
 
 
-class CRUDTransaction(CRUDBase):
+class CRUDTransaction(AsyncCRUDBase):
 
     async def create_transaction(self, db: AsyncSession, user_id: int, transaction_data: dict) -> Transaction:
         transaction = Transaction(
@@ -18,15 +18,20 @@ class CRUDTransaction(CRUDBase):
             description=transaction_data['description'],
             type=transaction_data['type'],
             category_code=transaction_data.get('category_code'),
-            date=transaction_data.get('date')
+            date=transaction_data.get('date') or datetime.now()
         )
         db.add(transaction)
-        db.commit()
-        db.refresh(transaction)
+        await db.commit()
+        await db.refresh(transaction)
         return transaction
 
-    async def get_user_transactions(self, db: AsyncSession, user_id: int, offset: int, limit: int) -> List[TransactionDetailList]:
-        query = db.query(
+    # legacy rows may lack created_at, fall back to the date so the sort key is never NULL
+    created_key = func.coalesce(Transaction.created_at, Transaction.date)
+
+    def _user_transactions_query(self, user_id: int, category_codes: List[str]):
+        # only transactions with a known category are listed, their names
+        # come from the category cache instead of a join
+        return select(
             Transaction.id.label('id'),
             Transaction.user_id.label('user_id'),
             Transaction.date.label('date'),
@@ -35,19 +40,58 @@ class CRUDTransaction(CRUDBase):
             Transaction.description.label('description'),
             Transaction.category_code.label('category_code'),
             Transaction.created_at.label('created_at'),
-            Category.name.label('category_name'),
-            Category.icon.label('category_icon')
-        ).join(
-            Category, Category.code == Transaction.category_code
-        ).filter(Transaction.user_id == user_id).order_by(Transaction.date.desc(), Transaction.created_at.desc())
+            self.created_key.label('created_key')
+        ).where(
+            Transaction.user_id == user_id,
+            Transaction.category_code.in_(category_codes)
+        ).order_by(
+            Transaction.date.desc(), self.created_key.desc(), Transaction.id.desc())
+
+    async def get_user_transactions(
+        self, db: AsyncSession, user_id: int, category_codes: List[str], offset: int, limit: int
+    ) -> List[TransactionDetailList]:
+        query = self._user_transactions_query(user_id, category_codes)
 
-        total_data = query.count()
+        total_data = await db.scalar(
+            select(func.count()).select_from(query.subquery()))
         query = query.offset(offset).limit(limit)
-        return query.all(), total_data
+        return (await db.execute(query)).all(), total_data
+
+    async def get_user_transactions_after(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        category_codes: List[str],
+        after: Optional[Tuple[datetime, datetime, int]],
+        limit: int
+    ) -> Tuple[list, bool]:
+        """
+        keyset page of the listing, the rows strictly after the
+        (date, created_key, id) position `after`; the extra row fetched tells
+        whether another page exists
+        """
+        query = self._user_transactions_query(user_id, category_codes)
+        if after is not None:
+            query = query.where(
+                # the plain bound lets the planner prune partitions and range scan the index
+                Transaction.date <= after[0],
+                tuple_(Transaction.date, self.created_key, Transaction.id) < tuple_(*after))
+        rows = (await db.execute(query.limit(limit + 1))).all()
+        return rows[:limit], len(rows) > limit
+
+    async def estimate_user_transactions(self, db: AsyncSession, user_id: int) -> int:
+        """
+        transaction count of a user from the monthly rollup, a handful of index
+        rows instead of counting the listing join; it also counts rows whose
+        category no longer exists, which the listing leaves out
+        """
+        return await db.scalar(
+            select(func.coalesce(func.sum(TransactionMonthlyRollup.count), 0)).where(
+                TransactionMonthlyRollup.user_id == user_id))
 
-    async def get_transaction_by_id(db: AsyncSession, transaction_id: int, user_id: int) -> Transaction:
-        query = db.query(Transaction).filter(
+    async def get_transaction_by_id(self, db: AsyncSession, transaction_id: int, user_id: int) -> Transaction:
+        query = select(Transaction).where(
             Transaction.id == transaction_id,
             Transaction.user_id == user_id
         ).order_by(Transaction.id.desc())
-        return query.first()
+        return (await db.execute(query)).scalars().first()
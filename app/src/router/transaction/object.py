@@ -2,63 +2,93 @@ import json
 import re
 from app.src.database.models.transaction import Transaction, TransactionType
 from app.src.router.transaction.schema import TransactionCreate, TransactionDetailList
+from app.src.router.category.cache import CategoryEntry, category_cache
 from app.src.router.transaction.crud import CRUDTransaction
-from app.src.database.session import session_manager
+from app.src.utils.cursor import decode_cursor, encode_cursor
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Tuple, Dict, Any
 from datetime import datetime, date
-from sqlalchemy import func
+from sqlalchemy import func, select
 import pandas as pd
 from fastapi import UploadFile
 import io
 
 
 class TransactionObject:
-    def __init__(self, authorized_user):
+    def __init__(self, authorized_user, db: AsyncSession):
         self.crud_transaction = CRUDTransaction(Transaction)
         self.authorized_user = authorized_user
+        self.db = db
 
     async def create_transaction(self, user_id: int, transaction_data: dict) -> Transaction:
-        with session_manager() as db:
-            transaction_data = TransactionCreate(
-                user_id=user_id,
-                amount=transaction_data['amount'],
-                description=transaction_data['description'],
-                type=transaction_data['type'],
-                category_code=transaction_data.get('category_code'),
-                date=transaction_data.get('date')
-            )
-            return await self.crud_transaction.create(db, transaction_data)
+        transaction_data = TransactionCreate(
+            user_id=user_id,
+            amount=transaction_data['amount'],
+            description=transaction_data['description'],
+            type=transaction_data['type'],
+            category_code=transaction_data.get('category_code'),
+            date=transaction_data.get('date')
+        )
+        return await self.crud_transaction.create(self.db, transaction_data)
+
+    @staticmethod
+    def _to_detail_list(data, categories: Dict[str, CategoryEntry]) -> TransactionDetailList:
+        category = categories[data.category_code]
+        return TransactionDetailList(
+            id=data.id,
+            user_id=data.user_id,
+            amount=data.amount,
+            description=data.description,
+            type=data.type,
+            category_code=data.category_code,
+            date=data.date,
+            category_name=category.name,
+            category_icon=category.icon,
+            created_at=data.created_at,
+        )
 
     async def get_user_transactions(self, user_id: int, offset: int = 0, limit: int = 20) -> List[TransactionDetailList]:
-        result = []
-        with session_manager() as db:
-            datas, total_data = await self.crud_transaction.get_user_transactions(
-                db=db, user_id=user_id, offset=offset, limit=limit)
-
-            for data in datas:
-                result.append(
-                    TransactionDetailList(
-                        id=data.id,
-                        user_id=data.user_id,
-                        amount=data.amount,
-                        description=data.description,
-                        type=data.type,
-                        category_code=data.category_code,
-                        date=data.date,
-                        category_name=data.category_name,
-                        category_icon=data.category_icon,
-                        created_at=data.created_at,
-                    )
-                )
-
-            return result, total_data
+        await category_cache.refresh(self.db)
+        categories = category_cache.snapshot()
+        datas, total_data = await self.crud_transaction.get_user_transactions(
+            db=self.db, user_id=user_id, category_codes=list(categories),
+            offset=offset, limit=limit)
+        return [self._to_detail_list(data, categories) for data in datas], total_data
+
+    async def get_user_transactions_page(
+        self,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        include_count: bool = True
+    ) -> Tuple[List[TransactionDetailList], Optional[str], int]:
+        """
+        cursor mode of the listing, returns (transactions, next_cursor,
+        estimated record count); next_cursor is None on the last page
+        """
+        after = decode_cursor(cursor, (datetime, datetime, int)) if cursor else None
+        await category_cache.refresh(self.db)
+        categories = category_cache.snapshot()
+        datas, has_more = await self.crud_transaction.get_user_transactions_after(
+            db=self.db, user_id=user_id, category_codes=list(categories),
+            after=after, limit=limit)
+
+        next_cursor = None
+        if has_more:
+            last = datas[-1]
+            next_cursor = encode_cursor([last.date, last.created_key, last.id])
+
+        record_count = 0
+        if include_count:
+            record_count = await self.crud_transaction.estimate_user_transactions(
+                db=self.db, user_id=user_id)
+        return [self._to_detail_list(data, categories) for data in datas], next_cursor, record_count
 
     async def get_transaction_by_id(self, transaction_id: int, user_id: int) -> Transaction:
-        with session_manager() as db:
-            transaction = await self.crud_transaction.get(db, transaction_id)
-            if not transaction:
-                raise FileNotFoundError("Transaction not found.")
-            return transaction
+        transaction = await self.crud_transaction.get(self.db, transaction_id)
+        if not transaction:
+            raise FileNotFoundError("Transaction not found.")
+        return transaction
 
     async def get_transaction_summary(
         self,
@@ -66,37 +96,36 @@ class TransactionObject:
         start_date: Optional[date] = None,
         end_date: Optional[date] = None
     ) -> Tuple[float, float]:
-        with session_manager() as db:
-            # Base query with user filter
-            query = db.query(
-                Transaction.type,
-                func.sum(Transaction.amount).label('total')
-            ).filter(Transaction.user_id == user_id)
-
-            # Add date filters if provided
-            if start_date:
-                query = query.filter(Transaction.date >= start_date)
-            if end_date:
-                query = query.filter(Transaction.date <= end_date)
-
-            # Group by transaction type
-            query = query.group_by(Transaction.type)
-
-            # Execute query
-            results = query.all()
-
-            # Initialize totals
-            total_income = 0.0
-            total_expense = 0.0
-
-            # Process results
-            for type_, total in results:
-                if type_ == TransactionType.INCOME:
-                    total_income = float(total)
-                elif type_ == TransactionType.EXPENSE:
-                    total_expense = float(total)
-
-            return total_income, total_expense
+        # Base query with user filter
+        query = select(
+            Transaction.type,
+            func.sum(Transaction.amount).label('total')
+        ).where(Transaction.user_id == user_id)
+
+        # Add date filters if provided
+        if start_date:
+            query = query.where(Transaction.date >= start_date)
+        if end_date:
+            query = query.where(Transaction.date <= end_date)
+
+        # Group by transaction type
+        query = query.group_by(Transaction.type)
+
+        # Execute query
+        results = (await self.db.execute(query)).all()
+
+        # Initialize totals
+        total_income = 0.0
+        total_expense = 0.0
+
+        # Process results
+        for type_, total in results:
+            if type_ == TransactionType.INCOME:
+                total_income = float(total)
+            elif type_ == TransactionType.EXPENSE:
+                total_expense = float(total)
+
+        return total_income, total_expense
 
     def _validate_excel_columns(self, df: pd.DataFrame) -> None:
         """Validate required columns in Excel file."""
@@ -275,18 +304,17 @@ class TransactionObject:
             raise ValueError("\n".join(errors))
 
         # Insert valid transactions
-        with session_manager() as db:
-            created_transactions = []
-            for transaction_data in valid_transactions:
-                transaction = TransactionCreate(
-                    user_id=user_id,
-                    **transaction_data
-                )
-                created = await self.crud_transaction.create(db, transaction)
-                created_transactions.append(created)
-
-            return {
-                "total_rows": len(df),
-                "valid_rows": len(valid_transactions),
-                "created_rows": len(created_transactions)
-            }
+        created_transactions = []
+        for transaction_data in valid_transactions:
+            transaction = TransactionCreate(
+                user_id=user_id,
+                **transaction_data
+            )
+            created = await self.crud_transaction.create(self.db, transaction)
+            created_transactions.append(created)
+
+        return {
+            "total_rows": len(df),
+            "valid_rows": len(valid_transactions),
+            "created_rows": len(created_transactions)
+        }
@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from typing import List, Optional
 from pydantic import BaseModel
 from app.src.database.models.transaction import TransactionType
@@ -36,8 +37,14 @@ class TransactionResponse(BaseResponse):
     data: Optional[TransactionDetail] = None
 
 
+class EnumPagination(str, Enum):
+    offset = "offset"
+    cursor = "cursor"
+
+
 class TransactionListResponse(BaseListResponse):
     data: List[TransactionDetailList] = []
+    next_cursor: Optional[str] = None
 
 
 class TransactionSummary(BaseModel):
@@ -4,11 +4,14 @@ from fastapi_utils.cbv import cbv
 from fastapi_utils.inferring_router import InferringRouter
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
-from app.src.database.models.user import User
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.src.database.session import get_db
 from app.src.exception.handler.context import api_exception_handler
 from app.src.router.user.object import UserObject, create_access_token
 from app.src.router.user.schema import UserDetail, UserCreateRequest, UserLoginRequest, UserLoginResponse, UserResponse
-from app.src.router.user.security import get_authorized_user, blacklist_token
+from app.src.router.user.principal import Principal, invalidate_principal
+from app.src.router.user.security import get_authorized_user, revoke_token
 from app.src.router.security import check_permission
 
 
@@ -73,7 +76,7 @@ class UserView:
                 return response_builder.to_dict()
 
             # Update last login
-            await self.user_object.update_last_login(user)
+            self.user_object.update_last_login(user)
 
             # Create access token
             access_token = create_access_token(
@@ -106,7 +109,8 @@ class UserView:
     @router.get("/me", response_model=UserResponse)
     async def read_users_me(
         self,
-        authorized_user: User = Depends(get_authorized_user)
+        authorized_user: Principal = Depends(get_authorized_user),
+        db: AsyncSession = Depends(get_db)
     ) -> dict:
         """
         Get current user data.
@@ -114,27 +118,32 @@ class UserView:
         Returns the current user's data based on the provided access token.
         """
         with api_exception_handler(self.res) as response_builder:
+            # the principal is a slim cached record, the profile needs the full row
+            user = await self.user_object.get_user_by_email(db, authorized_user.email)
+            if user is None:
+                raise FileNotFoundError("User not found")
             response_builder.status = True
             response_builder.code = http_status.HTTP_200_OK
             response_builder.message = "success"
-            response_builder.data = jsonable_encoder(authorized_user)
+            response_builder.data = jsonable_encoder(user)
         return response_builder.to_dict()
 
     @router.post("/logout")
     async def logout_user(
         self,
-        authorized_user: User = Depends(get_authorized_user),
+        authorized_user: Principal = Depends(get_authorized_user),
         token: str = Depends(oauth2_scheme)
     ) -> dict:
         """
-        Logout the current user and blacklist the token.
+        Logout the current user and revoke the token.
 
-        This endpoint invalidates the current session by blacklisting the token.
-        The token will be immediately invalid and cannot be used again.
+        This endpoint invalidates the current session by revoking the token in
+        every worker. The token will be immediately invalid and cannot be used again.
         """
         with api_exception_handler(self.res) as response_builder:
-            # Blacklist the token
-            blacklist_token(token)
+            # Revoke the token
+            await revoke_token(token)
+            invalidate_principal(authorized_user.email)
             
             response_builder.status = True
             response_builder.code = http_status.HTTP_200_OK
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.src.core import config
+from app.src.database.session import async_session_manager
+
+logger = logging.getLogger(__name__)
+
+
+def update_statement(rows: List[Tuple[int, datetime]], updated_at: datetime):
+    """
+    one UPDATE ... FROM (VALUES ...) for the (user id, login time) rows,
+    never moving a last_login backwards; updated_at is set here as the
+    model's onupdate does not run for a textual UPDATE
+    """
+    values = ", ".join(
+        f"(CAST(:id_{index} AS integer), CAST(:at_{index} AS timestamp))" for index in range(len(rows)))
+    params = {"updated_at": updated_at}
+    for index, (user_id, at) in enumerate(rows):
+        params[f"id_{index}"] = user_id
+        params[f"at_{index}"] = at
+    return text(f"""
+        UPDATE users SET last_login = v.last_login, updated_at = :updated_at
+        FROM (VALUES {values}) AS v (id, last_login)
+        WHERE users.id = v.id
+          AND (users.last_login IS NULL OR users.last_login < v.last_login)
+    """).bindparams(**params)
+
+
+class LastLoginBuffer:
+    """
+    Write-behind buffer for users.last_login: logins only record the time in
+    memory and a background task writes everything pending as one batched
+    UPDATE every `flush_seconds`, or sooner once `max_pending` users wait.
+    A failed flush keeps its rows for the next one; stop() flushes whatever
+    is left on shutdown.
+
+    Example:
+        >>> last_login_buffer.record(user.id)
+    """
+    BATCH_SIZE = 500
+
+    def __init__(self, flush_seconds: float, max_pending: int):
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self.recorded = 0
+        self.flushed = 0
+        self.failed_flushes = 0
+        self._pending: Dict[int, datetime] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def _merge(self, user_id: int, at: datetime) -> None:
+        previous = self._pending.get(user_id)
+        if previous is None or previous < at:
+            self._pending[user_id] = at
+
+    def record(self, user_id: int, at: Optional[datetime] = None) -> None:
+        self._merge(user_id, at or datetime.utcnow())
+        self.recorded += 1
+        if len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        rows = list(pending.items())
+        try:
+            # through admission like every other session, so flushes queue
+            # behind requests instead of taking connections past the limit
+            async with async_session_manager() as db:
+                updated_at = datetime.now()
+                for start in range(0, len(rows), self.BATCH_SIZE):
+                    await db.execute(
+                        update_statement(rows[start:start + self.BATCH_SIZE], updated_at))
+                await db.commit()
+        except BaseException:
+            # cancelled or failed, keep them for the next flush; newer
+            # logins recorded meanwhile win
+            self.failed_flushes += 1
+            for user_id, at in rows:
+                self._merge(user_id, at)
+            raise
+        self.flushed += len(rows)
+        return len(rows)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("could not flush %s last_login updates", len(self._pending))
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("lost %s last_login updates on shutdown", len(self._pending))
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+            "flush_seconds": self.flush_seconds
+        }
+
+
+last_login_buffer = LastLoginBuffer(
+    flush_seconds=config.LAST_LOGIN_FLUSH_SECONDS,
+    max_pending=config.LAST_LOGIN_MAX_PENDING
+)
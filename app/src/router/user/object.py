@@ -1,11 +1,14 @@
+import uuid
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from app.src.database.session import async_session_manager
 from app.src.database.models.user import User, UserType
+from app.src.router.user.last_login import last_login_buffer
+from app.src.router.user.password import password_hasher
 from app.src.router.user.schema import UserCreateRequest, UserLoginRequest
-import bcrypt
 from jose import JWTError, jwt
 from typing import Optional
-from app.src.database.session import session_manager
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # JWT Configuration
 SECRET_KEY = "your-secret-key-here"  # TODO: Move to environment variables
@@ -13,19 +16,14 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 12
 
 
-def get_password_hash(password: str) -> str:
-    # Generate a salt and hash the password
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+async def get_password_hash(password: str) -> str:
+    # bcrypt runs in the hasher process pool, off the event loop
+    return await password_hasher.hash(password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     # Verify the password
-    return bcrypt.checkpw(
-        plain_password.encode('utf-8'),
-        hashed_password.encode('utf-8')
-    )
+    return await password_hasher.verify(plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -34,7 +32,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    # jti identifies the token when it is revoked
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -42,41 +41,54 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 class UserObject:
     @classmethod
     async def create_user(cls, user_data: UserCreateRequest) -> User:
-        with session_manager() as db:
-            user = User(
-                email=user_data.email,
-                password_hash=get_password_hash(user_data.password),
-                name=user_data.name,
-                phone=user_data.phone,
-                profile_picture=user_data.profile_picture,
-                user_type=UserType.MEMBER
-            )
+        # hashed before a session is opened, the bcrypt queue may take seconds
+        password_hash = await get_password_hash(user_data.password)
+        user = User(
+            email=user_data.email,
+            password_hash=password_hash,
+            name=user_data.name,
+            phone=user_data.phone,
+            profile_picture=user_data.profile_picture,
+            user_type=UserType.MEMBER
+        )
+        async with async_session_manager() as db:
             db.add(user)
-            db.commit()
-            db.refresh(user)
-            return user
+            await db.commit()
+            await db.refresh(user)
+        return user
 
     @classmethod
-    async def get_user_by_email(cls, email: str) -> Optional[User]:
-        with session_manager() as db:
-            return db.query(User).filter(User.email == email).first()
+    async def get_user_by_email(cls, db: AsyncSession, email: str) -> Optional[User]:
+        return (await db.execute(
+            select(User).where(User.email == email))).scalars().first()
 
     @classmethod
     async def authenticate_user(cls, login_data: UserLoginRequest) -> Optional[User]:
-        with session_manager() as db:
-            user = db.query(User).filter(
-                User.email == login_data.email).first()
-            if not user:
-                return None
-            if not verify_password(login_data.password, user.password_hash):
-                return None
-            return user
+        """
+        no session is held while bcrypt runs: the user is read in one short
+        session and a rehash is written in another, so a login storm queues
+        on the hasher without holding database admission slots
+        """
+        async with async_session_manager() as db:
+            user = (await db.execute(select(User).where(
+                User.email == login_data.email))).scalars().first()
+        if not user:
+            return None
+        if not await verify_password(login_data.password, user.password_hash):
+            return None
+        if password_hasher.needs_rehash(user.password_hash):
+            # the password is at hand only now, move the hash to the configured rounds
+            password_hash = await get_password_hash(login_data.password)
+            async with async_session_manager() as db:
+                await db.execute(update(User).where(
+                    User.id == user.id, User.password_hash == user.password_hash
+                ).values(password_hash=password_hash))
+                await db.commit()
+            user.password_hash = password_hash
+            password_hasher.rehashed += 1
+        return user
 
     @classmethod
-    async def update_last_login(cls, user: User) -> None:
-        with session_manager() as db:
-            # Reattach the user to the current session
-            user = db.merge(user)
-            user.last_login = datetime.utcnow()
-            db.commit()
-            db.refresh(user)
+    def update_last_login(cls, user: User) -> None:
+        # written behind in one batched UPDATE, off the request path
+        last_login_buffer.record(user.id, datetime.utcnow())
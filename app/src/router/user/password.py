@@ -0,0 +1,145 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import bcrypt
+
+from app.src.core import config
+from app.src.exception.auth import PasswordHasherBusyError
+from app.src.utils.metrics import Histogram
+
+
+def hash_password(password: str, rounds: int) -> str:
+    # runs in a pool process
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def check_password(password: str, hashed_password: str) -> bool:
+    # runs in a pool process
+    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """
+    cost factor of a bcrypt hash
+
+    Example:
+        >>> hash_rounds("$2b$12$R9h/cIPz0gi.URNNX3kh2OPST9/PgBkqquzi.Ss7KIUgO2t0jWMUW")
+        12
+    """
+    try:
+        return int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a small process pool so hashing never blocks the event loop.
+
+    At most `workers` operations run at once, at most `queue_size` wait for a
+    slot and none waits longer than `timeout` seconds; anything beyond that is
+    rejected with PasswordHasherBusyError (503 + Retry-After) instead of
+    queueing a login storm without bound.
+
+    Example:
+        >>> hashed = await password_hasher.hash("secret")
+        >>> await password_hasher.verify("secret", hashed)
+        True
+    """
+
+    def __init__(self, workers: int, queue_size: int, timeout: float, rounds: int, retry_after: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.rounds = rounds
+        self.retry_after = retry_after
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.rehashed = 0
+        self.wait_time = Histogram()
+        self.run_time = Histogram()
+        self._slots = asyncio.Semaphore(workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # forkserver children do not inherit the event loop or open sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("forkserver"))
+        return self._executor
+
+    def _busy(self, message: str) -> PasswordHasherBusyError:
+        return PasswordHasherBusyError(message, retry_after=self.retry_after)
+
+    async def _run(self, function, *args):
+        if self.waiting >= self.queue_size:
+            self.rejected += 1
+            raise self._busy("Too many login attempts in progress, please retry")
+
+        self.waiting += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise self._busy("Timed out waiting for the password hasher")
+        finally:
+            self.waiting -= 1
+            self.wait_time.observe(time.monotonic() - started)
+
+        self.running += 1
+        started = time.monotonic()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, function, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.run_time.observe(time.monotonic() - started)
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(check_password, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return hash_rounds(hashed_password) != self.rounds
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "rounds": self.rounds,
+            "running": self.running,
+            "queue_depth": self.waiting,
+            "queue_size": self.queue_size,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "rehashed": self.rehashed,
+            "wait_time": self.wait_time.snapshot(),
+            "run_time": self.run_time.snapshot()
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=config.PASSWORD_HASH_WORKERS,
+    queue_size=config.PASSWORD_HASH_QUEUE_SIZE,
+    timeout=config.PASSWORD_HASH_TIMEOUT,
+    rounds=config.PASSWORD_HASH_ROUNDS,
+    retry_after=config.PASSWORD_HASH_RETRY_AFTER
+)
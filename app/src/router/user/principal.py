@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.src.core import config
+from app.src.database.models.user import User, UserType
+from app.src.utils.cache import TTLCache
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The slim, immutable user record protected endpoints receive as
+    `authorized_user`; load the full User when more is needed.
+    """
+    id: int
+    email: str
+    user_type: Optional[UserType]
+    is_active: bool
+
+
+# keyed by the token subject (the user email)
+principal_cache = TTLCache(
+    maxsize=config.PRINCIPAL_CACHE_SIZE, ttl=config.PRINCIPAL_CACHE_TTL)
+
+
+async def load_principal(db: AsyncSession, email: str) -> Optional[Principal]:
+    """the cached principal of `email`, loading only its four columns on a miss"""
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return principal
+
+    row = (await db.execute(
+        select(User.id, User.email, User.user_type, User.is_active).where(
+            User.email == email))).first()
+    if row is None:
+        return None
+    principal = Principal(
+        id=row.id, email=row.email, user_type=row.user_type, is_active=bool(row.is_active))
+    principal_cache.set(email, principal)
+    return principal
+
+
+def invalidate_principal(email: str) -> None:
+    principal_cache.pop(email)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    # profile changes and deactivation go through the ORM; other workers
+    # pick them up when their entry expires
+    invalidate_principal(target.email)
+    for previous_email in inspect(target).attrs.email.history.deleted:
+        invalidate_principal(previous_email)
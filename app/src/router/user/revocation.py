@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+from app.src.core import config
+from app.src.utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryRevocationStore:
+    """
+    Revoked token ids and their expiry in this worker only, expired ids are
+    evicted as they are read. Fine for a single worker.
+    """
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        self._evict()
+        self._revoked[jti] = expires_at
+
+    async def is_revoked(self, jti: str) -> bool:
+        expires_at = self._revoked.get(jti)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del self._revoked[jti]
+            return False
+        return True
+
+    async def active(self) -> Dict[str, float]:
+        self._evict()
+        return dict(self._revoked)
+
+    async def listen(self, on_revoked: Callable[[str], None]) -> None:
+        """nothing to listen to, every revocation happens in this worker"""
+
+    async def close(self) -> None:
+        self._revoked.clear()
+
+    def _evict(self) -> None:
+        now = time.time()
+        for jti in [jti for jti, expires_at in self._revoked.items() if expires_at <= now]:
+            del self._revoked[jti]
+
+
+class RedisRevocationStore:
+    """
+    Revoked token ids shared by every worker: one sorted set scored by the
+    token expiry, trimmed on every write, and a pub/sub channel announcing
+    new revocations. `client` is a redis.asyncio client created with
+    decode_responses=True, fakeredis.aioredis.FakeRedis works as well.
+    """
+    KEY = "auth:revoked_tokens"
+    CHANNEL = "auth:revoked_tokens"
+
+    def __init__(self, client):
+        self.client = client
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zadd(self.KEY, {jti: expires_at})
+            pipe.zremrangebyscore(self.KEY, "-inf", time.time())
+            pipe.publish(self.CHANNEL, jti)
+            await pipe.execute()
+
+    async def is_revoked(self, jti: str) -> bool:
+        expires_at = await self.client.zscore(self.KEY, jti)
+        return expires_at is not None and expires_at > time.time()
+
+    async def active(self) -> Dict[str, float]:
+        return dict(await self.client.zrangebyscore(
+            self.KEY, time.time(), "+inf", withscores=True))
+
+    async def listen(self, on_revoked: Callable[[str], None]) -> None:
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(self.CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    on_revoked(message["data"])
+        finally:
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class TokenRevocation:
+    """
+    Revocation check in front of a store: every worker keeps a Bloom filter
+    of the revoked ids, so the common not-revoked lookup never leaves the
+    process and only Bloom hits ask the store.
+
+    The filter follows other workers through the store's pub/sub and is
+    rebuilt from the store every `rebuild_seconds`, which also drops expired
+    ids and catches messages missed while disconnected. Until the first
+    rebuild succeeded every lookup goes to the store.
+
+    Example:
+        >>> await token_revocation.revoke(jti, expires_at)
+        >>> await token_revocation.is_revoked(jti)
+        True
+    """
+
+    def __init__(self, store, bloom_capacity: int, bloom_error_rate: float, rebuild_seconds: float):
+        self.store = store
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self.rebuild_seconds = rebuild_seconds
+        self.bloom = BloomFilter(bloom_capacity, bloom_error_rate)
+        self.ready = False
+        self.lookups = 0
+        self.store_lookups = 0
+        self.false_positives = 0
+        self.rebuilds = 0
+        self._added_during_rebuild: Optional[List[str]] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _remember(self, jti: str) -> None:
+        self.bloom.add(jti)
+        if self._added_during_rebuild is not None:
+            self._added_during_rebuild.append(jti)
+
+    async def start(self) -> None:
+        try:
+            await self.rebuild()
+        except Exception:
+            logger.exception("could not load revoked tokens, checking the store directly")
+        self._tasks = [
+            asyncio.create_task(self._rebuild_loop()),
+            asyncio.create_task(self._listen_loop()),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.store.close()
+
+    async def rebuild(self) -> None:
+        self._added_during_rebuild = []
+        try:
+            active = await self.store.active()
+            bloom = BloomFilter.from_items(
+                active,
+                capacity=max(self.bloom_capacity, 2 * len(active)),
+                error_rate=self.bloom_error_rate
+            )
+            # revocations announced while the snapshot was read
+            for jti in self._added_during_rebuild:
+                bloom.add(jti)
+        finally:
+            self._added_during_rebuild = None
+        self.bloom = bloom
+        self.ready = True
+        self.rebuilds += 1
+
+    async def _rebuild_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.rebuild_seconds)
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception("could not rebuild the revoked tokens filter")
+
+    async def _listen_loop(self) -> None:
+        while True:
+            try:
+                await self.store.listen(self._remember)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("revoked tokens subscription lost, reconnecting")
+                await asyncio.sleep(1)
+                # anything announced while disconnected comes back with the rebuild
+                try:
+                    await self.rebuild()
+                except Exception:
+                    logger.exception("could not rebuild the revoked tokens filter")
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        self._remember(jti)
+        await self.store.revoke(jti, expires_at)
+
+    async def is_revoked(self, jti: str) -> bool:
+        self.lookups += 1
+        if self.ready and jti not in self.bloom:
+            return False
+        self.store_lookups += 1
+        revoked = await self.store.is_revoked(jti)
+        if self.ready and not revoked:
+            self.false_positives += 1
+        return revoked
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.store).__name__,
+            "ready": self.ready,
+            "lookups": self.lookups,
+            "store_lookups": self.store_lookups,
+            "false_positives": self.false_positives,
+            "rebuilds": self.rebuilds,
+            "bloom": self.bloom.stats()
+        }
+
+
+def create_store(backend: str, workers: int = 1):
+    if backend == "memory" and workers > 1:
+        # a token revoked in one worker would stay valid in the others
+        raise RuntimeError(
+            f"TOKEN_REVOCATION_BACKEND=memory cannot serve {workers} workers, "
+            "configure REDIS_HOST or TOKEN_REVOCATION_BACKEND=redis")
+    if backend == "redis":
+        from redis import asyncio as redis
+
+        return RedisRevocationStore(
+            redis.from_url(config.REDIS_URI, decode_responses=True))
+    if backend == "memory":
+        return MemoryRevocationStore()
+    raise ValueError(f"Unknown token revocation backend: {backend}")
+
+
+token_revocation = TokenRevocation(
+    store=create_store(config.TOKEN_REVOCATION_BACKEND, config.WEB_CONCURRENCY),
+    bloom_capacity=config.TOKEN_REVOCATION_BLOOM_CAPACITY,
+    bloom_error_rate=config.TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+    rebuild_seconds=config.TOKEN_REVOCATION_REBUILD_SECONDS
+)
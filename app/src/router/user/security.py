@@ -1,31 +1,49 @@
+import hashlib
 from datetime import datetime, timedelta
-from typing import Optional, Set
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.src.database.session import session_manager
-from app.src.database.models.user import User
-from app.src.router.user.object import UserObject
+from app.src.core import config
+from app.src.database.session import async_session_manager, get_db
+from app.src.router.user.principal import Principal, load_principal, principal_cache
+from app.src.router.user.revocation import token_revocation
+from app.src.utils.cache import TTLCache
 
 # JWT Configuration
 SECRET_KEY = "your-secret-key-here"  # TODO: Move to environment variables
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# In-memory blacklist
-blacklisted_tokens: Set[str] = set()
-
 security = HTTPBearer()
 
-def blacklist_token(token: str) -> None:
-    """Add token to blacklist"""
-    blacklisted_tokens.add(token)
+# keyed by the sha256 of the token, so raw tokens are not kept around
+claims_cache = TTLCache(
+    maxsize=config.JWT_CLAIMS_CACHE_SIZE, ttl=config.JWT_CLAIMS_CACHE_TTL)
+
+def decode_token(token: str) -> Mapping[str, Any]:
+    """
+    Verified claims of the token, memoized until the token expires.
+    Raises the same errors as jwt.decode.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    claims = claims_cache.get(key)
+    if claims is None:
+        claims = MappingProxyType(jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]))
+        claims_cache.set(key, claims, expires_at=claims.get("exp"))
+    return claims
+
+def token_id(token: str, claims: Mapping[str, Any]) -> str:
+    """the jti claim, tokens issued before it existed are identified by their hash"""
+    return claims.get("jti") or hashlib.sha256(token.encode()).hexdigest()
 
-def is_token_blacklisted(token: str) -> bool:
-    """Check if token is blacklisted"""
-    return token in blacklisted_tokens
+async def revoke_token(token: str) -> None:
+    """Revoke the token until it expires"""
+    claims = decode_token(token)
+    await token_revocation.revoke(token_id(token, claims), float(claims["exp"]))
 
 def create_expired_token(data: dict) -> str:
     """Create an immediately expired token"""
@@ -36,10 +54,10 @@ def create_expired_token(data: dict) -> str:
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Mapping[str, Any]:
     """
-    Verify the JWT token and return the token string.
-    Raises HTTPException if token is invalid or blacklisted.
+    Verify the JWT token and return its claims.
+    Raises HTTPException if token is invalid or revoked.
     """
     if credentials.scheme != "Bearer":
         raise HTTPException(
@@ -49,19 +67,10 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(secur
         )
     
     token = credentials.credentials
-    
-    # Check if token is blacklisted
-    if is_token_blacklisted(token):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has been revoked",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
+
     try:
-        # Verify token expiration
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return token
+        # Verify token signature and expiration
+        claims = decode_token(token)
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -75,10 +84,23 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(secur
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Check if token is revoked
+    if await token_revocation.is_revoked(token_id(token, claims)):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return claims
+
 
-async def get_current_user(token: str = Depends(verify_token)) -> User:
+async def get_current_user(
+    claims: Mapping[str, Any] = Depends(verify_token),
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
     """
-    Get the current user from the JWT token.
+    Get the current user from the JWT token, served from the principal cache
+    and only read from the database on a miss.
     Raises HTTPException if user is not found or token is invalid.
     """
     credentials_exception = HTTPException(
@@ -86,22 +108,17 @@ async def get_current_user(token: str = Depends(verify_token)) -> User:
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
+    email: str = claims.get("sub")
+    if email is None:
         raise credentials_exception
 
-    
-    user = await UserObject.get_user_by_email(email)
+    user = await load_principal(db, email)
     if user is None:
         raise credentials_exception
     return user
 
 
-async def get_current_active_user(user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(user: Principal = Depends(get_current_user)) -> Principal:
     """
     Get the current active user.
     Raises HTTPException if user is not active.
@@ -111,9 +128,32 @@ async def get_current_active_user(user: User = Depends(get_current_user)) -> Use
     return user
 
 
-async def get_authorized_user(user: User = Depends(get_current_active_user)) -> User:
+async def get_authorized_user(user: Principal = Depends(get_current_active_user)) -> Principal:
     """
     Get the authorized user with all necessary checks.
     This is the main dependency to use in protected endpoints.
     """
     return user
+
+
+async def get_sessionless_authorized_user(
+    claims: Mapping[str, Any] = Depends(verify_token)
+) -> Principal:
+    """
+    get_authorized_user for handlers that wait on something slow (a model
+    call) without needing the database meanwhile: a principal cache miss is
+    read in a short session of its own instead of the request scoped one,
+    which would stay checked out until the handler returns.
+    """
+    email: str = claims.get("sub")
+    user = principal_cache.get(email) if email else None
+    if user is None and email:
+        async with async_session_manager() as db:
+            user = await load_principal(db, email)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await get_current_active_user(user)
@@ -0,0 +1,180 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Deque, Hashable, Optional
+
+from google import genai
+from google.genai import types
+
+from app.src.core import config
+from app.src.exception.service import ModelBusyError
+from app.src.utils.metrics import Histogram
+
+
+class FairLimiter:
+    """
+    Per-worker concurrency limit with round robin fairness between keys.
+
+    At most `capacity` holders run at once and at most `queue_size` callers
+    wait, none longer than `timeout` seconds. A freed slot goes to the head
+    of the next key's queue in turn, so a user with twenty queued analyses
+    does not hold back the single request of another user. Everything
+    beyond the queue is shed with ModelBusyError.
+
+    Example:
+        >>> await limiter.acquire(user_id)
+        >>> try:
+        >>>     ...
+        >>> finally:
+        >>>     limiter.release()
+    """
+
+    def __init__(self, capacity: int, queue_size: int, timeout: float, retry_after: int):
+        self.capacity = capacity
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.in_use = 0
+        self.queue_depth = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait_time = Histogram()
+        self._queues: "OrderedDict[Hashable, Deque[asyncio.Future]]" = OrderedDict()
+
+    def _busy(self, message: str) -> ModelBusyError:
+        return ModelBusyError(message, retry_after=self.retry_after)
+
+    async def acquire(self, key: Hashable) -> None:
+        if self.in_use < self.capacity and not self.queue_depth:
+            self.in_use += 1
+            self.admitted += 1
+            self.wait_time.observe(0.0)
+            return
+
+        if self.queue_depth >= self.queue_size:
+            self.rejected += 1
+            raise self._busy("AI service is busy, please retry")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append(waiter)
+        self.queue_depth += 1
+        started = time.monotonic()
+        try:
+            # release() hands its slot over by resolving the waiter
+            await asyncio.wait_for(waiter, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            # the slot may have been handed over just as the timeout fired
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            self.timed_out += 1
+            raise self._busy("Timed out waiting for the AI service")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            self._discard(key, waiter)
+            self.wait_time.observe(time.monotonic() - started)
+        self.admitted += 1
+
+    def _discard(self, key: Hashable, waiter: asyncio.Future) -> None:
+        waiters = self._queues.get(key)
+        if waiters is not None and waiter in waiters:
+            waiters.remove(waiter)
+            self.queue_depth -= 1
+            if not waiters:
+                del self._queues[key]
+
+    def release(self) -> None:
+        while self._queues:
+            key, waiters = next(iter(self._queues.items()))
+            waiter = waiters.popleft()
+            self.queue_depth -= 1
+            if waiters:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_use -= 1
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "in_use": self.in_use,
+            "queue_depth": self.queue_depth,
+            "queued_users": len(self._queues),
+            "queue_size": self.queue_size,
+            "timeout": self.timeout,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait_time": self.wait_time.snapshot()
+        }
+
+
+class GeminiClient:
+    """
+    The async (client.aio) Gemini client of this worker, every generation
+    goes through the fair limiter keyed by the requesting user.
+
+    Example:
+        >>> response = await gemini.generate(user.id, prompt)
+        >>> response.text
+    """
+
+    def __init__(self, api_key: str, base_url: str, model: str, limiter: FairLimiter):
+        http_options = types.HttpOptions(base_url=base_url) if base_url else None
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
+        self.model = model
+        self.limiter = limiter
+
+    async def generate(
+        self, key: Hashable, contents, model: Optional[str] = None
+    ) -> types.GenerateContentResponse:
+        await self.limiter.acquire(key)
+        try:
+            return await self.client.aio.models.generate_content(
+                model=model or self.model, contents=contents)
+        finally:
+            self.limiter.release()
+
+    async def generate_stream(
+        self, key: Hashable, contents, model: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        text chunks as the model produces them. The limiter slot is held
+        until the iterator is exhausted or closed, and closing it early
+        (e.g. the client went away) closes the upstream stream too. The
+        next chunk is only read from upstream once the caller asks for it.
+        """
+        await self.limiter.acquire(key)
+        try:
+            chunks = await self.client.aio.models.generate_content_stream(
+                model=model or self.model, contents=contents)
+            try:
+                async for chunk in chunks:
+                    if chunk.text:
+                        yield chunk.text
+            finally:
+                await chunks.aclose()
+        finally:
+            self.limiter.release()
+
+    def stats(self) -> dict:
+        return {"model": self.model, "limiter": self.limiter.stats()}
+
+
+gemini = GeminiClient(
+    api_key=config.GEMINI_API_KEY,
+    base_url=config.GEMINI_BASE_URL,
+    model=config.GEMINI_MODEL,
+    limiter=FairLimiter(
+        capacity=config.GEMINI_CONCURRENCY,
+        queue_size=config.GEMINI_QUEUE_SIZE,
+        timeout=config.GEMINI_QUEUE_TIMEOUT,
+        retry_after=config.GEMINI_RETRY_AFTER
+    )
+)
@@ -0,0 +1,77 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Awaitable, Callable, FrozenSet, Tuple
+
+from app.src.core import config
+from app.src.utils.cache import TTLCache
+from app.src.utils.singleflight import SingleFlight
+
+
+@dataclass(frozen=True)
+class Authorization:
+    user: dict
+    # permission_page of every permission, so checks are set lookups
+    permission_pages: FrozenSet[str]
+
+
+def token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class AuthorizationCache:
+    """
+    Successful check_authorization answers cached per token hash for `ttl`
+    seconds. Concurrent misses for one token share a single upstream call;
+    failures are never cached. logout and refresh_token drop the entry.
+
+    Example:
+        >>> is_success, authorization = await authorization_cache.get(
+        >>>     token, OrganizationServices.check_authorization)
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.single_flight = SingleFlight()
+        self.invalidations = 0
+
+    async def get(
+        self, token: str, fetch: Callable[[str], Awaitable[Tuple[bool, dict]]]
+    ) -> Tuple[bool, Authorization]:
+        key = token_key(token)
+        authorization = self.cache.get(key)
+        if authorization is not None:
+            return True, authorization
+        return await self.single_flight.do(key, lambda: self._load(key, token, fetch))
+
+    async def _load(self, key: bytes, token: str, fetch) -> Tuple[bool, Authorization]:
+        invalidations = self.invalidations
+        is_success, user = await fetch(token)
+        if not is_success:
+            return False, None
+        authorization = Authorization(
+            user=user,
+            permission_pages=frozenset(
+                permission.get("permission_page") for permission in user.get("permission") or []
+            )
+        )
+        # a logout while the call was in flight may have outdated the answer
+        if invalidations == self.invalidations:
+            self.cache.set(key, authorization)
+        return True, authorization
+
+    def invalidate(self, token: str) -> None:
+        self.invalidations += 1
+        self.cache.pop(token_key(token))
+
+    def stats(self) -> dict:
+        return {
+            **self.cache.stats(),
+            "invalidations": self.invalidations,
+            "single_flight": self.single_flight.stats()
+        }
+
+
+authorization_cache = AuthorizationCache(
+    maxsize=config.ORGANIZATION_AUTH_CACHE_SIZE,
+    ttl=config.ORGANIZATION_AUTH_CACHE_TTL
+)
@@ -1,5 +1,32 @@
-from app.src.utils.httpx_client import httpx_context
-from app.src.core.config import ORGANIZATION_SERVICE_URL as host, APP_CODE
+import functools
+import logging
+
+import httpx
+
+from app.src.services.organization_service.cache import authorization_cache
+from app.src.exception.service import CircuitOpenError
+from app.src.utils.circuit_breaker import circuit_breakers
+from app.src.utils.hedging import hedged_reader
+from app.src.utils.httpx_client import httpx_pool
+from app.src.core.config import (
+    ORGANIZATION_SERVICE_URL as host,
+    APP_CODE,
+    HTTPX_CONNECT_TIMEOUT,
+    HTTPX_TIMEOUT,
+    ORGANIZATION_SERVICE_LOGIN_TIMEOUT
+)
+
+
+def fallback_on_invalid_response(method):
+    """answer (False, {}) and log when the service does not return the expected JSON"""
+    @functools.wraps(method)
+    async def wrapper(cls, *args, **kwargs):
+        try:
+            return await method(cls, *args, **kwargs)
+        except ValueError:
+            logging.exception("invalid response from the organization service")
+            return False, {}
+    return wrapper
 
 
 class OrganizationServices:
@@ -14,12 +41,65 @@ class OrganizationServices:
         "position_detail": host + "/position/{id}",
         "has_permission": host + "/user/me/has-permission",
         "branch": host + "/branch/?",
-        "refresh_token": host + "/user/refresh-token"
+        "refresh_token": host + "/user/refresh-token",
+        "access_token": host + "/external_party/{app_code}/access_token"
+    }
+    # upper bound of the adaptive read timeout; logins wait on the directory
+    # behind the service, everything else should be quick
+    timeouts = {
+        "login": ORGANIZATION_SERVICE_LOGIN_TIMEOUT,
+        "login_by_ad": ORGANIZATION_SERVICE_LOGIN_TIMEOUT,
     }
     is_success = lambda x: 200 <= x.status_code <= 299
     get_response_data = lambda x: x.json().get("data") if x.json().get("data") else x.json()
 
     @classmethod
+    async def send_request(
+        cls,
+        endpoint: str,
+        method: str,
+        url: str = None,
+        token: str = None,
+        idempotent: bool = False,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        send one request over the shared client through the circuit breaker of
+        `endpoint`, which also picks the read timeout; the bearer token goes
+        into this request's headers only. Raises CircuitOpenError while the
+        endpoint's circuit is open.
+
+        `idempotent` reads may be hedged after the endpoint's rolling p95 and
+        are retried with jittered backoff on transport errors and 5xx
+        answers, within the budget of hedged_reader.
+        """
+        headers = kwargs.pop("headers", {})
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        breaker = circuit_breakers.get(endpoint, max_timeout=cls.timeouts.get(endpoint, HTTPX_TIMEOUT))
+        is_failure = lambda response: response.status_code >= 500
+        call = lambda: breaker.call(
+            lambda timeout: httpx_pool.client.request(
+                method,
+                url or cls.endpoints[endpoint],
+                headers=headers,
+                timeout=httpx.Timeout(timeout, connect=HTTPX_CONNECT_TIMEOUT),
+                **kwargs
+            ),
+            is_failure=is_failure
+        )
+        if not idempotent:
+            return await call()
+        return await hedged_reader.read(
+            call,
+            hedge_after=breaker.hedge_after(),
+            is_failure=is_failure,
+            retry_on=(httpx.TransportError,),
+            no_retry_on=(CircuitOpenError,)
+        )
+
+    @classmethod
+    @fallback_on_invalid_response
     async def auth_login(cls, username, password):
         """
         Asynchronously logs in a user with the given username and password.
@@ -30,16 +110,16 @@ class OrganizationServices:
             "password": password,
             "app_code": APP_CODE
         }
-        async with httpx_context() as client:
-            response = await client.post(url=url, data=json)
-            if response.status_code != 500:
-                return (
-                    cls.is_success(response),
-                    response.json(),
-                )
+        response = await cls.send_request("login", "POST", url, data=json)
+        if response.status_code != 500:
+            return (
+                cls.is_success(response),
+                response.json(),
+            )
         return False, {}
 
     @classmethod
+    @fallback_on_invalid_response
     async def auth_login_by_ad(cls, username, password, ip_source: str):
         """
         Asynchronously logs in a user with the given username and password.
@@ -51,116 +131,112 @@ class OrganizationServices:
             "app_code": APP_CODE,
             "ip_source": ip_source
         }
-        async with httpx_context() as client:
-            response = await client.post(url=url, data=json)
-            if response.status_code != 500:
-                return (
-                    cls.is_success(response),
-                    response.json(),
-                )
+        response = await cls.send_request("login_by_ad", "POST", url, data=json)
+        if response.status_code != 500:
+            return (
+                cls.is_success(response),
+                response.json(),
+            )
         return False, {}
 
     @classmethod
+    @fallback_on_invalid_response
     async def logout(cls, token):
         """
         Logout a user with the given token.
         """
         url = cls.endpoints["logout"]
 
-        async with httpx_context() as client:
-            client.headers["Authorization"] = f"Bearer {token}"
-            response = await client.post(url=url)
-            if response.status_code != 500:
-                return (
-                    cls.is_success(response),
-                    response.json(),
-                )
+        authorization_cache.invalidate(token)
+        response = await cls.send_request("logout", "POST", url, token=token)
+        if response.status_code != 500:
+            return (
+                cls.is_success(response),
+                response.json(),
+            )
         return False, {}
 
     @classmethod
+    @fallback_on_invalid_response
     async def check_authorization(cls, token):
         url = cls.endpoints["authorization_url"]
-        async with httpx_context() as client:
-            client.headers["Authorization"] = f"Bearer {token}"
-            response = await client.get(url=url)
-            if response.status_code != 500:
-                return (
-                    cls.is_success(response),
-                    cls.get_response_data(response),
-                )
+        response = await cls.send_request("authorization_url", "GET", url, token=token, idempotent=True)
+        if response.status_code != 500:
+            return (
+                cls.is_success(response),
+                cls.get_response_data(response),
+            )
         return False, {}
 
     @classmethod
+    @fallback_on_invalid_response
     async def get_employee_position(cls, id):
         url = cls.endpoints["employee_position"].format(id=id)
-        async with httpx_context() as client:
-            response = await client.get(url=url)
-            if response.status_code != 500:
-                return (
-                    cls.is_success(response),
-                    cls.get_response_data(response),
-                )
+        response = await cls.send_request("employee_position", "GET", url, idempotent=True)
+        if response.status_code != 500:
+            return (
+                cls.is_success(response),
+                cls.get_response_data(response),
+            )
         return False, {}
 
     @classmethod
+    @fallback_on_invalid_response
     async def get_employee_detail(cls, user_token, id):
         url = cls.endpoints["employee_detail"].format(id=id)
-        async with httpx_context() as client:
-            client.headers["Authorization"] = f"Bearer {user_token}"
-            response = await client.get(url=url)
-            if response.status_code != 500:
-                return (
-                    cls.is_success(response),
-                    cls.get_response_data(response),
-                )
+        response = await cls.send_request("employee_detail", "GET", url, token=user_token, idempotent=True)
+        if response.status_code != 500:
+            return (
+                cls.is_success(response),
+                cls.get_response_data(response),
+            )
         return False, {}
 
     @classmethod
+    @fallback_on_invalid_response
     async def get_position(cls, user_token, id):
         url = cls.endpoints["position_detail"].format(id=id)
-        async with httpx_context() as client:
-            client.headers["Authorization"] = f"Bearer {user_token}"
-            response = await client.get(url=url)
-            if response.status_code != 500:
-                return (
-                    cls.is_success(response),
-                    cls.get_response_data(response),
-                )
+        response = await cls.send_request("position_detail", "GET", url, token=user_token, idempotent=True)
+        if response.status_code != 500:
+            return (
+                cls.is_success(response),
+                cls.get_response_data(response),
+            )
         return False, {}
 
     @classmethod
+    @fallback_on_invalid_response
     async def has_permission(cls, token, permission_page):
         url = cls.endpoints["has_permission"]
         json = {
             "permission_page": permission_page
         }
-        async with httpx_context() as client:
-            client.headers["Authorization"] = f"Bearer {token}"
-            response = await client.post(url=url, json=json)
-            if response.status_code != 500:
-                return (
-                    cls.is_success(response),
-                    response.json().get("data"),
-                )
+        response = await cls.send_request("has_permission", "POST", url, token=token, json=json)
+        if response.status_code != 500:
+            return (
+                cls.is_success(response),
+                response.json().get("data"),
+            )
         return False, {}
 
     @classmethod
+    @fallback_on_invalid_response
     async def employee_authorization(cls, token):
         url = cls.endpoints["employee_authorization"]
         params = {
             'app_code': APP_CODE
         }
-        async with httpx_context() as client:
-            client.headers["Authorization"] = f'Bearer {token}'
-            response = await client.get(url=url, params=params)
-            if response.status_code != 500:
-                return (
-                    cls.is_success(response),
-                    cls.get_response_data(response),
-                )
+        response = await cls.send_request(
+            "employee_authorization", "GET", url, token=token, params=params, idempotent=True)
+        if response.status_code != 500:
+            return (
+                cls.is_success(response),
+                cls.get_response_data(response),
+            )
         return False, {}
 
     @classmethod
+    @fallback_on_invalid_response
     async def get_branch(cls, token, region_name, city):
         parameter=[]
         if city:
@@ -170,31 +246,29 @@ class OrganizationServices:
             parameter.append(f"region_name={region_name}")
 
         url = cls.endpoints["branch"] + "&".join(parameter)
-        async with httpx_context() as client:
-            client.headers["Authorization"] = f'Bearer {token}'
-            response = await client.get(url=url)
-            response_json= cls.get_response_data(response)
-            if response.status_code != 500:
-                # validation below is required as the API response does not consistent
-                # if records found response JSON contains list of data,
-                # otherwise: {'message': 'success', 'data': [], 'status': True, 'record_count': 0}
-                if "record_count" in response_json and response_json.get("record_count") == 0:
-                    return False, {}
-
-                for item in response_json:
-                    if item.get("name").lower() == city.lower():
-                        return True, {"region_id":item.get("region_id"),"branch_id": item.get("id")}
+        response = await cls.send_request("branch", "GET", url, token=token)
+        response_json= cls.get_response_data(response)
+        if response.status_code != 500:
+            # validation below is required as the API response does not consistent
+            # if records found response JSON contains list of data,
+            # otherwise: {'message': 'success', 'data': [], 'status': True, 'record_count': 0}
+            if "record_count" in response_json and response_json.get("record_count") == 0:
+                return False, {}
+
+            for item in response_json:
+                if item.get("name").lower() == city.lower():
+                    return True, {"region_id":item.get("region_id"),"branch_id": item.get("id")}
         return False, {}
 
     @classmethod
+    @fallback_on_invalid_response
     async def refresh_token(cls, token):
         url = cls.endpoints["refresh_token"]
-        async with httpx_context() as client:
-            client.headers["Authorization"] = f'Bearer {token}'
-            response = await client.post(url=url)
-            if response.status_code != 500:
-                return (
-                    cls.is_success(response),
-                    {"token": response.json().get("token")},
-                )
+        authorization_cache.invalidate(token)
+        response = await cls.send_request("refresh_token", "POST", url, token=token)
+        if response.status_code != 500:
+            return (
+                cls.is_success(response),
+                {"token": response.json().get("token")},
+            )
         return False, {}
@@ -1,16 +1,145 @@
-import json
-from contextlib import asynccontextmanager
-from app.src.utils.httpx_client import httpx_context
-from app.src.core.config import ORGANIZATION_SERVICE_URL
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Set, Tuple
+
+import httpx
+from jose import JWTError, jwt
+
+from app.src.core import config
+from app.src.exception.overload import ServiceOverloadedError
+from app.src.services.organization_service.http import OrganizationServices
+from app.src.utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# what counts as the organization service failing to hand out a token
+UPSTREAM_ERRORS = (httpx.HTTPError, ServiceOverloadedError, ValueError, FileNotFoundError)
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    token: str
+    # time.monotonic() deadlines
+    refresh_at: float
+    expires_at: float
+
+
+def token_lifetime(token: str, data: dict, default: float) -> float:
+    """seconds the token stays valid: expires_in, else the JWT exp, else `default`"""
+    if data.get("expires_in"):
+        return float(data["expires_in"])
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        exp = None
+    if exp:
+        return max(0.0, exp - time.time())
+    return default
+
+
+class AccessTokenCache:
+    """
+    One access token per app_code. Inside `refresh_before` seconds of its
+    expiry a token is still handed out while a refresh runs in the
+    background; concurrent refreshes of one app_code share a single
+    upstream call. When the refresh fails the cached token is used for as
+    long as it is valid.
+
+    Example:
+        >>> token = await access_token_cache.get(app_code, AccessTokenGenerator.fetch_access_token)
+    """
+
+    def __init__(self, default_ttl: float, refresh_before: float):
+        self.default_ttl = default_ttl
+        self.refresh_before = refresh_before
+        self.tokens: Dict[str, CachedToken] = {}
+        self.single_flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.fallbacks = 0
+        self._background: Set[asyncio.Task] = set()
+
+    async def get(
+        self, app_code: str, fetch: Callable[[str], Awaitable[Tuple[str, dict]]]
+    ) -> str:
+        cached = self.tokens.get(app_code)
+        now = time.monotonic()
+        if cached is not None and now < cached.expires_at:
+            self.hits += 1
+            if now >= cached.refresh_at:
+                self._refresh_in_background(app_code, fetch)
+            return cached.token
+        self.misses += 1
+        return await self.single_flight.do(app_code, lambda: self._load(app_code, fetch))
+
+    def _refresh_in_background(self, app_code: str, fetch) -> None:
+        if self.single_flight.running(app_code):
+            return
+        task = asyncio.ensure_future(
+            self.single_flight.do(app_code, lambda: self._load(app_code, fetch)))
+        self._background.add(task)
+        task.add_done_callback(self._refreshed)
+
+    def _refreshed(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("access token refresh failed: %s", task.exception())
+
+    async def _load(self, app_code: str, fetch) -> str:
+        self.refreshes += 1
+        try:
+            token, data = await fetch(app_code)
+        except UPSTREAM_ERRORS:
+            cached = self.tokens.get(app_code)
+            if cached is None or time.monotonic() >= cached.expires_at:
+                raise
+            self.fallbacks += 1
+            logger.warning("access token refresh for %s failed, using the cached token", app_code)
+            return cached.token
+
+        lifetime = token_lifetime(token, data, self.default_ttl)
+        now = time.monotonic()
+        self.tokens[app_code] = CachedToken(
+            token=token,
+            refresh_at=now + lifetime - min(self.refresh_before, lifetime / 2),
+            expires_at=now + lifetime
+        )
+        return token
+
+    def invalidate(self, app_code: str) -> None:
+        self.tokens.pop(app_code, None)
+
+    def stats(self) -> dict:
+        return {
+            "app_codes": len(self.tokens),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "fallbacks": self.fallbacks,
+            "single_flight": self.single_flight.stats()
+        }
+
+
+access_token_cache = AccessTokenCache(
+    default_ttl=config.ACCESS_TOKEN_CACHE_TTL,
+    refresh_before=config.ACCESS_TOKEN_REFRESH_BEFORE
+)
 
 
 class AccessTokenGenerator:
     @classmethod
     async def get_access_token(cls, app_code):
-        url = ORGANIZATION_SERVICE_URL+"/external_party/{}/access_token".format(app_code)
-        async with httpx_context() as client:
-            response = await client.get(url)
-            response = response.json()
-            if not response.get('status'):
-                raise FileNotFoundError("Token not found")
-        return response.get('data').get('access_token')
+        return await access_token_cache.get(app_code, cls.fetch_access_token)
+
+    @classmethod
+    async def fetch_access_token(cls, app_code) -> Tuple[str, dict]:
+        url = OrganizationServices.endpoints["access_token"].format(app_code=app_code)
+        response = await OrganizationServices.send_request("access_token", "GET", url)
+        response = response.json()
+        if not response.get('status'):
+            raise FileNotFoundError("Token not found")
+        data = response.get('data')
+        return data.get('access_token'), data
@@ -0,0 +1,177 @@
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from app.src.core import config
+from app.src.exception.service import CircuitOpenError
+from app.src.utils.metrics import LatencyWindow
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker with an adaptive timeout for one outbound endpoint.
+
+    Closed, it passes calls through and remembers the outcome of the last
+    `window` of them; once at least `min_calls` were seen and `failure_rate`
+    of them failed it opens. Open, every call fails fast with
+    CircuitOpenError until `reset_timeout` seconds passed, then one probe is
+    let through (half open): success closes the circuit, failure opens it
+    again.
+
+    The timeout handed to each call is the observed p99 times `multiplier`,
+    kept between `min_timeout` and `max_timeout`; `max_timeout` applies until
+    `min_samples` successful calls were timed.
+
+    Example:
+        >>> response = await breaker.call(lambda timeout: client.get(url, timeout=timeout))
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_timeout: float,
+        min_timeout: float = config.ADAPTIVE_TIMEOUT_MIN,
+        multiplier: float = config.ADAPTIVE_TIMEOUT_MULTIPLIER,
+        min_samples: int = config.ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+        window: int = config.CIRCUIT_BREAKER_WINDOW,
+        min_calls: int = config.CIRCUIT_BREAKER_MIN_CALLS,
+        failure_rate: float = config.CIRCUIT_BREAKER_FAILURE_RATE,
+        reset_timeout: float = config.CIRCUIT_BREAKER_RESET_TIMEOUT
+    ):
+        self.name = name
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.latency = LatencyWindow()
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.fast_failed = 0
+        self.opened = 0
+        self._outcomes = deque(maxlen=window)
+        self._probing = False
+
+    def timeout(self) -> float:
+        if len(self.latency) < self.min_samples:
+            return self.max_timeout
+        adaptive = self.latency.percentile(99) * self.multiplier
+        return min(self.max_timeout, max(self.min_timeout, adaptive))
+
+    def hedge_after(self) -> Optional[float]:
+        """the rolling p95, None until `min_samples` successful calls were timed"""
+        if len(self.latency) < self.min_samples:
+            return None
+        return self.latency.percentile(95)
+
+    def _admit(self) -> bool:
+        """True when this call is the half open probe"""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.fast_failed += 1
+                raise CircuitOpenError(
+                    f"{self.name} is unavailable, please retry",
+                    retry_after=max(1, round(self.reset_timeout)))
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self._probing:
+                self.fast_failed += 1
+                raise CircuitOpenError(
+                    f"{self.name} is recovering, please retry", retry_after=1)
+            self._probing = True
+            return True
+        return False
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.opened += 1
+
+    def _record(self, failed: bool, probe: bool) -> None:
+        if probe:
+            self._probing = False
+            if failed:
+                self._open()
+            else:
+                self.state = CLOSED
+                self._outcomes.clear()
+            return
+        self._outcomes.append(failed)
+        if self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+            if sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                self._open()
+
+    async def call(
+        self,
+        function: Callable[[float], Awaitable[Any]],
+        is_failure: Callable[[Any], bool] = lambda result: False
+    ) -> Any:
+        probe = self._admit()
+        self.calls += 1
+        started = time.monotonic()
+        try:
+            result = await function(self.timeout())
+        except httpx.TimeoutException:
+            self.failures += 1
+            self.timeouts += 1
+            self._record(True, probe)
+            raise
+        except httpx.TransportError:
+            self.failures += 1
+            self._record(True, probe)
+            raise
+        except BaseException:
+            # not the endpoint's fault, e.g. the caller was cancelled
+            if probe:
+                self._probing = False
+            raise
+        failed = is_failure(result)
+        if failed:
+            self.failures += 1
+        else:
+            self.latency.observe(time.monotonic() - started)
+        self._record(failed, probe)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "timeout": round(self.timeout(), 3),
+            "p95_ms": round(self.latency.percentile(95) * 1000, 3),
+            "p99_ms": round(self.latency.percentile(99) * 1000, 3),
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "fast_failed": self.fast_failed,
+            "opened": self.opened,
+            "window_failure_rate": round(sum(self._outcomes) / len(self._outcomes), 3)
+            if self._outcomes else 0.0
+        }
+
+
+class CircuitBreakerRegistry:
+    def __init__(self):
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str, max_timeout: float) -> CircuitBreaker:
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            breaker = self.breakers[name] = CircuitBreaker(name, max_timeout=max_timeout)
+        return breaker
+
+    def stats(self) -> dict:
+        return {name: breaker.stats() for name, breaker in self.breakers.items()}
+
+
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,36 @@
+import base64
+import json
+from datetime import datetime
+from typing import Sequence
+
+
+def encode_cursor(values: Sequence) -> str:
+    """
+    opaque url-safe cursor for a keyset position, datetimes are kept as ISO strings
+
+    Example:
+        >>> encode_cursor([datetime(2026, 1, 31), datetime(2026, 2, 1, 8, 30), 42])
+        'WyIyMDI2LTAxLTMxVDAwOjAwOjAwIiwgIjIwMjYtMDItMDFUMDg6MzA6MDAiLCA0Ml0'
+    """
+    payload = json.dumps([
+        value.isoformat() if isinstance(value, datetime) else value for value in values
+    ])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> tuple:
+    """
+    reverse of encode_cursor, every value is converted with the matching type;
+    raises ValueError for anything that was not produced by encode_cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError
+        return tuple(
+            datetime.fromisoformat(value) if type_ is datetime else type_(value)
+            for type_, value in zip(types, values)
+        )
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
@@ -0,0 +1,154 @@
+import asyncio
+import random
+from typing import Any, Awaitable, Callable, Optional, Tuple, Type
+
+from app.src.core import config
+
+
+class ExtraCallBudget:
+    """
+    Token bucket capping hedges and retries at `percent` of the primary calls:
+    every primary call earns percent / 100 of a token, every extra call spends
+    one, and at most `burst` tokens are saved up.
+
+    Example:
+        >>> budget.record_call()
+        >>> if budget.try_spend():
+        >>>     ...
+    """
+
+    def __init__(self, percent: float, burst: float = 10.0):
+        self.ratio = percent / 100
+        self.burst = burst
+        self.tokens = burst
+        self.calls = 0
+        self.spent = 0
+        self.denied = 0
+
+    def record_call(self) -> None:
+        self.calls += 1
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.tokens < 1:
+            self.denied += 1
+            return False
+        self.tokens -= 1
+        self.spent += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "percent": self.ratio * 100,
+            "tokens": round(self.tokens, 3),
+            "calls": self.calls,
+            "extra_calls": self.spent,
+            "denied": self.denied
+        }
+
+
+class HedgedReader:
+    """
+    Runs idempotent reads with an optional hedge and jittered retries, both
+    paid from one ExtraCallBudget.
+
+    Hedge: when the first attempt has not answered after `hedge_after`
+    seconds (the endpoint's rolling p95) a second one starts and the first
+    answer wins, the loser is cancelled. Retry: a failed read is tried again
+    up to `attempts` times after a full jitter backoff.
+
+    Example:
+        >>> response = await hedged_reader.read(lambda: fetch(url), hedge_after=0.12)
+    """
+
+    def __init__(
+        self,
+        budget: ExtraCallBudget,
+        hedge: bool,
+        attempts: int,
+        base_delay: float,
+        max_delay: float
+    ):
+        self.budget = budget
+        self.hedge = hedge
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedges = 0
+        self.hedges_won = 0
+        self.retries = 0
+
+    async def _hedged(self, call: Callable[[], Awaitable[Any]], hedge_after: Optional[float]) -> Any:
+        tasks = [asyncio.ensure_future(call())]
+        try:
+            if self.hedge and hedge_after is not None:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+                if not done and self.budget.try_spend():
+                    self.hedges += 1
+                    tasks.append(asyncio.ensure_future(call()))
+
+            error = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            self.hedges_won += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def read(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        hedge_after: Optional[float] = None,
+        is_failure: Callable[[Any], bool] = lambda result: False,
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+        no_retry_on: Tuple[Type[BaseException], ...] = ()
+    ) -> Any:
+        """
+        `is_failure` marks results worth a retry (e.g. a 5xx response); the
+        last result or error is returned or raised once retries run out
+        """
+        self.budget.record_call()
+        attempt = 0
+        while True:
+            try:
+                result = await self._hedged(call, hedge_after)
+                if not is_failure(result) or not self._may_retry(attempt):
+                    return result
+            except no_retry_on:
+                raise
+            except retry_on:
+                if not self._may_retry(attempt):
+                    raise
+            attempt += 1
+            self.retries += 1
+            # full jitter, retries of many workers do not line up
+            await asyncio.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+
+    def _may_retry(self, attempt: int) -> bool:
+        return attempt < self.attempts and self.budget.try_spend()
+
+    def stats(self) -> dict:
+        return {
+            "hedge": self.hedge,
+            "hedges": self.hedges,
+            "hedges_won": self.hedges_won,
+            "retries": self.retries,
+            "budget": self.budget.stats()
+        }
+
+
+hedged_reader = HedgedReader(
+    budget=ExtraCallBudget(percent=config.READ_EXTRA_BUDGET_PERCENT),
+    hedge=config.HEDGE_READS,
+    attempts=config.READ_RETRY_ATTEMPTS,
+    base_delay=config.READ_RETRY_BASE_DELAY,
+    max_delay=config.READ_RETRY_MAX_DELAY
+)
@@ -1,6 +1,8 @@
 import httpx
 import logging
 from contextlib import asynccontextmanager
+from typing import Optional
+from app.src.core import config
 from app.src.core.config import WSO_API_KEY
 
 
@@ -35,15 +37,60 @@ class BaseHttpxClient:
         return httpx_client
 
 
+class HttpxPool:
+    """
+    One pooled AsyncClient per worker, opened and closed by the app lifespan,
+    so outbound calls reuse keep-alive connections instead of paying a TCP and
+    TLS handshake each. Per call headers are passed to the request, never set
+    on the shared client.
+
+    Example:
+        >>> response = await httpx_pool.client.get(url, headers={"Authorization": "Bearer ..."})
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @staticmethod
+    def build() -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=config.HTTPX_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTPX_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.HTTPX_KEEPALIVE_EXPIRY
+        )
+        transport = httpx.AsyncHTTPTransport(
+            verify=False, http2=config.HTTPX_HTTP2, limits=limits)
+        return httpx.AsyncClient(
+            transport=transport,
+            headers={"APIKey": WSO_API_KEY},
+            timeout=httpx.Timeout(config.HTTPX_TIMEOUT, connect=config.HTTPX_CONNECT_TIMEOUT),
+            trust_env=False,
+            verify=False
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # commands and scripts run without the lifespan, open it on first use
+        if self._client is None or self._client.is_closed:
+            self._client = self.build()
+        return self._client
+
+    async def start(self) -> None:
+        self._client = self.build()
+
+    async def stop(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+httpx_pool = HttpxPool()
+
+
 @asynccontextmanager
 async def httpx_context():
-    client = await BaseHttpxClient().async_client()
-    client.headers = {
-        "APIKey": WSO_API_KEY
-    }
+    """the shared client of this worker, pass per call headers to the request"""
     try:
-        yield client
+        yield httpx_pool.client
     except ValueError as error:
         logging.error("APIKey WSO2 not working")
-    finally:
-        await client.aclose()
@@ -0,0 +1,74 @@
+import bisect
+from collections import deque
+from typing import Sequence
+
+
+class Histogram:
+    """
+    Bucketed latency histogram, bucket bounds are upper limits in seconds.
+
+    Example:
+        >>> histogram = Histogram()
+        >>> histogram.observe(0.003)
+        >>> histogram.snapshot()["count"]
+        1
+    """
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1,
+                       0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> dict:
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[f"le_{bound}"] = cumulative
+        buckets["le_inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "buckets": buckets
+        }
+
+
+class LatencyWindow:
+    """
+    Rolling window of the most recent samples, used for percentiles.
+
+    Example:
+        >>> window = LatencyWindow(size=100)
+        >>> for value in (0.1, 0.2, 0.3):
+        >>>     window.observe(value)
+        >>> window.percentile(50)
+        0.2
+    """
+
+    def __init__(self, size: int = 512):
+        self.samples = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def observe(self, value: float) -> None:
+        self.samples.append(value)
+
+    def percentile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+        return ordered[index]
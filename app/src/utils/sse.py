@@ -0,0 +1,18 @@
+import json
+from typing import Any, Optional
+
+
+def sse_event(data: Any, event: Optional[str] = None) -> str:
+    """
+    one Server-Sent Event with a JSON payload
+
+    Example:
+        >>> sse_event({"text": "hi"}, event="chunk")
+        'event: chunk\\ndata: {"text": "hi"}\\n\\n'
+    """
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+SSE_KEEP_ALIVE = ": keep-alive\n\n"
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
@@ -0,0 +1,120 @@
+"""partition transactions by month
+
+Revision ID: 8b4e6d2c1a57
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b4e6d2c1a57'
+down_revision: Union[str, None] = '3f1c2a9d7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, user_id, amount, description, type, category_code, date, created_at, updated_at"
+# frozen here on purpose, the app keeps creating later months at startup
+MONTHS_AHEAD = 12
+
+
+def add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE transactions RENAME TO transactions_unpartitioned")
+    op.execute("ALTER TABLE transactions_unpartitioned RENAME CONSTRAINT transactions_pkey TO transactions_unpartitioned_pkey")
+    op.execute("ALTER INDEX ix_transactions_user_id_date RENAME TO ix_transactions_unpartitioned_user_id_date")
+    op.execute("ALTER INDEX ix_transactions_user_id_type_date RENAME TO ix_transactions_unpartitioned_user_id_type_date")
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY NONE")
+
+    # the partition key can not be NULL
+    op.execute("UPDATE transactions_unpartitioned SET date = COALESCE(created_at, now()) WHERE date IS NULL")
+
+    op.execute("""
+        CREATE TABLE transactions (
+            id integer NOT NULL DEFAULT nextval('transactions_id_seq'),
+            user_id integer NOT NULL REFERENCES users (id),
+            amount double precision NOT NULL,
+            description varchar(255) NOT NULL,
+            type category_type_enum NOT NULL,
+            category_code varchar(50),
+            date timestamp without time zone NOT NULL,
+            created_at timestamp without time zone,
+            updated_at timestamp without time zone,
+            PRIMARY KEY (id, date)
+        ) PARTITION BY RANGE (date)
+    """)
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id")
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+
+    first_date = op.get_bind().execute(
+        sa.text("SELECT min(date) FROM transactions_unpartitioned")).scalar()
+    this_month = date.today().replace(day=1)
+    month = date(first_date.year, first_date.month, 1) if first_date else this_month
+    while month <= add_months(this_month, MONTHS_AHEAD):
+        next_month = add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE transactions_p{month:%Y_%m} PARTITION OF transactions "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+
+    op.execute(f"INSERT INTO transactions ({COLUMNS}) SELECT {COLUMNS} FROM transactions_unpartitioned")
+
+    # indexes on the partitioned parent cascade to every partition
+    op.create_index("ix_transactions_user_id_date", "transactions", ["user_id", "date"])
+    op.create_index(
+        "ix_transactions_user_id_type_date",
+        "transactions",
+        ["user_id", "type", "date"],
+        postgresql_include=["amount", "category_code"],
+    )
+    op.execute("DROP TABLE transactions_unpartitioned")
+    op.execute("ANALYZE transactions")
+
+
+def downgrade() -> None:
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE transactions RENAME TO transactions_partitioned")
+    op.execute("ALTER INDEX ix_transactions_user_id_date RENAME TO ix_transactions_partitioned_user_id_date")
+    op.execute("ALTER INDEX ix_transactions_user_id_type_date RENAME TO ix_transactions_partitioned_user_id_type_date")
+
+    op.execute("""
+        CREATE TABLE transactions (
+            id integer NOT NULL DEFAULT nextval('transactions_id_seq') PRIMARY KEY,
+            user_id integer NOT NULL REFERENCES users (id),
+            amount double precision NOT NULL,
+            description varchar(255) NOT NULL,
+            type category_type_enum NOT NULL,
+            category_code varchar(50),
+            date timestamp without time zone,
+            created_at timestamp without time zone,
+            updated_at timestamp without time zone
+        )
+    """)
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id")
+    op.execute(f"INSERT INTO transactions ({COLUMNS}) SELECT {COLUMNS} FROM transactions_partitioned")
+    op.execute("DROP TABLE transactions_partitioned")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_user_id_date",
+            "transactions",
+            ["user_id", "date"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_transactions_user_id_type_date",
+            "transactions",
+            ["user_id", "type", "date"],
+            postgresql_include=["amount", "category_code"],
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,82 @@
+"""transaction monthly rollup
+
+Revision ID: c2d9e4f6a813
+Revises: 8b4e6d2c1a57
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d9e4f6a813'
+down_revision: Union[str, None] = '8b4e6d2c1a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# applies the old row as a negative delta and the new row as a positive one,
+# so inserts, deletes and updates that move a row between months, types or
+# categories all keep the rollup exact inside the writing transaction
+APPLY_FUNCTION = """
+    CREATE OR REPLACE FUNCTION transaction_monthly_rollup_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            INSERT INTO transaction_monthly_rollup AS r (user_id, month, type, category_code, total, count)
+            VALUES (OLD.user_id, CAST(date_trunc('month', OLD.date) AS date), OLD.type,
+                    COALESCE(OLD.category_code, ''), -OLD.amount, -1)
+            ON CONFLICT (user_id, month, type, category_code) DO UPDATE
+            SET total = r.total + EXCLUDED.total, count = r.count + EXCLUDED.count;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO transaction_monthly_rollup AS r (user_id, month, type, category_code, total, count)
+            VALUES (NEW.user_id, CAST(date_trunc('month', NEW.date) AS date), NEW.type,
+                    COALESCE(NEW.category_code, ''), NEW.amount, 1)
+            ON CONFLICT (user_id, month, type, category_code) DO UPDATE
+            SET total = r.total + EXCLUDED.total, count = r.count + EXCLUDED.count;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'transaction_monthly_rollup',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('type', postgresql.ENUM(name='category_type_enum', create_type=False), nullable=False),
+        sa.Column('category_code', sa.String(length=50), nullable=False, server_default=''),
+        sa.Column('total', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('user_id', 'month', 'type', 'category_code'),
+    )
+    op.execute(APPLY_FUNCTION)
+    # a row trigger on the partitioned parent fires for every partition
+    op.execute("""
+        CREATE TRIGGER transactions_monthly_rollup
+        AFTER INSERT OR DELETE OR UPDATE OF user_id, amount, type, category_code, date
+        ON transactions
+        FOR EACH ROW EXECUTE FUNCTION transaction_monthly_rollup_apply()
+    """)
+
+    # backfill while writers wait, so no delta is applied twice or lost
+    op.execute("LOCK TABLE transactions IN SHARE MODE")
+    op.execute("""
+        INSERT INTO transaction_monthly_rollup (user_id, month, type, category_code, total, count)
+        SELECT user_id, CAST(date_trunc('month', date) AS date), type,
+               COALESCE(category_code, ''), sum(amount), count(*)
+        FROM transactions
+        GROUP BY 1, 2, 3, 4
+    """)
+    op.execute("ANALYZE transaction_monthly_rollup")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS transactions_monthly_rollup ON transactions")
+    op.execute("DROP FUNCTION IF EXISTS transaction_monthly_rollup_apply()")
+    op.drop_table('transaction_monthly_rollup')
@@ -0,0 +1,36 @@
+"""ai analysis input hash
+
+Revision ID: 5e7a1b3c9d24
+Revises: c2d9e4f6a813
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e7a1b3c9d24'
+down_revision: Union[str, None] = 'c2d9e4f6a813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ai_analysis', sa.Column('input_hash', sa.String(length=64), nullable=True))
+    op.add_column('ai_analysis', sa.Column(
+        'month_digests', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.create_index(
+        'ix_ai_analysis_user_id_type_hash',
+        'ai_analysis',
+        ['user_id', 'analysis_type', 'input_hash', 'created_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ai_analysis_user_id_type_hash', table_name='ai_analysis')
+    op.drop_column('ai_analysis', 'month_digests')
+    op.drop_column('ai_analysis', 'input_hash')
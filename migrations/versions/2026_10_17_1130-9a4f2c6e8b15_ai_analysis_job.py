@@ -0,0 +1,52 @@
+"""ai analysis job
+
+Revision ID: 9a4f2c6e8b15
+Revises: 5e7a1b3c9d24
+Create Date: 2026-10-17 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f2c6e8b15'
+down_revision: Union[str, None] = '5e7a1b3c9d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ai_analysis_job',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('analysis_type', postgresql.ENUM(name='analysistype', create_type=False), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=False),
+        sa.Column('status', sa.Enum('queued', 'running', 'done', 'failed', name='ai_job_status_enum'), nullable=False),
+        sa.Column('analysis_id', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['analysis_id'], ['ai_analysis.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ux_ai_analysis_job_in_flight',
+        'ai_analysis_job',
+        ['user_id', 'analysis_type', 'start_date', 'end_date'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ux_ai_analysis_job_in_flight', table_name='ai_analysis_job')
+    op.drop_table('ai_analysis_job')
+    op.execute("DROP TYPE ai_job_status_enum")
@@ -0,0 +1,5 @@
+import os
+
+# the Gemini client is built at import time and refuses an empty key
+if not os.environ.get("GEMINI_API_KEY"):
+    os.environ["GEMINI_API_KEY"] = "test"
@@ -0,0 +1,105 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from app.src.database.admission import AdmissionController
+from app.src.exception.database import PoolSaturatedError
+
+
+def controller(capacity=1, queue_size=2, timeout=1.0) -> AdmissionController:
+    return AdmissionController(capacity, queue_size, timeout, retry_after=3)
+
+
+def test_admits_up_to_capacity_then_hands_slots_over_in_order():
+    async def scenario():
+        admission = controller(capacity=1)
+        await admission.acquire()
+        order = []
+
+        async def waiter(name):
+            await admission.acquire()
+            order.append(name)
+
+        tasks = [asyncio.create_task(waiter(name)) for name in ("first", "second")]
+        await asyncio.sleep(0)
+        assert admission.queue_depth == 2
+
+        admission.release()
+        await asyncio.sleep(0)
+        admission.release()
+        await asyncio.gather(*tasks)
+        admission.release()
+        return order, admission
+
+    order, admission = asyncio.run(scenario())
+    assert order == ["first", "second"]
+    assert admission.in_use == 0
+    assert admission.admitted == 3
+
+
+def test_rejects_when_the_queue_is_full():
+    async def scenario():
+        admission = controller(capacity=1, queue_size=1)
+        await admission.acquire()
+        queued = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(PoolSaturatedError) as error:
+            await admission.acquire()
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        return admission, error.value
+
+    admission, error = asyncio.run(scenario())
+    assert error.retry_after == 3
+    assert admission.rejected == 1
+    assert admission.queue_depth == 0
+
+
+def test_times_out_waiting():
+    async def scenario():
+        admission = controller(capacity=1, timeout=0.01)
+        await admission.acquire()
+        with pytest.raises(PoolSaturatedError):
+            await admission.acquire()
+        return admission
+
+    admission = asyncio.run(scenario())
+    assert admission.timed_out == 1
+    assert admission.in_use == 1
+    assert admission.queue_depth == 0
+
+
+def test_slot_handed_over_as_the_wait_times_out_is_passed_on():
+    async def scenario():
+        admission = controller(capacity=1)
+        await admission.acquire()
+
+        async def released_then_timed_out(waiter, timeout):
+            # release() resolves the waiter, then the timeout fires anyway
+            admission.release()
+            assert waiter.done()
+            raise asyncio.TimeoutError
+
+        with mock.patch.object(asyncio, "wait_for", released_then_timed_out):
+            with pytest.raises(PoolSaturatedError):
+                await admission.acquire()
+        return admission
+
+    admission = asyncio.run(scenario())
+    assert admission.in_use == 0
+
+
+def test_cancelled_waiter_passes_a_handed_over_slot_on():
+    async def scenario():
+        admission = controller(capacity=1)
+        await admission.acquire()
+        queued = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+        admission.release()
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        return admission
+
+    admission = asyncio.run(scenario())
+    assert admission.in_use == 0
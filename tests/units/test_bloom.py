@@ -0,0 +1,23 @@
+from app.src.utils.bloom import BloomFilter
+
+
+def test_added_items_are_always_found():
+    items = [f"jti-{index}" for index in range(1000)]
+    bloom = BloomFilter.from_items(items, capacity=1000, error_rate=0.01)
+
+    assert all(item in bloom for item in items)
+    assert bloom.count == 1000
+
+
+def test_false_positive_rate_stays_near_error_rate():
+    bloom = BloomFilter.from_items(
+        (f"jti-{index}" for index in range(1000)), capacity=1000, error_rate=0.01)
+
+    false_positives = sum(f"other-{index}" in bloom for index in range(10000))
+    assert false_positives / 10000 < 0.03
+
+
+def test_empty_filter_contains_nothing():
+    bloom = BloomFilter(capacity=100, error_rate=0.001)
+    assert "a" not in bloom
+    assert bloom.stats()["hashes"] >= 1
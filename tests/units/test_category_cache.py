@@ -0,0 +1,91 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.src.database.models.transaction import TransactionType
+from app.src.router.category.cache import CategoryCache
+
+
+def category(id: int, code: str, type=TransactionType.EXPENSE):
+    return SimpleNamespace(
+        id=id, name=code.title(), code=code, type=type, icon=None, color="#fff", is_active=True)
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def one(self):
+        return self.value
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.value
+
+
+class FakeSession:
+    """answers the signature query, then the rows query of a reload"""
+
+    def __init__(self, rows, updated_at=datetime(2026, 1, 1)):
+        self.rows = rows
+        self.updated_at = updated_at
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        if "count" in str(statement):
+            return FakeResult((len(self.rows), self.updated_at))
+        return FakeResult(self.rows)
+
+
+def test_first_refresh_loads_the_table():
+    cache = CategoryCache(ttl=300)
+    db = FakeSession([category(2, "SALARY", TransactionType.INCOME), category(1, "FOOD")])
+    asyncio.run(cache.refresh(db))
+
+    assert cache.version == 1
+    assert cache.get("FOOD").name == "Food"
+    assert cache.get(None) is None
+    assert [entry.code for entry in cache.all(TransactionType.INCOME)] == ["SALARY"]
+    assert len(cache.all()) == 2
+
+
+def test_refresh_within_the_ttl_does_not_query():
+    cache = CategoryCache(ttl=300)
+    db = FakeSession([category(1, "FOOD")])
+    asyncio.run(cache.refresh(db))
+    asyncio.run(cache.refresh(db))
+
+    assert db.queries == 2
+    assert cache.checks == 1
+
+
+def test_invalidate_checks_again_and_reloads_only_on_change():
+    cache = CategoryCache(ttl=300)
+    db = FakeSession([category(1, "FOOD")])
+    asyncio.run(cache.refresh(db))
+
+    cache.invalidate()
+    asyncio.run(cache.refresh(db))
+    assert (cache.checks, cache.version) == (2, 1)
+
+    db.rows = [category(2, "RENT"), category(1, "FOOD")]
+    cache.invalidate()
+    asyncio.run(cache.refresh(db))
+    assert cache.version == 2
+    assert cache.get("RENT") is not None
+
+
+def test_snapshot_is_unaffected_by_a_reload():
+    cache = CategoryCache(ttl=0)
+    db = FakeSession([category(1, "FOOD")])
+    asyncio.run(cache.refresh(db))
+    snapshot = cache.snapshot()
+
+    db.rows = [category(2, "RENT")]
+    db.updated_at = datetime(2026, 2, 1)
+    asyncio.run(cache.refresh(db))
+    assert list(snapshot) == ["FOOD"]
+    assert list(cache.snapshot()) == ["RENT"]
@@ -0,0 +1,115 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.src.exception.service import CircuitOpenError
+from app.src.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def breaker(**overrides) -> CircuitBreaker:
+    settings = dict(
+        max_timeout=10.0, min_timeout=0.1, multiplier=2.0, min_samples=3,
+        window=4, min_calls=2, failure_rate=0.5, reset_timeout=30.0)
+    settings.update(overrides)
+    return CircuitBreaker("upstream", **settings)
+
+
+async def succeed(timeout):
+    return "ok"
+
+
+async def fail(timeout):
+    raise httpx.ConnectError("refused")
+
+
+def call(circuit, function, **kwargs):
+    return asyncio.run(circuit.call(function, **kwargs))
+
+
+def test_opens_at_the_failure_rate_and_fails_fast():
+    circuit = breaker()
+    call(circuit, succeed)
+    with pytest.raises(httpx.ConnectError):
+        call(circuit, fail)
+    assert circuit.state == OPEN
+
+    with pytest.raises(CircuitOpenError) as error:
+        call(circuit, succeed)
+    assert error.value.retry_after == 30
+    assert circuit.fast_failed == 1
+
+
+def test_stays_closed_below_min_calls():
+    circuit = breaker(min_calls=3)
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            call(circuit, fail)
+    assert circuit.state == CLOSED
+
+
+def test_failing_results_count_as_failures():
+    circuit = breaker()
+    call(circuit, succeed, is_failure=lambda result: True)
+    call(circuit, succeed, is_failure=lambda result: True)
+    assert circuit.state == OPEN
+    assert circuit.failures == 2
+
+
+def test_half_open_probe_closes_or_reopens():
+    circuit = breaker()
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            call(circuit, fail)
+    circuit.opened_at -= 30
+
+    with pytest.raises(httpx.ConnectError):
+        call(circuit, fail)
+    assert circuit.state == OPEN
+    assert circuit.opened == 2
+
+    circuit.opened_at -= 30
+    assert call(circuit, succeed) == "ok"
+    assert circuit.state == CLOSED
+
+
+def test_only_one_probe_runs_while_half_open():
+    async def scenario(circuit):
+        started = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def slow(timeout):
+            started.set()
+            await finish.wait()
+            return "ok"
+
+        probe = asyncio.create_task(circuit.call(slow))
+        await started.wait()
+        assert circuit.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            await circuit.call(succeed)
+        finish.set()
+        return await probe
+
+    circuit = breaker()
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            call(circuit, fail)
+    circuit.opened_at -= 30
+    assert asyncio.run(scenario(circuit)) == "ok"
+    assert circuit.state == CLOSED
+
+
+def test_timeout_and_hedge_after_adapt_once_sampled():
+    circuit = breaker()
+    assert circuit.timeout() == 10.0
+    assert circuit.hedge_after() is None
+
+    for latency in (0.2, 0.2, 0.2):
+        circuit.latency.observe(latency)
+    assert circuit.timeout() == pytest.approx(0.4)
+    assert circuit.hedge_after() == pytest.approx(0.2)
+
+    circuit.latency.observe(0.01)
+    circuit.min_timeout = 1.0
+    assert circuit.timeout() == 1.0
@@ -0,0 +1,79 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.src.router.transaction.crud import CRUDTransaction
+from app.src.database.models.transaction import Transaction
+from app.src.utils.cursor import decode_cursor, encode_cursor
+
+TYPES = (datetime, datetime, int)
+
+
+def test_cursor_round_trip():
+    position = (datetime(2026, 1, 31), datetime(2026, 2, 1, 8, 30, 15, 123456), 42)
+    cursor = encode_cursor(position)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, TYPES) == position
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 !",
+    encode_cursor([1, 2]),
+    encode_cursor(["2026-01-31", "yesterday", 42]),
+    encode_cursor(["2026-01-31", "2026-01-31", "x"]),
+    "eyJhIjogMX0",  # {"a": 1}
+])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, TYPES)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.rows[:statement._limit])
+
+
+def compiled(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_keyset_page_is_strictly_after_the_position():
+    db = FakeSession(rows=[1, 2, 3])
+    after = (datetime(2026, 1, 31), datetime(2026, 1, 31, 8), 42)
+
+    rows, has_more = asyncio.run(CRUDTransaction(Transaction).get_user_transactions_after(
+        db, user_id=1, category_codes=["FOOD"], after=after, limit=2))
+
+    sql = compiled(db.statements[0])
+    assert "transactions.date <= %(date_1)s" in sql
+    assert ("(transactions.date, coalesce(transactions.created_at, transactions.date), "
+            "transactions.id) < (%(param_1)s, %(param_2)s, %(param_3)s)") in sql
+    assert "ORDER BY transactions.date DESC" in sql
+    assert "LIMIT %(param_4)s" in sql
+    assert rows == [1, 2] and has_more is True
+
+
+def test_first_page_has_no_keyset_predicate():
+    db = FakeSession(rows=[1, 2])
+
+    rows, has_more = asyncio.run(CRUDTransaction(Transaction).get_user_transactions_after(
+        db, user_id=1, category_codes=["FOOD"], after=None, limit=2))
+
+    assert " < (" not in compiled(db.statements[0])
+    assert rows == [1, 2] and has_more is False
@@ -0,0 +1,72 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from app.src.exception.service import ModelBusyError
+from app.src.services.gemini.client import FairLimiter
+
+
+def limiter(capacity=1, queue_size=10, timeout=1.0) -> FairLimiter:
+    return FairLimiter(capacity, queue_size, timeout, retry_after=5)
+
+
+def test_fair_limiter_serves_keys_round_robin():
+    async def scenario():
+        fair = limiter()
+        await fair.acquire("holder")
+        order = []
+
+        async def waiter(key, name):
+            await fair.acquire(key)
+            order.append(name)
+            fair.release()
+
+        tasks = [
+            asyncio.create_task(waiter("a", "a1")),
+            asyncio.create_task(waiter("a", "a2")),
+            asyncio.create_task(waiter("a", "a3")),
+            asyncio.create_task(waiter("b", "b1")),
+        ]
+        await asyncio.sleep(0)
+        assert fair.queue_depth == 4
+        fair.release()
+        await asyncio.gather(*tasks)
+        return order, fair
+
+    order, fair = asyncio.run(scenario())
+    assert order == ["a1", "b1", "a2", "a3"]
+    assert fair.in_use == 0
+    assert fair.queue_depth == 0
+
+
+def test_fair_limiter_rejects_beyond_the_queue():
+    async def scenario():
+        fair = limiter(queue_size=0)
+        await fair.acquire("a")
+        with pytest.raises(ModelBusyError) as error:
+            await fair.acquire("b")
+        return error.value
+
+    assert asyncio.run(scenario()).retry_after == 5
+
+
+def test_fair_limiter_slot_handed_over_as_the_wait_times_out_is_passed_on():
+    async def scenario():
+        fair = limiter()
+        await fair.acquire("a")
+
+        async def released_then_timed_out(waiter, timeout):
+            fair.release()
+            assert waiter.done()
+            raise asyncio.TimeoutError
+
+        with mock.patch.object(asyncio, "wait_for", released_then_timed_out):
+            with pytest.raises(ModelBusyError):
+                await fair.acquire("b")
+        return fair
+
+    fair = asyncio.run(scenario())
+    assert fair.in_use == 0
+    assert fair.queue_depth == 0
+    assert fair.timed_out == 1
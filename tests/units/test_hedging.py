@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from app.src.utils.hedging import ExtraCallBudget, HedgedReader
+
+
+def test_budget_earns_percent_of_calls_up_to_burst():
+    budget = ExtraCallBudget(percent=25, burst=1)
+    assert budget.try_spend()
+    assert not budget.try_spend()
+
+    for _ in range(3):
+        budget.record_call()
+    assert not budget.try_spend()
+    budget.record_call()
+    assert budget.try_spend()
+
+    for _ in range(100):
+        budget.record_call()
+    assert budget.tokens == 1
+    assert (budget.spent, budget.denied) == (2, 2)
+
+
+def reader(budget: ExtraCallBudget, hedge: bool = False, attempts: int = 3) -> HedgedReader:
+    return HedgedReader(budget, hedge=hedge, attempts=attempts, base_delay=0, max_delay=0)
+
+
+class Flaky:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("flaky")
+        return self.calls
+
+
+def test_retries_until_success():
+    hedged = reader(ExtraCallBudget(percent=0, burst=5))
+    assert asyncio.run(hedged.read(Flaky(failures=2))) == 3
+    assert hedged.retries == 2
+
+
+def test_retries_stop_when_the_budget_is_spent():
+    hedged = reader(ExtraCallBudget(percent=0, burst=1))
+    flaky = Flaky(failures=5)
+    with pytest.raises(ConnectionError):
+        asyncio.run(hedged.read(flaky))
+    assert flaky.calls == 2
+    assert hedged.budget.denied == 1
+
+
+def test_no_retry_on_is_raised_right_away():
+    hedged = reader(ExtraCallBudget(percent=0, burst=5))
+    flaky = Flaky(failures=1)
+    with pytest.raises(ConnectionError):
+        asyncio.run(hedged.read(flaky, no_retry_on=(ConnectionError,)))
+    assert flaky.calls == 1
+
+
+def test_failing_result_is_retried_and_last_one_returned():
+    hedged = reader(ExtraCallBudget(percent=0, burst=5), attempts=2)
+    flaky = Flaky(failures=0)
+    assert asyncio.run(hedged.read(flaky, is_failure=lambda result: True)) == 3
+
+
+def test_hedge_wins_over_a_slow_first_attempt():
+    calls = []
+
+    async def call():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            await asyncio.sleep(1)
+            return "slow"
+        return "fast"
+
+    hedged = reader(ExtraCallBudget(percent=0, burst=1), hedge=True)
+    assert asyncio.run(hedged.read(call, hedge_after=0.01)) == "fast"
+    assert (hedged.hedges, hedged.hedges_won) == (1, 1)
+
+
+def test_no_hedge_without_budget():
+    async def call():
+        await asyncio.sleep(0.05)
+        return "only"
+
+    hedged = reader(ExtraCallBudget(percent=0, burst=0), hedge=True)
+    assert asyncio.run(hedged.read(call, hedge_after=0.01)) == "only"
+    assert hedged.hedges == 0
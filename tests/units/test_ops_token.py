@@ -0,0 +1,31 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.src.core import config
+from app.src.router.security import verify_ops_token
+
+
+def check(token: str) -> None:
+    asyncio.run(verify_ops_token(token))
+
+
+def test_diagnostics_are_hidden_without_a_configured_token(monkeypatch):
+    monkeypatch.setattr(config, "OPS_TOKEN", "")
+    with pytest.raises(HTTPException) as error:
+        check("")
+    assert error.value.status_code == 404
+
+
+def test_wrong_token_is_rejected(monkeypatch):
+    monkeypatch.setattr(config, "OPS_TOKEN", "secret")
+    for token in ("", "secre", "secret2"):
+        with pytest.raises(HTTPException) as error:
+            check(token)
+        assert error.value.status_code == 403
+
+
+def test_matching_token_is_admitted(monkeypatch):
+    monkeypatch.setattr(config, "OPS_TOKEN", "secret")
+    check("secret")
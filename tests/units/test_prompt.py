@@ -0,0 +1,81 @@
+import json
+
+from app.src.core import config
+from app.src.router.ai.prompt import (
+    JSON_FORMAT_TEXT, analysis_prompt, compact_cashflow, compact_month, estimate_tokens)
+
+
+def transaction(day: str, amount: float, category_code="FOOD", description="lunch") -> dict:
+    return {"date": day, "amount": amount, "category_code": category_code, "description": description}
+
+
+def month(name: str, expenses: int = 20) -> dict:
+    return {
+        "month": name,
+        "income": [transaction(f"{name}-01", 10000000, "SALARY", "salary")],
+        "expense": [
+            transaction(f"{name}-{index % 28 + 1:02d}", 1000 + index * 10.5, description=f"expense {index}")
+            for index in range(expenses)
+        ]
+    }
+
+
+def test_compact_month_totals_and_top_transactions():
+    compacted = compact_month(month("2026-09", expenses=3), top_n=2, categories=True, unchanged=False)
+
+    assert compacted["total_income"] == 10000000
+    assert compacted["total_expense"] == 3031.5
+    assert compacted["net_cashflow"] == 10000000 - 3031.5
+    assert compacted["expense_by_category"] == {"FOOD": 3031.5}
+    assert [item["amount"] for item in compacted["top_expense"]] == [1021, 1010.5]
+
+
+def test_unchanged_month_keeps_totals_only():
+    compacted = compact_month(month("2026-09"), top_n=5, categories=True, unchanged=True)
+    assert set(compacted) == {
+        "month", "total_income", "total_expense", "net_cashflow", "unchanged_since_last_analysis"}
+
+
+def test_compaction_shrinks_to_the_budget():
+    cashflow = [month(f"2026-{index:02d}", expenses=200) for index in range(1, 13)]
+
+    roomy = compact_cashflow(cashflow, changed=[], token_budget=100000)
+    tight = compact_cashflow(cashflow, changed=[], token_budget=2000)
+
+    assert estimate_tokens(tight) <= 2000 < estimate_tokens(roomy)
+    months = json.loads(tight)
+    assert len(months) == 12
+    assert all("total_expense" in item for item in months)
+
+
+def test_smallest_form_is_returned_over_budget():
+    cashflow = [month("2026-01")]
+    data = json.loads(compact_cashflow(cashflow, changed=[], token_budget=1))
+    assert set(data[0]) == {"month", "total_income", "total_expense", "net_cashflow"}
+
+
+def test_unchanged_months_are_elided_only_with_the_previous_analysis():
+    cashflow = [month("2026-08"), month("2026-09")]
+
+    alone = json.loads(compact_cashflow(cashflow, changed=["2026-09"], token_budget=100000))
+    assert all("top_expense" in item for item in alone)
+
+    previous = {"ringkasan": "sebelumnya"}
+    data = json.loads(compact_cashflow(
+        cashflow, changed=["2026-09"], token_budget=100000, previous_result=previous))
+    assert data["previous_analysis"] == previous
+    august, september = data["months"]
+    assert august["unchanged_since_last_analysis"] is True
+    assert "top_expense" in september
+
+
+def test_prompt_puts_static_text_first_and_data_last():
+    cashflow = [month("2026-09", expenses=2)]
+    prompt = analysis_prompt(cashflow, changed=[])
+    other = analysis_prompt([month("2026-10", expenses=5)], changed=[])
+
+    static = prompt[:prompt.index("2026-09")]
+    assert JSON_FORMAT_TEXT in static
+    assert other.startswith(static[:static.rindex("\n")])
+    assert prompt.rstrip().endswith(compact_cashflow(
+        cashflow, changed=[], token_budget=config.AI_PROMPT_TOKEN_BUDGET))
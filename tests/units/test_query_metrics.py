@@ -0,0 +1,22 @@
+import pytest
+
+from app.src.database.query_metrics import fingerprint
+
+
+@pytest.mark.parametrize("statement, expected", [
+    ("SELECT * FROM users WHERE id = 10 AND email IN ('a', 'b')",
+     "SELECT * FROM users WHERE id = ? AND email IN (...)"),
+    ("select * from t where a = $1 and b = %(b_1)s -- trailing\n and c = :c",
+     "select * from t where a = ? and b = ? and c = ?"),
+    ("INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s), (%s, %s);",
+     "INSERT INTO t (a, b) VALUES (...)"),
+    ("/* app */ SELECT  x::int FROM t WHERE name = 'it''s' AND v = 1.5",
+     "SELECT x::int FROM t WHERE name = ? AND v = ?"),
+])
+def test_fingerprint_normalizes_literals_binds_and_lists(statement, expected):
+    assert fingerprint(statement) == expected
+
+
+def test_same_shape_shares_one_fingerprint():
+    assert fingerprint("SELECT * FROM t WHERE id IN (1, 2, 3)") == \
+        fingerprint("SELECT *\n  FROM t\n WHERE id IN (4)")
@@ -0,0 +1,55 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.src.database.models.transaction import Transaction
+from app.src.database.models.transaction_rollup import TransactionMonthlyRollup
+from app.src.router.report.object import ReportObject, whole_months
+
+
+@pytest.mark.parametrize("start_date, end_date, expected", [
+    (date(2026, 1, 1), date(2026, 3, 31), (date(2026, 1, 1), date(2026, 3, 1))),
+    (date(2026, 2, 1), date(2026, 2, 28), (date(2026, 2, 1), date(2026, 2, 1))),
+    (None, date(2026, 3, 31), (None, date(2026, 3, 1))),
+    (date(2026, 1, 1), None, (date(2026, 1, 1), None)),
+    (None, None, (None, None)),
+    (date(2026, 1, 2), date(2026, 3, 31), None),
+    (date(2026, 1, 1), date(2026, 3, 30), None),
+])
+def test_whole_months(start_date, end_date, expected):
+    assert whole_months(start_date, end_date) == expected
+
+
+def compiled(statement) -> str:
+    return str(statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def totals_sql(start_date, end_date):
+    source, category_code, amount, filters = ReportObject(None, None)._totals_source(
+        1, start_date, end_date)
+    return source, compiled(
+        select(category_code, source.type, amount).where(*filters).group_by(category_code, source.type))
+
+
+def test_whole_months_read_the_rollup():
+    source, sql = totals_sql(date(2026, 1, 1), date(2026, 3, 31))
+
+    assert source is TransactionMonthlyRollup
+    assert "transaction_monthly_rollup.month >= '2026-01-01'" in sql
+    assert "transaction_monthly_rollup.month <= '2026-03-01'" in sql
+    assert "transaction_monthly_rollup.count != 0" in sql
+    # uncategorised rollup rows come back as None, like the raw rows
+    assert "GROUP BY nullif(transaction_monthly_rollup.category_code, '')" in sql
+
+
+def test_partial_months_read_the_transactions():
+    source, sql = totals_sql(date(2026, 1, 15), date(2026, 3, 31))
+
+    assert source is Transaction
+    assert "transactions.date >= '2026-01-15'" in sql
+    # the end date counts for the whole day
+    assert "transactions.date < '2026-04-01'" in sql
+    assert "GROUP BY transactions.category_code" in sql
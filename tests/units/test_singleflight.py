@@ -0,0 +1,72 @@
+import asyncio
+
+from app.src.utils.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "token"
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+        return flight, calls, results
+
+    flight, calls, results = asyncio.run(scenario())
+    assert results == ["token"] * 5
+    assert len(calls) == 1
+    assert (flight.calls, flight.shared, flight.in_flight) == (1, 4, 0)
+
+
+def test_error_reaches_every_caller_and_is_not_cached():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def broken():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("down")
+
+        results = await asyncio.gather(
+            flight.do("key", broken), flight.do("key", broken), return_exceptions=True)
+        assert not flight.running("key")
+        return flight, results
+
+    flight, results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.calls == 1
+
+
+def test_cancelled_caller_does_not_cancel_the_call():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return "token"
+
+        first = asyncio.create_task(flight.do("key", fetch))
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        return first, await second
+
+    first, result = asyncio.run(scenario())
+    assert first.cancelled()
+    assert result == "token"
+
+
+def test_different_keys_run_separately():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def value(name):
+            return name
+
+        return await asyncio.gather(
+            flight.do("a", lambda: value("a")), flight.do("b", lambda: value("b")))
+
+    assert asyncio.run(scenario()) == ["a", "b"]